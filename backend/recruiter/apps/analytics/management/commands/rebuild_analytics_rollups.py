@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+from recruiter.apps.analytics.rebuild import first_rebuildable_day, rebuild_rollups
+
+class Command(BaseCommand):
+    help = 'Recompute the per-job and per-interviewer daily analytics rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=parse_date, default=None, help='First day (YYYY-MM-DD)')
+        parser.add_argument('--end', type=parse_date, default=None, help='Last day (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        first_day = first_rebuildable_day()
+        if first_day is not None and (options['start'] is None or options['start'] < first_day):
+            self.stdout.write(self.style.WARNING(
+                f"Days before {first_day} hold archived interviews and are kept as they are"
+            ))
+        written = rebuild_rollups(start=options['start'], end=options['end'])
+        for model, count in written.items():
+            self.stdout.write(self.style.SUCCESS(f"Wrote {count} {model} rows"))
@@ -0,0 +1,61 @@
+from django.db import models
+from django.conf import settings
+
+class DailyStats(models.Model):
+    """
+    Counters for one key and day, maintained incrementally by the source
+    models. Averages are stored as sums and divided on read.
+    """
+    day = models.DateField()
+    interviews_scheduled = models.IntegerField(default=0)
+    interviews_in_progress = models.IntegerField(default=0)
+    interviews_completed = models.IntegerField(default=0)
+    interviews_cancelled = models.IntegerField(default=0)
+    feedback_count = models.IntegerField(default=0)
+    overall_rating_sum = models.IntegerField(default=0)
+    technical_skills_rating_sum = models.IntegerField(default=0)
+    communication_skills_rating_sum = models.IntegerField(default=0)
+    problem_solving_rating_sum = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+class JobDailyStats(DailyStats):
+    job = models.ForeignKey(
+        'jobs.Job',
+        on_delete=models.CASCADE,
+        related_name='daily_stats'
+    )
+    applications_pending = models.IntegerField(default=0)
+    applications_reviewing = models.IntegerField(default=0)
+    applications_shortlisted = models.IntegerField(default=0)
+    applications_rejected = models.IntegerField(default=0)
+    applications_hired = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['job', 'day']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'day'], name='unique_job_daily_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} {self.day}"
+
+class InterviewerDailyStats(DailyStats):
+    interviewer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='daily_stats'
+    )
+
+    class Meta:
+        ordering = ['interviewer', 'day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['interviewer', 'day'],
+                name='unique_interviewer_daily_stats'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.interviewer_id} {self.day}"
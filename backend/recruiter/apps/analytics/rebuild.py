@@ -0,0 +1,106 @@
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from recruiter.apps.interviews.models import Interview, InterviewArchiveRun, InterviewFeedback
+from recruiter.apps.jobs.models import JobApplication
+from .models import JobDailyStats, InterviewerDailyStats
+from .rollups import APPLICATION_STATUS_COUNTERS, FEEDBACK_RATINGS, INTERVIEW_STATUS_COUNTERS
+
+def in_range(queryset, field, start, end):
+    if start is not None:
+        queryset = queryset.filter(**{f'{field}__date__gte': start})
+    if end is not None:
+        queryset = queryset.filter(**{f'{field}__date__lte': end})
+    return queryset
+
+def grouped(queryset, date_field, key_field, aggregates):
+    return (
+        queryset.annotate(day=TruncDate(date_field))
+        .order_by()
+        .values(key_field, 'day')
+        .annotate(**aggregates)
+    )
+
+def status_counts(counters):
+    return {
+        field: Count('id', filter=Q(status=status))
+        for status, field in counters.items()
+    }
+
+FEEDBACK_AGGREGATES = {
+    'feedback_count': Count('id'),
+    **{f'{name}_sum': Sum(name) for name in FEEDBACK_RATINGS},
+}
+
+def first_rebuildable_day():
+    """
+    First day whose rollups can be recomputed from the source tables, or
+    None when nothing was ever archived. Archived interviews are gone from
+    the source tables and live on only in the rollups, so days up to the
+    latest archive cutoff must never be rebuilt.
+    """
+    run = InterviewArchiveRun.objects.order_by('-cutoff_date').first()
+    if run is None:
+        return None
+    return timezone.localtime(run.cutoff_date).date() + timezone.timedelta(days=1)
+
+def rebuild_rollups(start=None, end=None, batch_size=2000):
+    """
+    Recompute the job and interviewer rollups from the source tables with
+    GROUP BY queries, for every day or for days between ``start`` and
+    ``end``. Used to backfill and to repair drift after bulk writes that
+    bypass the model hooks. Returns the number of rows written per table.
+
+    The range is clamped to ``first_rebuildable_day`` so archived history
+    is kept.
+    """
+    first_day = first_rebuildable_day()
+    if first_day is not None and (start is None or start < first_day):
+        start = first_day
+    if start is not None and end is not None and end < start:
+        return {JobDailyStats.__name__: 0, InterviewerDailyStats.__name__: 0}
+
+    interviews = in_range(Interview.objects.all(), 'scheduled_date', start, end)
+    feedback = in_range(InterviewFeedback.objects.all(), 'created_at', start, end)
+    applications = in_range(JobApplication.objects.all(), 'applied_at', start, end)
+
+    sources = [
+        (JobDailyStats, 'job_id', [
+            (interviews, 'scheduled_date', 'job_id', status_counts(INTERVIEW_STATUS_COUNTERS)),
+            (feedback, 'created_at', 'interview__job_id', FEEDBACK_AGGREGATES),
+            (applications, 'applied_at', 'job_id', status_counts(APPLICATION_STATUS_COUNTERS)),
+        ]),
+        (InterviewerDailyStats, 'interviewer_id', [
+            (interviews, 'scheduled_date', 'interviewer_id', status_counts(INTERVIEW_STATUS_COUNTERS)),
+            (feedback, 'created_at', 'interview__interviewer_id', FEEDBACK_AGGREGATES),
+        ]),
+    ]
+
+    written = {}
+    with transaction.atomic():
+        for model, key_field, groups in sources:
+            rows = {}
+            for queryset, date_field, group_field, aggregates in groups:
+                for values in grouped(queryset, date_field, group_field, aggregates).iterator(
+                    chunk_size=batch_size
+                ):
+                    fields = rows.setdefault((values[group_field], values['day']), {})
+                    for name in aggregates:
+                        fields[name] = values[name] or 0
+
+            existing = model.objects.all()
+            if start is not None:
+                existing = existing.filter(day__gte=start)
+            if end is not None:
+                existing = existing.filter(day__lte=end)
+            existing.delete()
+            model.objects.bulk_create(
+                [
+                    model(**{key_field: key, 'day': day}, **fields)
+                    for (key, day), fields in rows.items()
+                ],
+                batch_size=batch_size
+            )
+            written[model.__name__] = len(rows)
+    return written
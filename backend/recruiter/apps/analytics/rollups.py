@@ -0,0 +1,166 @@
+from collections import Counter
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import JobDailyStats, InterviewerDailyStats
+
+INTERVIEW_STATUS_COUNTERS = {
+    'SCHEDULED': 'interviews_scheduled',
+    'IN_PROGRESS': 'interviews_in_progress',
+    'COMPLETED': 'interviews_completed',
+    'CANCELLED': 'interviews_cancelled',
+}
+
+OPEN_APPLICATION_STATUSES = {'PENDING', 'REVIEWING', 'SHORTLISTED'}
+
+APPLICATION_STATUS_COUNTERS = {
+    'PENDING': 'applications_pending',
+    'REVIEWING': 'applications_reviewing',
+    'SHORTLISTED': 'applications_shortlisted',
+    'REJECTED': 'applications_rejected',
+    'HIRED': 'applications_hired',
+}
+
+FEEDBACK_RATINGS = [
+    'overall_rating',
+    'technical_skills_rating',
+    'communication_skills_rating',
+    'problem_solving_rating',
+]
+
+def day_of(value):
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+def job_model():
+    return apps.get_model('jobs', 'Job')
+
+def interview_deltas(state, sign):
+    job_id, interviewer_id, scheduled_date, status = state
+    field = INTERVIEW_STATUS_COUNTERS.get(status)
+    if field is None:
+        return
+    day = day_of(scheduled_date)
+    yield JobDailyStats, (('job_id', job_id), ('day', day)), {field: sign}
+    yield InterviewerDailyStats, (('interviewer_id', interviewer_id), ('day', day)), {field: sign}
+    if status != 'CANCELLED':
+        yield job_model(), (('pk', job_id),), {'interview_count': sign}
+
+def application_deltas(state, sign):
+    job_id, applied_at, status = state
+    field = APPLICATION_STATUS_COUNTERS.get(status)
+    if field is not None:
+        yield JobDailyStats, (('job_id', job_id), ('day', day_of(applied_at))), {field: sign}
+    yield job_model(), (('pk', job_id),), {
+        'application_count': sign,
+        'open_application_count': sign if status in OPEN_APPLICATION_STATUSES else 0,
+    }
+
+def feedback_deltas(state, sign):
+    interview_id, created_at, *ratings = state
+    Interview = apps.get_model('interviews', 'Interview')
+    owners = Interview._base_manager.filter(pk=interview_id).values_list(
+        'job_id', 'interviewer_id'
+    ).first()
+    if owners is None:
+        return
+    job_id, interviewer_id = owners
+    day = day_of(created_at)
+    fields = {'feedback_count': sign}
+    for name, rating in zip(FEEDBACK_RATINGS, ratings):
+        fields[f'{name}_sum'] = sign * rating
+    yield JobDailyStats, (('job_id', job_id), ('day', day)), fields
+    yield InterviewerDailyStats, (('interviewer_id', interviewer_id), ('day', day)), fields
+    yield job_model(), (('pk', job_id),), {
+        'feedback_count': sign,
+        'rating_sum': sign * ratings[0],
+    }
+
+def collect(deltas, changes):
+    """
+    Merge the deltas of (old_state, new_state) pairs into
+    {(model, key): Counter}, removing the old state's contribution and adding
+    the new one. Counters that cancel out are dropped.
+    """
+    merged = {}
+    for old, new in changes:
+        if old == new:
+            continue
+        for state, sign in [(old, -1), (new, 1)]:
+            if state is None:
+                continue
+            for model, key, fields in deltas(state, sign):
+                merged.setdefault((model, key), Counter()).update(fields)
+    return {
+        target: {field: value for field, value in fields.items() if value}
+        for target, fields in merged.items()
+        if any(fields.values())
+    }
+
+def apply_deltas(merged):
+    """
+    Apply merged deltas with one atomic ``F()`` UPDATE per rollup row,
+    creating missing rows first. Models owning their counters, such as Job,
+    apply them through ``apply_rollup_delta`` instead.
+    """
+    with transaction.atomic():
+        for (model, key), fields in merged.items():
+            key = dict(key)
+            if hasattr(model, 'apply_rollup_delta'):
+                model.apply_rollup_delta(key, fields)
+                continue
+            increments = {field: F(field) + value for field, value in fields.items()}
+            if not model.objects.filter(**key).update(**increments):
+                model.objects.bulk_create([model(**key)], ignore_conflicts=True)
+                model.objects.filter(**key).update(**increments)
+
+def record_changes(deltas, changes):
+    merged = collect(deltas, changes)
+    if merged:
+        apply_deltas(merged)
+
+class RollupMixin:
+    """
+    Model mixin keeping the analytics rollups in step with ``save`` and
+    ``delete``. The values the rollups depend on are remembered when a row
+    is loaded, so an update costs no extra read. Queryset ``update``,
+    ``delete`` and ``bulk_create`` bypass the hooks and must call
+    ``record_changes`` themselves, or be followed by a rebuild.
+    """
+    rollup_fields = ()
+    rollup_deltas = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._rollup_state = instance.rollup_state()
+        return instance
+
+    def rollup_state(self):
+        values = self.__dict__
+        if any(field not in values for field in self.rollup_fields):
+            return None
+        return tuple(values[field] for field in self.rollup_fields)
+
+    def stored_rollup_state(self):
+        state = getattr(self, '_rollup_state', None)
+        if state is None and not self._state.adding and self.pk is not None:
+            state = type(self)._base_manager.filter(pk=self.pk).values_list(
+                *self.rollup_fields
+            ).first()
+        return state
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            old = None if self._state.adding else self.stored_rollup_state()
+            super().save(*args, **kwargs)
+            self._rollup_state = self.rollup_state()
+            record_changes(type(self).rollup_deltas, [(old, self._rollup_state)])
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            merged = collect(type(self).rollup_deltas, [(self.stored_rollup_state(), None)])
+            result = super().delete(*args, **kwargs)
+            if merged:
+                apply_deltas(merged)
+        return result
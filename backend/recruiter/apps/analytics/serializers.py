@@ -0,0 +1,17 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+MAX_RANGE_DAYS = 366
+
+class DailyStatsQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, data):
+        end = data.get('end') or timezone.localdate()
+        start = data.get('start') or end - timezone.timedelta(days=29)
+        if start > end:
+            raise serializers.ValidationError("start must not be after end")
+        if (end - start).days >= MAX_RANGE_DAYS:
+            raise serializers.ValidationError(f"The range is limited to {MAX_RANGE_DAYS} days")
+        return {'start': start, 'end': end}
@@ -0,0 +1,13 @@
+from celery import shared_task
+from django.utils import timezone
+from .rebuild import rebuild_rollups
+
+@shared_task
+def reconcile_recent_rollups(days=2):
+    """
+    Recompute the rollups of the last few days and of every future day to
+    repair any drift from writes that bypassed the model hooks. Interviews
+    are rolled up by scheduled date, which is often still ahead.
+    """
+    today = timezone.localdate()
+    return rebuild_rollups(start=today - timezone.timedelta(days=days - 1))
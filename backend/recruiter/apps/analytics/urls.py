@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import JobDailyStatsView, InterviewerDailyStatsView
+
+urlpatterns = [
+    path('jobs/<int:job_id>/daily/', JobDailyStatsView.as_view(), name='job-daily-stats'),
+    path(
+        'interviewers/<int:interviewer_id>/daily/',
+        InterviewerDailyStatsView.as_view(),
+        name='interviewer-daily-stats'
+    ),
+]
@@ -0,0 +1,76 @@
+from collections import Counter
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions, status
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from recruiter.apps.jobs.models import Job
+from .models import JobDailyStats, InterviewerDailyStats
+from .rollups import FEEDBACK_RATINGS
+from .serializers import DailyStatsQuerySerializer
+
+def with_averages(values):
+    count = values.get('feedback_count') or 0
+    for name in FEEDBACK_RATINGS:
+        total = values.pop(f'{name}_sum', 0)
+        values[f'average_{name}'] = round(total / count, 2) if count else None
+    return values
+
+def stats_response(request, queryset, fields):
+    """
+    Serve one rollup row per day in the requested range plus totals, so the
+    cost grows with the number of days rather than with the source rows.
+    """
+    params = DailyStatsQuerySerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    start, end = params.validated_data['start'], params.validated_data['end']
+
+    rows = list(
+        queryset.filter(day__gte=start, day__lte=end).order_by('day').values('day', *fields)
+    )
+    totals = Counter()
+    for row in rows:
+        totals.update({field: row[field] for field in fields})
+    return Response({
+        'start': start,
+        'end': end,
+        'days': [with_averages(row) for row in rows],
+        'totals': with_averages({field: totals[field] for field in fields}),
+    })
+
+def counter_fields(model):
+    return [
+        field.name for field in model._meta.concrete_fields
+        if field.get_internal_type() == 'IntegerField'
+    ]
+
+class JobDailyStatsView(APIView):
+    """
+    Daily interview, feedback and application funnel counts for one job.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(Job, pk=job_id)
+        return stats_response(
+            request,
+            JobDailyStats.objects.filter(job=job),
+            counter_fields(JobDailyStats)
+        )
+
+class InterviewerDailyStatsView(APIView):
+    """
+    Daily interview and feedback counts for one interviewer, visible to
+    staff and to the interviewer themselves.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, interviewer_id):
+        if not request.user.is_staff and request.user.pk != interviewer_id:
+            raise PermissionDenied()
+        return stats_response(
+            request,
+            InterviewerDailyStats.objects.filter(interviewer_id=interviewer_id),
+            counter_fields(InterviewerDailyStats)
+        )
@@ -0,0 +1,431 @@
+import csv
+import hashlib
+import io
+import json
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework import serializers
+
+from recruiter.apps.analytics.rollups import application_deltas, record_changes
+from recruiter.apps.candidates.models import CandidateProfile
+from recruiter.apps.candidates.tasks import refresh_search_documents
+from recruiter.apps.jobs.models import Job, JobApplication, JOB_CACHE_NAMESPACE
+from recruiter.authentication import invalidate_user_tokens
+from recruiter.caching import bump_version
+from .models import ExternalReference, ImportRun
+from .serializers import JobRowSerializer, CandidateRowSerializer, ApplicationRowSerializer
+
+User = get_user_model()
+
+# Row errors kept on the ImportRun; the rest are only counted
+MAX_RECORDED_ERRORS = 100
+
+def read_records(file_name):
+    """
+    Stream (line number, record) pairs from a CSV or JSONL file in the
+    default storage. Empty CSV cells are left out so field defaults apply;
+    JSONL lines that do not parse come back as None.
+    """
+    with default_storage.open(file_name, 'rb') as raw:
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        if file_name.endswith('.csv'):
+            reader = csv.DictReader(text)
+            for record in reader:
+                yield reader.line_num, {
+                    key: value for key, value in record.items() if key and value != ''
+                }
+            return
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, None
+
+def batched(records, batch_size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def record_hash(record):
+    encoded = json.dumps(record, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def resolve(source, kind, external_ids):
+    """
+    Return {external_id: object_id} for the references that exist.
+    """
+    return dict(ExternalReference.objects.filter(
+        source=source, kind=kind, external_id__in=list(external_ids)
+    ).values_list('external_id', 'object_id'))
+
+def copy_value(field, obj):
+    value = field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+    return r'\N' if value is None else value
+
+def copy_insert(model, objs):
+    """
+    Insert new rows with PostgreSQL COPY. Primary keys are drawn from the
+    table's sequence first, so the instances can be mapped without reading
+    the rows back.
+    """
+    meta = model._meta
+    fields = [meta.pk] + [field for field in meta.concrete_fields if not field.primary_key]
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+            [meta.db_table, meta.pk.column, len(objs)]
+        )
+        for obj, (pk,) in zip(objs, cursor.fetchall()):
+            obj.pk = pk
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in objs:
+            writer.writerow([copy_value(field, obj) for field in fields])
+        buffer.seek(0)
+        columns = ', '.join(quote(field.column) for field in fields)
+        cursor.copy_expert(
+            f"COPY {quote(meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer
+        )
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = connection.alias
+    return objs
+
+def insert(model, objs):
+    if connection.vendor == 'postgresql' and len(objs) >= settings.ATS_IMPORT_COPY_MIN_ROWS:
+        return copy_insert(model, objs)
+    return model.objects.bulk_create(objs)
+
+class Importer:
+    """
+    Imports one kind of ATS record a batch at a time.
+
+    Records whose hash matches their ExternalReference are skipped without
+    validation, so rerunning a sync costs one lookup per batch. The rest
+    are validated, new rows are inserted (through COPY on PostgreSQL) and
+    known rows are upserted on their primary key. Subclasses build the
+    instances and run the side effects the bypassed save hooks would have.
+    """
+    kind = None
+    model = None
+    serializer_class = None
+    update_fields = []
+
+    def __init__(self, source, run):
+        self.source = source
+        self.run = run
+        self.validator = self.serializer_class()
+
+    def fail(self, line, errors):
+        self.run.failed += 1
+        if len(self.run.errors) < MAX_RECORDED_ERRORS:
+            self.run.errors.append({'line': line, 'errors': errors})
+
+    def import_batch(self, records):
+        # The last record of an external id in a batch wins
+        latest = {}
+        for line, record in records:
+            self.run.rows_read += 1
+            if not isinstance(record, dict):
+                self.fail(line, ['Invalid record'])
+            elif not str(record.get('external_id') or '').strip():
+                self.fail(line, {'external_id': ['This field is required.']})
+            else:
+                latest[str(record['external_id']).strip()] = (line, record)
+
+        known = dict(
+            (external_id, (object_id, row_hash))
+            for external_id, object_id, row_hash in ExternalReference.objects.filter(
+                source=self.source, kind=self.kind, external_id__in=list(latest)
+            ).values_list('external_id', 'object_id', 'row_hash')
+        )
+        rows = []
+        for external_id, (line, record) in latest.items():
+            digest = record_hash(record)
+            object_id, previous = known.get(external_id, (None, None))
+            if digest == previous:
+                self.run.unchanged += 1
+                continue
+            try:
+                data = self.validator.run_validation(record)
+            except serializers.ValidationError as exc:
+                self.fail(line, exc.detail)
+                continue
+            rows.append((line, data, digest, object_id))
+
+        if rows:
+            with transaction.atomic():
+                self.write(rows)
+
+    def current_rows(self, object_ids):
+        """
+        {pk: state} of the rows that still exist, locked for the batch.
+        """
+        return dict.fromkeys(
+            self.model.objects.filter(pk__in=object_ids)
+            .select_for_update().values_list('pk', flat=True)
+        )
+
+    def write(self, rows):
+        current = self.current_rows([row[3] for row in rows if row[3] is not None])
+        built = self.build(rows, current)
+        if not built:
+            return
+        created = [obj for _, obj in built if obj.pk is None]
+        updated = [obj for _, obj in built if obj.pk is not None]
+        created = insert(self.model, created)
+        if updated:
+            self.model.objects.bulk_create(
+                updated,
+                update_conflicts=True,
+                unique_fields=[self.model._meta.pk.name],
+                update_fields=self.update_fields,
+            )
+        ExternalReference.objects.bulk_create(
+            [
+                ExternalReference(
+                    source=self.source,
+                    kind=self.kind,
+                    external_id=data['external_id'],
+                    object_id=obj.pk,
+                    row_hash=digest,
+                )
+                for (data, digest), obj in built
+            ],
+            update_conflicts=True,
+            unique_fields=['source', 'kind', 'external_id'],
+            update_fields=['object_id', 'row_hash', 'updated_at'],
+        )
+        self.run.created += len(created)
+        self.run.updated += len(updated)
+        self.after_write(created, updated, current)
+
+    def build(self, rows, current):
+        """
+        Return [((data, digest), instance)] for the rows that can be written,
+        with the primary key set on instances of rows that already exist.
+        """
+        raise NotImplementedError
+
+    def after_write(self, created, updated, current):
+        pass
+
+def model_values(data):
+    return {field: value for field, value in data.items() if field != 'external_id'}
+
+class JobImporter(Importer):
+    kind = 'JOB'
+    model = Job
+    serializer_class = JobRowSerializer
+    update_fields = [
+        'title', 'description', 'requirements', 'location', 'salary_range',
+        'job_type', 'experience_level', 'is_active', 'updated_at'
+    ]
+
+    def __init__(self, source, run, posted_by=None):
+        if posted_by is None:
+            raise ValueError("Importing jobs requires the user they are posted by")
+        super().__init__(source, run)
+        self.posted_by = posted_by
+
+    def build(self, rows, current):
+        return [
+            ((data, digest), Job(
+                pk=object_id if object_id in current else None,
+                posted_by=self.posted_by,
+                **model_values(data)
+            ))
+            for line, data, digest, object_id in rows
+        ]
+
+    def after_write(self, created, updated, current):
+        bump_version(JOB_CACHE_NAMESPACE)
+
+class CandidateImporter(Importer):
+    """
+    Candidates are matched to existing users by email; users that do not
+    exist yet are created without a usable password. Resumes must already
+    be in storage, and ingest_resumes picks them up for parsing.
+    """
+    kind = 'CANDIDATE'
+    model = CandidateProfile
+    serializer_class = CandidateRowSerializer
+    update_fields = [
+        'phone_number', 'location', 'current_position', 'years_of_experience',
+        'skills', 'education', 'resume', 'updated_at'
+    ]
+
+    def current_rows(self, object_ids):
+        return dict(
+            CandidateProfile.objects.filter(pk__in=object_ids)
+            .select_for_update().values_list('pk', 'user_id')
+        )
+
+    def build(self, rows, current):
+        accounts = User.objects.in_bulk(list(current.values()))
+        emails = {data['email'] for _, data, _, object_id in rows if object_id not in current}
+        users = {
+            user.email_lower: user
+            for user in User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=emails)
+        }
+        names = {data['email']: (data['first_name'], data['last_name']) for _, data, _, _ in rows}
+        password = make_password(None)
+        created_users = User.objects.bulk_create([
+            User(
+                username=email,
+                email=email,
+                first_name=names[email][0],
+                last_name=names[email][1],
+                password=password,
+            )
+            for email in sorted(emails - set(users))
+        ])
+        users.update((user.email, user) for user in created_users)
+        new_user_ids = {user.pk for user in created_users}
+        profiles = dict(
+            CandidateProfile.objects.filter(user__in=list(users.values()))
+            .values_list('user_id', 'pk')
+        )
+
+        built = []
+        changed_users = {}
+        assigned = set()
+        self.linked_user_ids = []
+        for line, data, digest, object_id in rows:
+            if object_id in current:
+                user = accounts[current[object_id]]
+            else:
+                user = users[data['email']]
+                object_id = profiles.get(user.pk)
+                if object_id is None and user.pk not in new_user_ids:
+                    # An existing account becomes a candidate
+                    self.linked_user_ids.append(user.pk)
+            if user.pk in assigned:
+                self.fail(line, {'email': ['Another record in this batch has this email.']})
+                continue
+            assigned.add(user.pk)
+
+            account = {
+                # Matching is case-insensitive, so keep the stored spelling
+                'email': user.email if user.email.lower() == data['email'] else data['email'],
+                'first_name': data['first_name'],
+                'last_name': data['last_name'],
+            }
+            if any(getattr(user, field) != value for field, value in account.items()):
+                for field, value in account.items():
+                    setattr(user, field, value)
+                changed_users[user.pk] = user
+            values = model_values(data)
+            for field in account:
+                values.pop(field)
+            built.append(((data, digest), CandidateProfile(pk=object_id, user=user, **values)))
+
+        if changed_users:
+            User.objects.bulk_update(list(changed_users.values()), ['email', 'first_name', 'last_name'])
+            for user_id in changed_users:
+                if user_id not in new_user_ids:
+                    invalidate_user_tokens(user_id)
+        return built
+
+    def after_write(self, created, updated, current):
+        # Cached tokens carry the candidate role
+        for user_id in self.linked_user_ids:
+            invalidate_user_tokens(user_id)
+        profile_ids = [profile.pk for profile in created + updated]
+        transaction.on_commit(lambda: refresh_search_documents.delay(profile_ids))
+
+class ApplicationImporter(Importer):
+    """
+    Applications reference their job and candidate by external id, so jobs
+    and candidates of the same source are imported first.
+    """
+    kind = 'APPLICATION'
+    model = JobApplication
+    serializer_class = ApplicationRowSerializer
+    update_fields = ['status', 'cover_letter', 'resume', 'updated_at']
+
+    def current_rows(self, object_ids):
+        # pk -> (job_id, applied_at, status), the application's rollup state
+        rows = (
+            JobApplication.objects.filter(pk__in=object_ids)
+            .select_for_update().values_list('pk', 'job_id', 'applied_at', 'status')
+        )
+        return {row[0]: row[1:] for row in rows}
+
+    def build(self, rows, current):
+        jobs = resolve(self.source, 'JOB', {data['job'] for _, data, _, _ in rows})
+        profiles = resolve(self.source, 'CANDIDATE', {data['candidate'] for _, data, _, _ in rows})
+        users = dict(
+            CandidateProfile.objects.filter(pk__in=list(profiles.values()))
+            .values_list('pk', 'user_id')
+        )
+
+        built = []
+        for line, data, digest, object_id in rows:
+            job_id = jobs.get(data['job'])
+            user_id = users.get(profiles.get(data['candidate']))
+            if job_id is None or user_id is None:
+                self.fail(line, {
+                    'job' if job_id is None else 'candidate': ['Unknown external id.']
+                })
+                continue
+            application = JobApplication(
+                job_id=job_id,
+                candidate_id=user_id,
+                status=data['status'],
+                cover_letter=data['cover_letter'],
+                resume=data['resume'],
+            )
+            if object_id in current:
+                # Only the status and content are synced; the application
+                # stays on its job so its rollup state remains accurate
+                application.pk = object_id
+                application.job_id = current[object_id][0]
+            built.append(((data, digest), application))
+        return built
+
+    def after_write(self, created, updated, current):
+        for application in updated:
+            # The upsert keeps the stored date, but pre_save stamped the instance
+            application.applied_at = current[application.pk][1]
+        record_changes(application_deltas, [
+            (None, application.rollup_state()) for application in created
+        ] + [
+            (current[application.pk], application.rollup_state()) for application in updated
+        ])
+
+IMPORTERS = {
+    importer.kind: importer
+    for importer in [JobImporter, CandidateImporter, ApplicationImporter]
+}
+
+def import_file(source, kind, file_name, batch_size=None, **options):
+    """
+    Import a CSV or JSONL export of ``kind`` records from ``source``,
+    committing one batch at a time. Returns the ImportRun with the counts
+    and the first row errors.
+    """
+    batch_size = batch_size or settings.ATS_IMPORT_BATCH_SIZE
+    run = ImportRun.objects.create(source=source, kind=kind, file_name=file_name)
+    importer = IMPORTERS[kind](source, run, **options)
+    for batch in batched(read_records(file_name), batch_size):
+        importer.import_batch(batch)
+        run.save()
+    run.finished_at = timezone.now()
+    run.save()
+    return run
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from recruiter.apps.ats.importer import IMPORTERS, import_file
+from recruiter.apps.ats.tasks import import_ats_file
+
+class Command(BaseCommand):
+    help = 'Import jobs, candidates or applications from a CSV or JSONL ATS export in storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=[kind.lower() for kind in IMPORTERS])
+        parser.add_argument('file_name', help='Storage name of the .csv or .jsonl export')
+        parser.add_argument('--source', required=True, help='ATS the export comes from, e.g. greenhouse')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--posted-by', default=None, help='Email of the user imported jobs are posted by')
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='run_async',
+            help='Queue the Celery task instead of importing in this process'
+        )
+
+    def handle(self, *args, **options):
+        kind = options['kind'].upper()
+        posted_by = None
+        if options['posted_by']:
+            posted_by = get_user_model().objects.filter(email__iexact=options['posted_by']).first()
+            if posted_by is None:
+                raise CommandError(f"No user with email {options['posted_by']}")
+        if kind == 'JOB' and posted_by is None:
+            raise CommandError("--posted-by is required when importing jobs")
+
+        if options['run_async']:
+            result = import_ats_file.delay(
+                options['source'],
+                kind,
+                options['file_name'],
+                batch_size=options['batch_size'],
+                posted_by_id=posted_by and posted_by.pk,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Queued import task {result.id}"))
+            return
+
+        extra = {'posted_by': posted_by} if posted_by is not None else {}
+        run = import_file(
+            options['source'], kind, options['file_name'],
+            batch_size=options['batch_size'], **extra
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {run.rows_read} records: {run.created} created, {run.updated} updated, "
+            f"{run.unchanged} unchanged, {run.failed} failed"
+        ))
+        for error in run.errors[:10]:
+            self.stdout.write(self.style.WARNING(f"Line {error['line']}: {error['errors']}"))
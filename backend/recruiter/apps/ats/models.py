@@ -0,0 +1,53 @@
+from django.db import models
+
+class ExternalReference(models.Model):
+    """
+    Maps a record of an external ATS to the row it was imported into, with
+    a hash of the imported values so unchanged records are skipped on the
+    next sync.
+    """
+    KIND_CHOICES = [
+        ('JOB', 'Job'),
+        ('CANDIDATE', 'Candidate'),
+        ('APPLICATION', 'Application'),
+    ]
+
+    source = models.CharField(max_length=50, help_text='ATS the record comes from')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    external_id = models.CharField(max_length=255)
+    object_id = models.BigIntegerField(help_text='Primary key of the imported row')
+    row_hash = models.CharField(max_length=64, help_text='SHA-256 of the imported values')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'kind', 'external_id'],
+                name='unique_external_reference'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.kind} {self.external_id}"
+
+class ImportRun(models.Model):
+    source = models.CharField(max_length=50)
+    kind = models.CharField(max_length=20, choices=ExternalReference.KIND_CHOICES)
+    file_name = models.CharField(max_length=255, help_text='Storage name of the imported file')
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    rows_read = models.IntegerField(default=0)
+    created = models.IntegerField(default=0)
+    updated = models.IntegerField(default=0)
+    unchanged = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text='The first row errors, by line')
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.source} {self.kind} import {self.started_at}"
@@ -0,0 +1,47 @@
+from rest_framework import serializers
+from recruiter.apps.jobs.models import JobApplication
+
+class ImportRowSerializer(serializers.Serializer):
+    """
+    Validates one imported record. References to other records use their
+    external ids and are resolved per batch by the importer.
+    """
+    external_id = serializers.CharField(max_length=255)
+
+class JobRowSerializer(ImportRowSerializer):
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField(allow_blank=True, default='')
+    requirements = serializers.CharField(allow_blank=True, default='')
+    location = serializers.CharField(max_length=100)
+    salary_range = serializers.CharField(max_length=100, allow_blank=True, default='')
+    job_type = serializers.CharField(max_length=50)
+    experience_level = serializers.CharField(max_length=50, allow_blank=True, default='')
+    is_active = serializers.BooleanField(default=True)
+
+class CandidateRowSerializer(ImportRowSerializer):
+    # Also the username of accounts created by the import
+    email = serializers.EmailField(max_length=150)
+    first_name = serializers.CharField(max_length=150, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=150, allow_blank=True, default='')
+    phone_number = serializers.CharField(max_length=20, allow_blank=True, default='')
+    location = serializers.CharField(max_length=100, allow_blank=True, default='')
+    current_position = serializers.CharField(max_length=100, allow_blank=True, default='')
+    years_of_experience = serializers.IntegerField(min_value=0, default=0)
+    skills = serializers.CharField(allow_blank=True, default='')
+    education = serializers.CharField(allow_blank=True, default='')
+    resume = serializers.CharField(
+        max_length=100,
+        allow_blank=True,
+        default='',
+        help_text='Storage name of a resume that is already uploaded'
+    )
+
+    def validate_email(self, value):
+        return value.lower()
+
+class ApplicationRowSerializer(ImportRowSerializer):
+    job = serializers.CharField(max_length=255, help_text='External id of the job')
+    candidate = serializers.CharField(max_length=255, help_text='External id of the candidate')
+    status = serializers.ChoiceField(choices=JobApplication.STATUS_CHOICES, default='PENDING')
+    cover_letter = serializers.CharField(allow_blank=True, default='')
+    resume = serializers.CharField(max_length=100, allow_blank=True, default='')
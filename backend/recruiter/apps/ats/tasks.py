@@ -0,0 +1,14 @@
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from .importer import import_file
+
+@shared_task
+def import_ats_file(source, kind, file_name, batch_size=None, posted_by_id=None):
+    """
+    Import an ATS export from the default storage, returning the ImportRun id.
+    """
+    options = {}
+    if posted_by_id is not None:
+        options['posted_by'] = get_user_model().objects.get(pk=posted_by_id)
+    run = import_file(source, kind, file_name, batch_size=batch_size, **options)
+    return run.pk
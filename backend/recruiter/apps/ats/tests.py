@@ -0,0 +1,138 @@
+import json
+from unittest import mock
+from django.core.files.base import ContentFile
+from django.core.files.storage import InMemoryStorage
+from django.test import TestCase, override_settings
+
+from recruiter.apps.candidates.models import CandidateProfile
+from recruiter.apps.jobs.models import Job, JobApplication
+from recruiter.testing import create_user
+from .importer import import_file
+from .models import ExternalReference
+
+JOB_CSV = (
+    'external_id,title,description,requirements,location,job_type\n'
+    'job-1,Backend Engineer,APIs,python django,Berlin,Full-time\n'
+    'job-2,Data Engineer,Pipelines,sql spark,Remote,Contract\n'
+)
+
+class ImporterTestCase(TestCase):
+    def setUp(self):
+        self.storage = InMemoryStorage()
+        patcher = mock.patch('recruiter.apps.ats.importer.default_storage', self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.staff = create_user('staff', is_staff=True)
+
+    def write(self, name, content):
+        if self.storage.exists(name):
+            self.storage.delete(name)
+        return self.storage.save(name, ContentFile(content.encode('utf-8')))
+
+    def write_jsonl(self, name, records):
+        return self.write(name, ''.join(json.dumps(record) + '\n' for record in records))
+
+    def import_jobs(self, content=JOB_CSV):
+        return import_file('greenhouse', 'JOB', self.write('jobs.csv', content), posted_by=self.staff)
+
+class JobImportTests(ImporterTestCase):
+    def test_creates_then_skips_unchanged_rows(self):
+        run = self.import_jobs()
+        self.assertEqual((run.rows_read, run.created, run.failed), (2, 2, 0))
+        self.assertEqual(
+            set(Job.objects.values_list('title', 'posted_by')),
+            {('Backend Engineer', self.staff.pk), ('Data Engineer', self.staff.pk)}
+        )
+
+        run = self.import_jobs()
+        self.assertEqual((run.created, run.updated, run.unchanged), (0, 0, 2))
+
+    def test_updates_changed_rows_in_place(self):
+        self.import_jobs()
+        job_id = ExternalReference.objects.get(kind='JOB', external_id='job-1').object_id
+        run = self.import_jobs(JOB_CSV.replace('Backend Engineer', 'Platform Engineer'))
+        self.assertEqual((run.created, run.updated, run.unchanged), (0, 1, 1))
+        self.assertEqual(Job.objects.get(pk=job_id).title, 'Platform Engineer')
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_invalid_rows_are_reported_by_line(self):
+        run = self.import_jobs(JOB_CSV + 'job-3,,,,Berlin,Full-time\n,Missing id,,,Berlin,Full-time\n')
+        self.assertEqual((run.created, run.failed), (2, 2))
+        errors = {error['line']: error['errors'] for error in run.errors}
+        self.assertEqual(set(errors), {4, 5})
+        self.assertIn('title', errors[4])
+        self.assertIn('external_id', errors[5])
+
+    @override_settings(ATS_IMPORT_COPY_MIN_ROWS=1)
+    def test_copy_insert(self):
+        run = self.import_jobs()
+        self.assertEqual(run.created, 2)
+        references = dict(
+            ExternalReference.objects.filter(kind='JOB').values_list('external_id', 'object_id')
+        )
+        self.assertEqual(Job.objects.get(pk=references['job-2']).title, 'Data Engineer')
+
+class CandidateImportTests(ImporterTestCase):
+    def import_candidates(self, records):
+        return import_file('greenhouse', 'CANDIDATE', self.write_jsonl('candidates.jsonl', records))
+
+    def test_matches_existing_users_by_email(self):
+        user = create_user('existing', email='Existing@Example.com')
+        run = self.import_candidates([
+            {'external_id': 'c-1', 'email': 'existing@example.com', 'first_name': 'Ada'},
+            {'external_id': 'c-2', 'email': 'new@example.com', 'first_name': 'Grace'},
+        ])
+        self.assertEqual((run.created, run.failed), (2, 0))
+        profile = CandidateProfile.objects.select_related('user').get(user=user)
+        # The stored spelling of a matched email is kept
+        self.assertEqual(profile.user.email, 'Existing@Example.com')
+        self.assertEqual(profile.user.first_name, 'Ada')
+        self.assertTrue(CandidateProfile.objects.filter(user__email='new@example.com').exists())
+
+    def test_duplicate_email_in_a_batch_fails(self):
+        run = self.import_candidates([
+            {'external_id': 'c-1', 'email': 'same@example.com'},
+            {'external_id': 'c-2', 'email': 'SAME@example.com'},
+        ])
+        self.assertEqual((run.created, run.failed), (1, 1))
+
+    def test_invalid_json_line(self):
+        name = self.write('candidates.jsonl', '{"external_id": "c-1", "email": "a@example.com"}\n{oops\n')
+        run = import_file('greenhouse', 'CANDIDATE', name)
+        self.assertEqual((run.created, run.failed), (1, 1))
+        self.assertEqual(run.errors[0]['line'], 2)
+
+class ApplicationImportTests(ImporterTestCase):
+    def setUp(self):
+        super().setUp()
+        self.import_jobs()
+        import_file('greenhouse', 'CANDIDATE', self.write_jsonl('candidates.jsonl', [
+            {'external_id': 'c-1', 'email': 'ada@example.com'},
+        ]))
+
+    def import_applications(self, records):
+        return import_file('greenhouse', 'APPLICATION', self.write_jsonl('applications.jsonl', records))
+
+    def test_resolves_references_and_maintains_counters(self):
+        run = self.import_applications([
+            {'external_id': 'a-1', 'job': 'job-1', 'candidate': 'c-1'},
+            {'external_id': 'a-2', 'job': 'job-9', 'candidate': 'c-1'},
+        ])
+        self.assertEqual((run.created, run.failed), (1, 1))
+        self.assertEqual(run.errors[0]['errors'], {'job': ['Unknown external id.']})
+        application = JobApplication.objects.select_related('job', 'candidate').get()
+        self.assertEqual(application.job.title, 'Backend Engineer')
+        self.assertEqual(application.candidate.email, 'ada@example.com')
+        self.assertEqual(application.job.application_count, 1)
+        self.assertEqual(application.job.open_application_count, 1)
+
+    def test_status_updates_move_the_counters(self):
+        self.import_applications([{'external_id': 'a-1', 'job': 'job-1', 'candidate': 'c-1'}])
+        run = self.import_applications([
+            {'external_id': 'a-1', 'job': 'job-1', 'candidate': 'c-1', 'status': 'HIRED'},
+        ])
+        self.assertEqual(run.updated, 1)
+        application = JobApplication.objects.select_related('job').get()
+        self.assertEqual(application.status, 'HIRED')
+        self.assertEqual(application.job.application_count, 1)
+        self.assertEqual(application.job.open_application_count, 0)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from recruiter.apps.candidates.models import CandidateProfile, candidate_changed
+from recruiter.apps.candidates.resumes import ingest_stored_resume
+from recruiter.apps.jobs.models import JobApplication
+
+class Command(BaseCommand):
+    help = 'Hash and queue parsing for stored resumes that were uploaded before ingestion existed'
+
+    def handle(self, *args, **options):
+        count = 0
+        for model in [CandidateProfile, JobApplication]:
+            rows = model.objects.filter(parsed_resume__isnull=True).exclude(resume='')
+            for pk, name in rows.values_list('pk', 'resume').iterator(chunk_size=500):
+                # Link before commit so the queued parse finds the profile
+                with transaction.atomic():
+                    resume = ingest_stored_resume(name)
+                    model.objects.filter(pk=pk).update(parsed_resume=resume)
+                if model is CandidateProfile and resume.status == 'PARSED':
+                    candidate_changed(pk)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f"Ingested {count} resumes"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from recruiter.apps.candidates.models import CandidateProfile
+from recruiter.apps.candidates.search import refresh_search_document
+
+class Command(BaseCommand):
+    help = 'Rebuild the search document of every candidate profile'
+
+    def handle(self, *args, **options):
+        count = 0
+        profile_ids = CandidateProfile.objects.values_list('id', flat=True)
+        for profile_id in profile_ids.iterator(chunk_size=2000):
+            refresh_search_document(profile_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} search documents"))
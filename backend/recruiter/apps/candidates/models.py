@@ -1,8 +1,34 @@
-from django.db import models
+from django.db import models, transaction
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
 
 User = get_user_model()
 
+USE_POSTGRES = settings.DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+
+class ParsedResume(models.Model):
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('PARSED', 'Parsed'),
+        ('FAILED', 'Failed'),
+    ]
+
+    content_hash = models.CharField(max_length=64, unique=True, help_text='SHA-256 of the file')
+    file_name = models.CharField(max_length=255, help_text='Storage name of the stored file')
+    size = models.BigIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    text = models.TextField(blank=True)
+    skill_tokens = models.TextField(blank=True, help_text='Most frequent normalised terms')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    parsed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
+
 class CandidateProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     phone_number = models.CharField(max_length=20)
@@ -12,12 +38,50 @@ class CandidateProfile(models.Model):
     skills = models.TextField()
     education = models.TextField()
     resume = models.FileField(upload_to='resumes/')
+    parsed_resume = models.ForeignKey(
+        ParsedResume,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='profiles'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user.email}'s Profile"
 
+    def save(self, *args, **kwargs):
+        from .search import refresh_search_document
+        with transaction.atomic():
+            # Parsing is queued on commit, after the profile references the resume
+            if self.resume and not self.resume._committed:
+                from .resumes import ingest_resume
+                self.parsed_resume = ingest_resume(self.resume)
+            adding = self._state.adding
+            super().save(*args, **kwargs)
+            refresh_search_document(self.pk)
+            if adding:
+                # Cached tokens carry the candidate role
+                from recruiter.authentication import invalidate_user_tokens
+                invalidate_user_tokens(self.user_id)
+
+    def delete(self, *args, **kwargs):
+        from recruiter.authentication import invalidate_user_tokens
+        with transaction.atomic():
+            invalidate_user_tokens(self.user_id)
+            return super().delete(*args, **kwargs)
+
+def candidate_changed(profile_id):
+    """
+    Mark a profile as modified after one of its skills, experiences or its
+    parsed resume changed, so incremental job matching and the search
+    document pick up the edit.
+    """
+    from .search import refresh_search_document
+    CandidateProfile.objects.filter(pk=profile_id).update(updated_at=timezone.now())
+    refresh_search_document(profile_id)
+
 class CandidateSkill(models.Model):
     SKILL_LEVEL_CHOICES = [
         ('BEGINNER', 'Beginner'),
@@ -34,6 +98,15 @@ class CandidateSkill(models.Model):
     def __str__(self):
         return f"{self.candidate.user.email} - {self.skill_name}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        candidate_changed(self.candidate_id)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        candidate_changed(self.candidate_id)
+        return result
+
 class CandidateExperience(models.Model):
     candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE)
     company_name = models.CharField(max_length=100)
@@ -44,4 +117,51 @@ class CandidateExperience(models.Model):
     description = models.TextField()
 
     def __str__(self):
-        return f"{self.candidate.user.email} - {self.position} at {self.company_name}" 
\ No newline at end of file
+        return f"{self.candidate.user.email} - {self.position} at {self.company_name}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        candidate_changed(self.candidate_id)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        candidate_changed(self.candidate_id)
+        return result
+
+class CandidateSearchDocument(models.Model):
+    candidate = models.OneToOneField(
+        CandidateProfile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document'
+    )
+    location = models.CharField(max_length=100)
+    years_of_experience = models.IntegerField()
+    skills_text = models.TextField(blank=True)
+    experience_text = models.TextField(blank=True)
+    terms = models.TextField(blank=True, help_text='Distinct normalised search terms')
+    search_vector = SearchVectorField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['years_of_experience']),
+        ]
+        if USE_POSTGRES:
+            # Requires the pg_trgm extension.
+            indexes += [
+                GinIndex(fields=['search_vector'], name='candidate_search_vector_idx'),
+                GinIndex(
+                    fields=['terms'],
+                    name='candidate_search_terms_trgm',
+                    opclasses=['gin_trgm_ops']
+                ),
+                GinIndex(
+                    fields=['location'],
+                    name='candidate_search_location_trgm',
+                    opclasses=['gin_trgm_ops']
+                ),
+            ]
+
+    def __str__(self):
+        return f"Search document for {self.candidate}"
@@ -0,0 +1,104 @@
+import hashlib
+import re
+import zipfile
+from collections import Counter
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from recruiter.apps.jobs.matching import tokenize
+from .models import ParsedResume, CandidateProfile, candidate_changed
+
+XML_TAG_RE = re.compile(r'<[^>]+>')
+
+def hash_file(file):
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+def ingest_resume(field_file):
+    """
+    Deduplicate an uncommitted resume upload by content hash.
+
+    A file whose hash is already known is not stored again: the field is
+    pointed at the existing storage name. New files are streamed to storage
+    and queued for text extraction once the transaction commits. Returns the
+    ParsedResume for the file.
+    """
+    upload = field_file.file
+    content_hash = hash_file(upload)
+    resume = ParsedResume.objects.filter(content_hash=content_hash).first()
+    if resume is not None:
+        field_file.name = resume.file_name
+        field_file._committed = True
+        return resume
+
+    field_file.save(field_file.name, upload, save=False)
+    resume, created = ParsedResume.objects.get_or_create(
+        content_hash=content_hash,
+        defaults={'file_name': field_file.name, 'size': upload.size}
+    )
+    if created:
+        queue_parse(resume)
+    return resume
+
+def ingest_stored_resume(name):
+    """
+    Register a file that is already in storage, hashing it as a stream.
+    """
+    with default_storage.open(name, 'rb') as file:
+        content_hash = hash_file(file)
+        size = file.size
+    resume, created = ParsedResume.objects.get_or_create(
+        content_hash=content_hash,
+        defaults={'file_name': name, 'size': size}
+    )
+    if created:
+        queue_parse(resume)
+    return resume
+
+def queue_parse(resume):
+    from .tasks import parse_resume
+    transaction.on_commit(lambda: parse_resume.delay(resume.pk))
+
+def extract_text(file, name):
+    extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    if extension == 'pdf':
+        from pypdf import PdfReader
+        return '\n'.join(page.extract_text() or '' for page in PdfReader(file).pages)
+    if extension == 'docx':
+        with zipfile.ZipFile(file) as archive:
+            xml = archive.read('word/document.xml').decode('utf-8')
+        return XML_TAG_RE.sub(' ', xml.replace('</w:p>', '\n'))
+    return file.read().decode('utf-8', errors='ignore')
+
+def parse(resume):
+    """
+    Extract text and skill tokens from a stored resume and notify the
+    profiles using it, so matching and search reindex them.
+    """
+    try:
+        with default_storage.open(resume.file_name, 'rb') as file:
+            text = extract_text(file, resume.file_name)
+    except Exception as exc:
+        resume.status = 'FAILED'
+        resume.error = str(exc)
+        resume.save(update_fields=['status', 'error'])
+        return resume
+
+    terms = Counter(tokenize(text)).most_common(settings.RESUME_MAX_SKILL_TOKENS)
+    resume.text = ' '.join(text.split())[:settings.RESUME_MAX_TEXT_LENGTH]
+    resume.skill_tokens = ' '.join(term for term, _ in terms)
+    resume.status = 'PARSED'
+    resume.error = ''
+    resume.parsed_at = timezone.now()
+    resume.save(update_fields=['text', 'skill_tokens', 'status', 'error', 'parsed_at'])
+
+    profile_ids = CandidateProfile.objects.filter(parsed_resume=resume).values_list('id', flat=True)
+    for profile_id in profile_ids:
+        candidate_changed(profile_id)
+    return resume
@@ -0,0 +1,218 @@
+import math
+import threading
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import add
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+)
+from django.db import connection
+from django.db.models import F, Q
+
+from recruiter.apps.jobs.matching import tokenize
+from .models import (
+    CandidateProfile, CandidateSkill, CandidateExperience,
+    CandidateSearchDocument
+)
+
+SKILLS_WEIGHT = 2
+EXPERIENCE_WEIGHT = 1
+
+
+def refresh_search_document(profile_id):
+    """
+    Rebuild the search document for one candidate profile.
+    """
+    profile = CandidateProfile.objects.select_related('parsed_resume').filter(pk=profile_id).first()
+    if profile is None:
+        return None
+
+    skill_names = CandidateSkill.objects.filter(
+        candidate_id=profile_id
+    ).values_list('skill_name', flat=True)
+    experiences = CandidateExperience.objects.filter(
+        candidate_id=profile_id
+    ).values_list('position', 'company_name', 'description')
+
+    skills_text = ' '.join([profile.current_position, profile.skills, *skill_names])
+    experience_text = ' '.join(' '.join(row) for row in experiences)
+    if profile.parsed_resume is not None:
+        experience_text = f'{experience_text} {profile.parsed_resume.skill_tokens}'.strip()
+    terms = sorted(set(tokenize(skills_text)) | set(tokenize(experience_text)))
+
+    document, _ = CandidateSearchDocument.objects.update_or_create(
+        candidate_id=profile_id,
+        defaults={
+            'location': profile.location,
+            'years_of_experience': profile.years_of_experience,
+            'skills_text': skills_text,
+            'experience_text': experience_text,
+            'terms': ' '.join(terms),
+        }
+    )
+
+    if connection.vendor == 'postgresql':
+        CandidateSearchDocument.objects.filter(pk=profile_id).update(
+            search_vector=(
+                SearchVector('skills_text', weight='A', config='english') +
+                SearchVector('experience_text', weight='B', config='english')
+            )
+        )
+    elif _index is not None:
+        _index.add(profile_id, document_terms(skills_text, experience_text))
+
+    return document
+
+
+def document_terms(skills_text, experience_text):
+    terms = Counter()
+    for term in tokenize(skills_text):
+        terms[term] += SKILLS_WEIGHT
+    for term in tokenize(experience_text):
+        terms[term] += EXPERIENCE_WEIGHT
+    return terms
+
+
+def trigrams(term):
+    padded = f'  {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class InvertedIndex:
+    """
+    In-process inverted index used when the database has no full-text
+    search (SQLite in tests and local development). Query terms are
+    expanded to indexed terms with a similar trigram set, which gives the
+    same kind of typo tolerance as pg_trgm.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.documents = {}
+        self.term_trigrams = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def add(self, doc_id, terms):
+        with self.lock:
+            self._remove(doc_id)
+            self.documents[doc_id] = terms
+            for term, weight in terms.items():
+                if term not in self.postings:
+                    for gram in trigrams(term):
+                        self.term_trigrams[gram].add(term)
+                self.postings[term][doc_id] = weight
+
+    def remove(self, doc_id):
+        with self.lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        for term in self.documents.pop(doc_id, ()):
+            self.postings[term].pop(doc_id, None)
+
+    def expand(self, term, threshold):
+        if self.postings.get(term):
+            return [(term, 1.0)]
+        grams = trigrams(term)
+        candidates = set()
+        for gram in grams:
+            candidates |= self.term_trigrams.get(gram, set())
+        expanded = []
+        for candidate in candidates:
+            if not self.postings.get(candidate):
+                continue
+            other = trigrams(candidate)
+            similarity = len(grams & other) / len(grams | other)
+            if similarity >= threshold:
+                expanded.append((candidate, similarity))
+        return expanded
+
+    def search(self, query_terms, threshold):
+        """
+        Return {doc_id: score} using a TF-IDF sum over the expanded query
+        terms, each contribution scaled by its trigram similarity.
+        """
+        scores = defaultdict(float)
+        total = max(len(self.documents), 1)
+        with self.lock:
+            for query_term in query_terms:
+                for term, similarity in self.expand(query_term, threshold):
+                    postings = self.postings[term]
+                    idf = math.log(1 + total / len(postings))
+                    for doc_id, weight in postings.items():
+                        scores[doc_id] += similarity * idf * (1 + math.log(weight))
+        return scores
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            index = InvertedIndex()
+            rows = CandidateSearchDocument.objects.values_list(
+                'candidate_id', 'skills_text', 'experience_text'
+            )
+            for doc_id, skills_text, experience_text in rows.iterator(chunk_size=2000):
+                index.add(doc_id, document_terms(skills_text, experience_text))
+            _index = index
+    return _index
+
+
+def filter_documents(queryset, location=None, min_experience=None, max_experience=None):
+    if location:
+        queryset = queryset.filter(location__icontains=location)
+    if min_experience is not None:
+        queryset = queryset.filter(years_of_experience__gte=min_experience)
+    if max_experience is not None:
+        queryset = queryset.filter(years_of_experience__lte=max_experience)
+    return queryset
+
+
+def search_candidates(query, limit=20, queryset=None, **filters):
+    """
+    Return up to ``limit`` CandidateSearchDocument rows matching ``query``,
+    best match first, each annotated with a ``score``. ``queryset`` sets
+    the relations loaded with each row and defaults to the candidate and
+    their user.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+
+    if queryset is None:
+        queryset = CandidateSearchDocument.objects.select_related('candidate__user')
+    queryset = filter_documents(queryset, **filters)
+
+    if connection.vendor == 'postgresql':
+        search_query = SearchQuery(' '.join(terms), search_type='websearch', config='english')
+        similarity = reduce(add, [TrigramWordSimilarity(term, 'terms') for term in terms])
+        fuzzy = reduce(lambda a, b: a | b, [Q(terms__trigram_word_similar=term) for term in terms])
+        return list(
+            queryset.filter(Q(search_vector=search_query) | fuzzy)
+            .annotate(
+                rank=SearchRank(F('search_vector'), search_query),
+                similarity=similarity,
+            )
+            .annotate(score=F('rank') + F('similarity') / len(terms))
+            .order_by('-score', 'candidate_id')[:limit]
+        )
+
+    scores = get_index().search(terms, settings.CANDIDATE_SEARCH_SIMILARITY)
+    ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+    documents = []
+    for start in range(0, len(ranked), 500):
+        chunk = ranked[start:start + 500]
+        found = {doc.pk: doc for doc in queryset.filter(pk__in=chunk)}
+        for doc_id in chunk:
+            if doc_id in found:
+                found[doc_id].score = scores[doc_id]
+                documents.append(found[doc_id])
+        if len(documents) >= limit:
+            break
+    return documents[:limit]
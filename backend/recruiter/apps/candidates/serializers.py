@@ -1,5 +1,9 @@
 from rest_framework import serializers
-from .models import CandidateProfile, CandidateSkill, CandidateExperience
+from recruiter.sparse import SparseFieldsetMixin
+from .models import (
+    CandidateProfile, CandidateSkill, CandidateExperience,
+    CandidateSearchDocument
+)
 
 class CandidateSkillSerializer(serializers.ModelSerializer):
     class Meta:
@@ -18,4 +22,39 @@ class CandidateProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = CandidateProfile
         fields = '__all__'
-        read_only_fields = ('user', 'created_at', 'updated_at') 
\ No newline at end of file
+        read_only_fields = ('user', 'parsed_resume', 'created_at', 'updated_at')
+
+class CandidateSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField()
+    location = serializers.CharField(required=False)
+    min_experience = serializers.IntegerField(required=False, min_value=0)
+    max_experience = serializers.IntegerField(required=False, min_value=0)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100, default=20)
+
+class CandidateSearchResultSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(source='candidate_id', read_only=True)
+    user = serializers.IntegerField(source='candidate.user_id', read_only=True)
+    name = serializers.CharField(source='candidate.user.get_full_name', read_only=True)
+    email = serializers.EmailField(source='candidate.user.email', read_only=True)
+    current_position = serializers.CharField(source='candidate.current_position', read_only=True)
+    score = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = CandidateSearchDocument
+        fields = [
+            'id', 'user', 'name', 'email', 'current_position', 'location',
+            'years_of_experience', 'score'
+        ]
+        select_related = {
+            'user': 'candidate',
+            'name': 'candidate__user',
+            'email': 'candidate__user',
+            'current_position': 'candidate',
+        }
+        # Search columns are matched in SQL but never rendered
+        deferred = {
+            'skills_text': 'skills_text',
+            'experience_text': 'experience_text',
+            'terms': 'terms',
+            'search_vector': 'search_vector',
+        }
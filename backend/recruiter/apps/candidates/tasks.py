@@ -0,0 +1,27 @@
+from celery import shared_task
+from .models import ParsedResume
+from .resumes import parse
+from .search import refresh_search_document
+
+@shared_task
+def parse_resume(parsed_resume_id):
+    """
+    Extract text and skill tokens from an ingested resume, once per file.
+    """
+    try:
+        resume = ParsedResume.objects.get(id=parsed_resume_id)
+    except ParsedResume.DoesNotExist:
+        return None
+    if resume.status != 'PARSED':
+        parse(resume)
+    return resume.status
+
+@shared_task
+def refresh_search_documents(profile_ids):
+    """
+    Rebuild the search documents of profiles written in bulk, which skips
+    CandidateProfile.save.
+    """
+    for profile_id in profile_ids:
+        refresh_search_document(profile_id)
+    return len(profile_ids)
\ No newline at end of file
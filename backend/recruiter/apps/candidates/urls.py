@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import CandidateSearchView
+
+urlpatterns = [
+    path('search/', CandidateSearchView.as_view(), name='candidate-search'),
+]
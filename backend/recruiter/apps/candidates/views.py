@@ -0,0 +1,34 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from recruiter.sparse import sparse_queryset
+from .models import CandidateSearchDocument
+from .search import search_candidates
+from .serializers import CandidateSearchQuerySerializer, CandidateSearchResultSerializer
+
+class CandidateSearchView(APIView):
+    """
+    Ranked, typo-tolerant candidate search over the maintained search
+    documents, filterable by location and years of experience.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        params = CandidateSearchQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = params.validated_data
+        context = {'request': request}
+        documents = search_candidates(
+            data['q'],
+            limit=data['limit'],
+            queryset=sparse_queryset(
+                CandidateSearchDocument.objects.all(),
+                CandidateSearchResultSerializer(context=context)
+            ),
+            location=data.get('location'),
+            min_experience=data.get('min_experience'),
+            max_experience=data.get('max_experience'),
+        )
+        return Response(CandidateSearchResultSerializer(documents, many=True, context=context).data)
@@ -0,0 +1,108 @@
+import gzip
+import json
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import (
+    Interview, InterviewQuestion, InterviewFeedback, InterviewArchiveRun, TranscriptSegment
+)
+
+def archivable_interviews(cutoff_date):
+    return Interview.objects.filter(status='COMPLETED', updated_at__lt=cutoff_date)
+
+def get_or_start_run():
+    """
+    Resume the last unfinished archive run, or start a new one with a fresh
+    retention cutoff.
+    """
+    run = InterviewArchiveRun.objects.filter(finished_at__isnull=True).first()
+    if run is None:
+        cutoff_date = timezone.now() - timezone.timedelta(days=settings.INTERVIEW_RETENTION_DAYS)
+        run = InterviewArchiveRun.objects.create(cutoff_date=cutoff_date)
+    return run
+
+def build_archive(interviews):
+    """
+    Return gzip-compressed JSONL with one line per interview, its questions,
+    feedback and transcript segments nested inside.
+    """
+    ids = [interview['id'] for interview in interviews]
+    questions = {}
+    # Bank text is copied in so archives stay readable without the bank
+    for question in InterviewQuestion.objects.filter(interview_id__in=ids).values(
+        'id', 'interview_id', 'bank_question_id', 'question_type', 'candidate_answer',
+        'score', 'notes',
+        question_text=F('bank_question__question_text'),
+        expected_answer=F('bank_question__expected_answer'),
+    ):
+        questions.setdefault(question['interview_id'], []).append(question)
+    feedback = {
+        row['interview_id']: row
+        for row in InterviewFeedback.objects.filter(interview_id__in=ids).values()
+    }
+
+    segments = {}
+    for segment in TranscriptSegment.objects.filter(interview_id__in=ids).order_by(
+        'interview_id', 'sequence'
+    ).values():
+        segments.setdefault(segment['interview_id'], []).append(segment)
+
+    lines = []
+    for interview in interviews:
+        interview['questions'] = questions.get(interview['id'], [])
+        interview['transcript_segments'] = segments.get(interview['id'], [])
+        interview['interview_feedback'] = feedback.get(interview['id'])
+        lines.append(json.dumps(interview, cls=DjangoJSONEncoder))
+    return gzip.compress(('\n'.join(lines) + '\n').encode('utf-8'))
+
+def archive_chunk(run, interviews):
+    first, last = interviews[0]['id'], interviews[-1]['id']
+    name = (
+        f"{settings.INTERVIEW_ARCHIVE_PREFIX}/{run.started_at:%Y%m%d}-{run.pk}/"
+        f"interviews-{first:012d}-{last:012d}.jsonl.gz"
+    )
+    # A run interrupted between upload and delete re-archives the same chunk
+    # under the same name on resume.
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    default_storage.save(name, ContentFile(build_archive(interviews)))
+
+    ids = [interview['id'] for interview in interviews]
+    with transaction.atomic():
+        # Questions, feedback and segments are removed by the collector's set-based
+        # cascade, one DELETE per table for the whole chunk. The queryset delete
+        # skips the model hooks, so the analytics rollups keep archived history.
+        archivable_interviews(run.cutoff_date).filter(pk__in=ids).delete()
+        run.last_interview_id = last
+        run.archived_count += len(ids)
+        run.file_count += 1
+        run.save(update_fields=['last_interview_id', 'archived_count', 'file_count', 'updated_at'])
+
+def archive_old_interviews(max_chunks=None):
+    """
+    Archive completed interviews older than the retention period to
+    compressed JSONL in the default storage and delete them, one bounded
+    chunk at a time. Progress is checkpointed after every chunk so an
+    interrupted or ``max_chunks``-limited run resumes where it stopped.
+    """
+    run = get_or_start_run()
+    chunk_size = settings.INTERVIEW_ARCHIVE_CHUNK_SIZE
+    chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        interviews = list(
+            archivable_interviews(run.cutoff_date)
+            .filter(pk__gt=run.last_interview_id)
+            .order_by('pk')
+            .values()[:chunk_size]
+        )
+        if not interviews:
+            run.finished_at = timezone.now()
+            run.save(update_fields=['finished_at', 'updated_at'])
+            break
+        archive_chunk(run, interviews)
+        chunks += 1
+    return run
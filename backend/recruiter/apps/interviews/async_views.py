@@ -0,0 +1,47 @@
+from django.http import JsonResponse
+from rest_framework.exceptions import NotFound
+from recruiter.asyncapi import async_api_view
+from recruiter.sparse import sparse_queryset
+from .models import Interview
+from .serializers import InterviewSerializer, InterviewListSerializer
+from .views import InterviewPagination, InterviewViewSet, visible_interviews
+
+def filtered(queryset, params):
+    for field in InterviewViewSet.filterset_fields:
+        if params.get(field):
+            queryset = queryset.filter(**{field: params[field]})
+    return queryset
+
+@async_api_view()
+async def interview_list(request, roles):
+    """
+    Async, keyset-paginated version of the interview list for long-polling
+    dashboards, with the same visibility rules and filters.
+    """
+    context = {'request': request}
+    queryset = visible_interviews(
+        sparse_queryset(Interview.objects.all(), InterviewListSerializer(context=context)),
+        request.user,
+        roles
+    )
+    paginator = InterviewPagination()
+    try:
+        rows = await paginator.apaginate_queryset(filtered(queryset, request.query_params), request)
+    except ValueError as exc:
+        return JsonResponse({'detail': str(exc)}, status=400)
+    except NotFound as exc:
+        return JsonResponse({'detail': str(exc.detail)}, status=404)
+    data = InterviewListSerializer(rows, many=True, context=context).data
+    return JsonResponse(paginator.get_paginated_data(data))
+
+@async_api_view()
+async def interview_detail(request, roles, pk):
+    context = {'request': request}
+    interview = await visible_interviews(
+        sparse_queryset(Interview.objects.all(), InterviewSerializer(context=context)),
+        request.user,
+        roles
+    ).filter(pk=pk).afirst()
+    if interview is None:
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    return JsonResponse(InterviewSerializer(interview, context=context).data)
@@ -0,0 +1,119 @@
+import asyncio
+import json
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+from .models import Interview
+from .stt import get_stt_backend
+from .transcripts import SegmentWriter
+
+END_OF_STREAM = None
+
+class InterviewStreamConsumer(AsyncWebsocketConsumer):
+    """
+    Streams audio for an in-progress interview to the speech-to-text backend
+    and sends partial and final transcripts back.
+
+    Binary frames are audio chunks; a ``{"type": "end"}`` text frame ends the
+    stream. Chunks wait in a bounded queue. When it fills up the client gets
+    a ``backpressure`` message and the receive loop stops reading until
+    there is room, so the ASGI server stops reading the socket as well. A
+    client that stays blocked past STT_BACKPRESSURE_TIMEOUT is disconnected
+    with code 1013.
+    """
+
+    async def connect(self):
+        self.worker = None
+        self.paused = False
+        interview_id = self.scope['url_route']['kwargs']['interview_id']
+        self.interview = await self.get_interview(self.scope.get('user'), interview_id)
+        if self.interview is None:
+            await self.close(code=4403)
+            return
+
+        self.queue = asyncio.Queue(maxsize=settings.STT_MAX_BUFFERED_CHUNKS)
+        self.writer = SegmentWriter(self.interview.pk)
+        self.segment_start = 0
+        await self.accept()
+        self.worker = asyncio.create_task(self.transcribe())
+
+    @database_sync_to_async
+    def get_interview(self, user, interview_id):
+        if user is None or not user.is_authenticated:
+            return None
+        interview = Interview.objects.select_related('candidate__user').filter(
+            pk=interview_id,
+            status='IN_PROGRESS'
+        ).first()
+        if interview is None:
+            return None
+        if user.pk == interview.candidate.user_id:
+            self.speaker = 'CANDIDATE'
+        elif user.is_staff or user.pk == interview.interviewer_id:
+            self.speaker = 'INTERVIEWER'
+        else:
+            return None
+        return interview
+
+    async def receive(self, text_data=None, bytes_data=None):
+        if bytes_data is None:
+            try:
+                message = json.loads(text_data or '{}')
+            except ValueError:
+                message = {}
+            if message.get('type') == 'end':
+                await self.enqueue(END_OF_STREAM)
+            return
+
+        if len(bytes_data) > settings.STT_MAX_CHUNK_BYTES:
+            await self.close(code=1009)
+            return
+        await self.enqueue(bytes_data)
+
+    async def enqueue(self, chunk):
+        if self.queue.full() and not self.paused:
+            self.paused = True
+            await self.send(text_data=json.dumps({'type': 'backpressure', 'paused': True}))
+        try:
+            await asyncio.wait_for(self.queue.put(chunk), settings.STT_BACKPRESSURE_TIMEOUT)
+        except asyncio.TimeoutError:
+            await self.close(code=1013)
+
+    async def chunks(self):
+        resume_at = settings.STT_MAX_BUFFERED_CHUNKS // 2
+        while True:
+            chunk = await self.queue.get()
+            if self.paused and self.queue.qsize() <= resume_at:
+                self.paused = False
+                await self.send(text_data=json.dumps({'type': 'backpressure', 'paused': False}))
+            if chunk is END_OF_STREAM:
+                return
+            yield chunk
+
+    async def transcribe(self):
+        try:
+            async for transcript in get_stt_backend().transcribe(self.chunks()):
+                await self.send(text_data=json.dumps({
+                    'type': 'transcript',
+                    'text': transcript.text,
+                    'final': transcript.final,
+                    'offset_ms': transcript.offset_ms,
+                }))
+                if transcript.final and self.store(transcript):
+                    await database_sync_to_async(self.writer.flush)()
+            await database_sync_to_async(self.writer.flush)()
+            await self.send(text_data=json.dumps({'type': 'done'}))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await self.close(code=1011)
+
+    def store(self, transcript):
+        start, self.segment_start = self.segment_start, transcript.offset_ms
+        return self.writer.add(self.speaker, transcript.text, start, transcript.offset_ms)
+
+    async def disconnect(self, code):
+        if self.worker is not None:
+            self.worker.cancel()
+            # Keep the final utterances of a dropped connection
+            await database_sync_to_async(self.writer.flush)()
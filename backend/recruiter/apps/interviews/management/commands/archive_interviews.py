@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from recruiter.apps.interviews.archive import archive_old_interviews
+
+class Command(BaseCommand):
+    help = 'Archive and delete completed interviews older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-chunks',
+            type=int,
+            default=None,
+            help='Stop after this many chunks; the next run resumes from the checkpoint'
+        )
+
+    def handle(self, *args, **options):
+        run = archive_old_interviews(max_chunks=options['max_chunks'])
+        state = 'finished' if run.finished_at else 'paused'
+        self.stdout.write(self.style.SUCCESS(
+            f"Archive run {run.pk} {state}: {run.archived_count} interviews "
+            f"in {run.file_count} files"
+        ))
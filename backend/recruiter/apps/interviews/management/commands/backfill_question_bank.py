@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from recruiter.apps.interviews.question_bank import backfill_question_bank
+
+class Command(BaseCommand):
+    help = (
+        'Move the text of existing interview questions into the question bank. '
+        'Run it before applying the migration that drops question_text and expected_answer'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        linked = backfill_question_bank(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Linked {linked} interview questions to the bank"))
\ No newline at end of file
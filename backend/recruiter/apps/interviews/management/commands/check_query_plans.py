@@ -0,0 +1,72 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from recruiter.apps.interviews.models import Interview
+from recruiter.benchmarks.factories import seed
+from recruiter.benchmarks.plans import MIN_ROWS, PLAN_VENDORS, check_plans
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot querysets and fail on sequential scans or plans over their cost budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=0.1,
+            help=(
+                'Seed benchmark data at this scale when the database has no interviews; '
+                'the default seeds 100k interviews and 1k jobs, so every table the hot '
+                'queries read is at or above the default --min-rows'
+            )
+        )
+        parser.add_argument('--no-seed', action='store_true', help='Use the existing data as is')
+        parser.add_argument(
+            '--cost-factor',
+            type=float,
+            default=1.0,
+            help='Multiply every cost budget, e.g. for larger data sets'
+        )
+        parser.add_argument(
+            '--allow-seq-scan',
+            action='append',
+            default=[],
+            help='Table allowed to be read with a sequential scan (repeatable)'
+        )
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=MIN_ROWS,
+            help='Ignore sequential scans of tables estimated below this many rows (PostgreSQL)'
+        )
+        parser.add_argument('--output', default=None, help='Write the results as JSON')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in PLAN_VENDORS:
+            raise CommandError(f"Plan checks are not supported on {connection.vendor}")
+        if not options['no_seed'] and not Interview.objects.exists():
+            seed(scale=options['scale'], stdout=self.stdout)
+        if connection.vendor == 'postgresql':
+            # Fresh statistics so the planner sees the seeded volumes
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        rows = check_plans(
+            cost_factor=options['cost_factor'],
+            allow_seq_scan=set(options['allow_seq_scan']),
+            min_rows=options['min_rows']
+        )
+
+        for row in rows:
+            cost = 'n/a' if row['cost'] is None else f"{row['cost']:.1f}/{row['budget']:.0f}"
+            scans = ', '.join(row['seq_scans']) or '-'
+            line = f"{row['query']}: cost {cost}, seq scans {scans}"
+            self.stdout.write(self.style.ERROR(line) if row['failed'] else line)
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(rows, file, indent=2)
+
+        failed = [row['query'] for row in rows if row['failed']]
+        if failed:
+            raise CommandError(f"Query plans regressed: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f"All {len(rows)} query plans within budget"))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from recruiter.benchmarks import suite
+
+class Command(BaseCommand):
+    help = 'Compare benchmark results against a baseline and fail on regressions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('baseline', help='Baseline JSON written by run_benchmarks')
+        parser.add_argument('current', help='Current JSON written by run_benchmarks')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=10.0,
+            help='Percentage change counted as a regression'
+        )
+
+    def handle(self, *args, **options):
+        rows = suite.compare(
+            suite.load(options['baseline']),
+            suite.load(options['current']),
+            options['threshold'],
+        )
+        regressions = [row for row in rows if row['regression']]
+        for row in rows:
+            line = (
+                f"{row['benchmark']} {row['metric']}: {row['baseline']:.2f} -> "
+                f"{row['current']:.2f} ({row['change_percent']:+.1f}%)"
+            )
+            self.stdout.write(self.style.ERROR(line) if row['regression'] else line)
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} metrics regressed more than {options['threshold']}%"
+            )
+        self.stdout.write(self.style.SUCCESS('No regressions'))
@@ -0,0 +1,48 @@
+import json
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+from recruiter.benchmarks.load import compare_modes
+
+class Command(BaseCommand):
+    help = (
+        'Compare requests per second and p99 latency of the read endpoints on a '
+        'WSGI server (sync viewsets) and an ASGI server (async views)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000', help='e.g. gunicorn recruiter.wsgi')
+        parser.add_argument(
+            '--asgi-url',
+            default='http://127.0.0.1:8001',
+            help='e.g. gunicorn recruiter.asgi:application -k uvicorn.workers.UvicornWorker'
+        )
+        parser.add_argument('--token', default=None, help='API token; defaults to the first staff user')
+        parser.add_argument('--concurrency', type=int, default=50, help='Concurrent connections')
+        parser.add_argument('--duration', type=float, default=15, help='Seconds per endpoint and mode')
+        parser.add_argument('--output', default=None, help='Write the results as JSON')
+
+    def handle(self, *args, **options):
+        token = options['token']
+        if token is None:
+            user = get_user_model().objects.filter(is_staff=True).order_by('pk').first()
+            if user is None:
+                raise CommandError('No staff user to authenticate as; pass --token')
+            token = Token.objects.get_or_create(user=user)[0].key
+
+        results = compare_modes(
+            options['wsgi_url'],
+            options['asgi_url'],
+            token,
+            options['concurrency'],
+            options['duration'],
+        )
+        for name, metrics in results.items():
+            self.stdout.write(
+                f"{name}: {metrics['requests_per_second']:.1f} req/s, "
+                f"p50 {metrics['p50_ms']:.1f} ms, p99 {metrics['p99_ms']:.1f} ms, "
+                f"{metrics['errors']} errors"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(results, file, indent=2, sort_keys=True)
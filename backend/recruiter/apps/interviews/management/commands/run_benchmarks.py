@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from recruiter.benchmarks import suite
+
+class Command(BaseCommand):
+    help = 'Benchmark endpoints, serializers and tasks against the local database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='benchmark.json', help='Where to write the JSON results')
+        parser.add_argument('--iterations', type=int, default=50, help='Requests per endpoint')
+        parser.add_argument('--skip-tasks', action='store_true', help='Do not time the Celery tasks')
+
+    def handle(self, *args, **options):
+        document = suite.run(
+            iterations=options['iterations'],
+            include_tasks=not options['skip_tasks'],
+        )
+        suite.dump(document, options['output'])
+        for name, metrics in sorted(document['results'].items()):
+            values = ', '.join(f"{metric}={value:.2f}" for metric, value in sorted(metrics.items()))
+            self.stdout.write(f"{name}: {values}")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from recruiter.apps.interviews.scoring import score_pending_answers
+from recruiter.apps.interviews.tasks import score_interview_answers
+
+class Command(BaseCommand):
+    help = 'Score answered interview questions that have no score yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interview', type=int, default=None, help='Only score this interview')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='run_async',
+            help='Queue the Celery task instead of scoring in this process'
+        )
+
+    def handle(self, *args, **options):
+        if options['run_async']:
+            result = score_interview_answers.delay(options['interview'])
+            self.stdout.write(self.style.SUCCESS(f"Queued answer scoring task {result.id}"))
+            return
+
+        scored, calls = score_pending_answers(
+            interview_id=options['interview'],
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {scored} answers with {calls} scorer calls"
+        ))
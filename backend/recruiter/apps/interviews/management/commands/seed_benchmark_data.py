@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from recruiter.benchmarks.factories import seed
+
+class Command(BaseCommand):
+    help = 'Seed deterministic benchmark data (100k candidates, 10k jobs, 1M interviews at scale 1)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for the full volumes')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        counts = seed(
+            scale=options['scale'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            stdout=self.stdout,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Seeded {counts}"))
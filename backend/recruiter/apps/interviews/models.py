@@ -1,8 +1,29 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeBoundary, RangeOperators
+from django.db.models import F, Func, Q
 from django.utils import timezone
+from recruiter.apps.analytics.rollups import RollupMixin, feedback_deltas, interview_deltas
+from recruiter.apps.candidates.models import USE_POSTGRES
 
-class Interview(models.Model):
+ACTIVE_INTERVIEW_STATUSES = ['SCHEDULED', 'IN_PROGRESS']
+
+INTERVIEWER_OVERLAP_CONSTRAINT = 'exclude_interviewer_overlap'
+
+def is_interviewer_overlap(exc):
+    """
+    Whether an IntegrityError comes from the interviewer overlap exclusion
+    constraint rather than from any other constraint.
+    """
+    diag = getattr(exc.__cause__, 'diag', None)
+    return getattr(diag, 'constraint_name', None) == INTERVIEWER_OVERLAP_CONSTRAINT
+
+class TsTzRange(Func):
+    function = 'TSTZRANGE'
+    output_field = DateTimeRangeField()
+
+class Interview(RollupMixin, models.Model):
     INTERVIEW_STATUS_CHOICES = [
         ('SCHEDULED', 'Scheduled'),
         ('IN_PROGRESS', 'In Progress'),
@@ -18,7 +39,7 @@ class Interview(models.Model):
     ]
 
     candidate = models.ForeignKey(
-        'candidates.Candidate',
+        'candidates.CandidateProfile',
         on_delete=models.CASCADE,
         related_name='interviews'
     )
@@ -34,6 +55,10 @@ class Interview(models.Model):
     )
     scheduled_date = models.DateTimeField()
     duration = models.IntegerField(help_text='Duration in minutes')
+    scheduled_end = models.DateTimeField(
+        editable=False,
+        help_text='scheduled_date plus duration, kept for overlap checks'
+    )
     status = models.CharField(
         max_length=20,
         choices=INTERVIEW_STATUS_CHOICES,
@@ -51,21 +76,106 @@ class Interview(models.Model):
         blank=True,
         help_text='Rating from 1 to 5'
     )
+    reminder_sent_for = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Scheduled date the last reminder was sent for'
+    )
+    candidate_reminder_sent_for = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Scheduled date the candidate was last reminded for'
+    )
+    reminder_claimed_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Lease of the sweep currently sending the reminder'
+    )
+    reminder_failures = models.IntegerField(
+        default=0,
+        help_text='Failed reminder deliveries since the last successful one'
+    )
+    reminder_error = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    rollup_fields = ('job_id', 'interviewer_id', 'scheduled_date', 'status')
+    rollup_deltas = interview_deltas
+
     class Meta:
         ordering = ['-scheduled_date']
         indexes = [
             models.Index(fields=['scheduled_date']),
+            models.Index(fields=['scheduled_date', 'id']),
+            models.Index(fields=['status', 'scheduled_date']),
             models.Index(fields=['status']),
             models.Index(fields=['interview_type']),
+            models.Index(fields=['interviewer', 'scheduled_date']),
+            models.Index(fields=['candidate', 'scheduled_date'], name='interview_candidate_date'),
+            # Serves the one open interview per candidate and job check
+            models.Index(
+                fields=['candidate', 'job'],
+                condition=Q(status__in=ACTIVE_INTERVIEW_STATUSES),
+                name='interview_open_candidate_job'
+            ),
         ]
+        if USE_POSTGRES:
+            # Requires the btree_gist extension for the interviewer equality.
+            constraints = [
+                ExclusionConstraint(
+                    name=INTERVIEWER_OVERLAP_CONSTRAINT,
+                    expressions=[
+                        (F('interviewer'), RangeOperators.EQUAL),
+                        (
+                            TsTzRange('scheduled_date', 'scheduled_end', RangeBoundary()),
+                            RangeOperators.OVERLAPS
+                        ),
+                    ],
+                    condition=Q(status__in=ACTIVE_INTERVIEW_STATUSES),
+                ),
+            ]
 
     def __str__(self):
         return f"{self.candidate} - {self.job} - {self.scheduled_date}"
 
-class InterviewQuestion(models.Model):
+    def save(self, *args, **kwargs):
+        self.scheduled_end = self.compute_end(self.scheduled_date, self.duration)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'scheduled_date', 'duration'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'scheduled_end'}
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # Take the feedback out of the rollups before the cascade removes it
+            feedback = InterviewFeedback.objects.filter(interview_id=self.pk).first()
+            if feedback is not None:
+                feedback.delete()
+            return super().delete(*args, **kwargs)
+
+    @staticmethod
+    def compute_end(scheduled_date, duration):
+        return scheduled_date + timezone.timedelta(minutes=duration)
+
+    @classmethod
+    def interviewer_conflicts(cls, interviewer, start, end):
+        """
+        Active interviews of ``interviewer`` overlapping the [start, end) interval.
+        """
+        return cls.objects.filter(
+            interviewer=interviewer,
+            status__in=ACTIVE_INTERVIEW_STATUSES,
+            scheduled_date__lt=end,
+            scheduled_end__gt=start,
+        )
+
+class BankQuestion(models.Model):
+    """
+    A question of the shared bank. Interview questions reference it instead
+    of copying its text, and questions differing only in case or whitespace
+    are stored once. ``term_vector`` holds the precomputed term weights the
+    retrieval index is built from.
+    """
     QUESTION_TYPE_CHOICES = [
         ('TECHNICAL', 'Technical'),
         ('BEHAVIORAL', 'Behavioral'),
@@ -73,17 +183,48 @@ class InterviewQuestion(models.Model):
         ('SYSTEM_DESIGN', 'System Design'),
     ]
 
+    content_hash = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text='SHA-256 of the normalised type, question and expected answer'
+    )
+    question_text = models.TextField()
+    question_type = models.CharField(
+        max_length=20,
+        choices=QUESTION_TYPE_CHOICES
+    )
+    expected_answer = models.TextField(blank=True)
+    term_vector = models.JSONField(default=dict, blank=True, help_text='{term: weight}')
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Incremental reloads of the retrieval index
+            models.Index(fields=['updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.question_type} - {self.question_text[:50]}"
+
+class InterviewQuestion(models.Model):
+    QUESTION_TYPE_CHOICES = BankQuestion.QUESTION_TYPE_CHOICES
+
     interview = models.ForeignKey(
         Interview,
         on_delete=models.CASCADE,
         related_name='questions'
     )
-    question_text = models.TextField()
+    bank_question = models.ForeignKey(
+        BankQuestion,
+        on_delete=models.PROTECT,
+        related_name='interview_questions'
+    )
     question_type = models.CharField(
         max_length=20,
         choices=QUESTION_TYPE_CHOICES
     )
-    expected_answer = models.TextField(blank=True)
     candidate_answer = models.TextField(blank=True)
     score = models.IntegerField(
         null=True,
@@ -101,7 +242,7 @@ class InterviewQuestion(models.Model):
     def __str__(self):
         return f"{self.interview} - {self.question_type}"
 
-class InterviewFeedback(models.Model):
+class InterviewFeedback(RollupMixin, models.Model):
     interview = models.OneToOneField(
         Interview,
         on_delete=models.CASCADE,
@@ -125,8 +266,86 @@ class InterviewFeedback(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    rollup_fields = (
+        'interview_id', 'created_at', 'overall_rating', 'technical_skills_rating',
+        'communication_skills_rating', 'problem_solving_rating'
+    )
+    rollup_deltas = feedback_deltas
+
     class Meta:
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Feedback for {self.interview}" 
\ No newline at end of file
+        return f"Feedback for {self.interview}"
+
+class TranscriptSegment(models.Model):
+    """
+    One recognised utterance of an interview. Segments are only ever
+    inserted, in batches, so a long interview never rewrites a growing text
+    column; the full transcript is assembled on read.
+    """
+    SPEAKER_CHOICES = [
+        ('CANDIDATE', 'Candidate'),
+        ('INTERVIEWER', 'Interviewer'),
+        ('AGENT', 'Voice Agent'),
+    ]
+
+    interview = models.ForeignKey(
+        Interview,
+        on_delete=models.CASCADE,
+        related_name='transcript_segments'
+    )
+    question = models.ForeignKey(
+        InterviewQuestion,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='transcript_segments'
+    )
+    sequence = models.PositiveIntegerField()
+    speaker = models.CharField(max_length=20, choices=SPEAKER_CHOICES)
+    start_ms = models.PositiveIntegerField(help_text='Offset from the start of the interview')
+    end_ms = models.PositiveIntegerField()
+    text = models.CharField(max_length=2000)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['interview', 'sequence']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['interview', 'sequence'],
+                name='unique_transcript_sequence'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.interview_id} #{self.sequence} {self.speaker}"
+
+class ScoredAnswer(models.Model):
+    """
+    Scoring result cached by a hash of question, expected answer and
+    candidate answer, so identical answers are only sent to the scorer once.
+    """
+    content_hash = models.CharField(max_length=64, unique=True)
+    score = models.IntegerField(help_text='Score from 1 to 10')
+    rationale = models.TextField(blank=True)
+    backend = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} - {self.score}"
+
+class InterviewArchiveRun(models.Model):
+    cutoff_date = models.DateTimeField()
+    last_interview_id = models.BigIntegerField(default=0)
+    archived_count = models.IntegerField(default=0)
+    file_count = models.IntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Interview archive run {self.started_at}"
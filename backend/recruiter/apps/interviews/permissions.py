@@ -1,8 +1,10 @@
 from rest_framework import permissions
+from recruiter.roles import get_roles
 
 class IsInterviewerOrAdmin(permissions.BasePermission):
     """
     Custom permission to only allow interviewers or admins to access interview resources.
+    Roles come from the per-request memo, so no check queries the database.
     """
     def has_permission(self, request, view):
         # Allow read-only access for authenticated users
@@ -10,24 +12,39 @@ class IsInterviewerOrAdmin(permissions.BasePermission):
             return request.user and request.user.is_authenticated
         
         # Allow full access for staff and interviewers
-        return request.user and (
-            request.user.is_staff or
-            hasattr(request.user, 'interviewer_profile')
-        )
+        roles = get_roles(request)
+        return request.user and (roles.is_staff or roles.is_interviewer)
 
     def has_object_permission(self, request, view, obj):
+        roles = get_roles(request)
+        # Questions and feedback are checked against their interview
+        interview = getattr(obj, 'interview', obj)
         # Allow read-only access for the candidate and interviewer
         if request.method in permissions.SAFE_METHODS:
             return (
                 request.user.is_authenticated and
                 (
-                    request.user == obj.interviewer or
-                    request.user == obj.candidate.user
+                    request.user.pk == interview.interviewer_id or
+                    (
+                        roles.candidate_profile_id is not None and
+                        roles.candidate_profile_id == interview.candidate_id
+                    )
                 )
             )
         
         # Allow full access for staff and the assigned interviewer
         return (
-            request.user.is_staff or
-            request.user == obj.interviewer
-        ) 
\ No newline at end of file
+            roles.is_staff or
+            request.user.pk == interview.interviewer_id
+        )
+
+class IsInterviewerOrStaff(permissions.BasePermission):
+    """
+    Only staff and interviewers, for resources candidates must not see such
+    as the question bank with its expected answers.
+    """
+    def has_permission(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return False
+        roles = get_roles(request)
+        return roles.is_staff or roles.is_interviewer
\ No newline at end of file
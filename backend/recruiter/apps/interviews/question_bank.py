@@ -0,0 +1,278 @@
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from recruiter.apps.jobs.matching import TermSpace, job_terms, tokenize
+from .models import BankQuestion, InterviewQuestion
+
+QUESTION_WEIGHT = 2.0
+
+# How far back a reload re-reads changes, covering late commits and clock
+# skew between app servers
+RELOAD_OVERLAP = timezone.timedelta(minutes=5)
+
+def normalize(text):
+    return ' '.join((text or '').lower().split())
+
+def question_hash(question_type, question_text, expected_answer):
+    payload = json.dumps([question_type, normalize(question_text), normalize(expected_answer)])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def question_terms(question_text, expected_answer):
+    """
+    Term weights of a bank question; the question itself counts double.
+    """
+    terms = Counter()
+    for term in tokenize(question_text):
+        terms[term] += QUESTION_WEIGHT
+    for term in tokenize(expected_answer):
+        terms[term] += 1
+    return dict(terms)
+
+def build_bank_question(question_type, question_text, expected_answer=''):
+    return BankQuestion(
+        content_hash=question_hash(question_type, question_text, expected_answer),
+        question_text=question_text,
+        question_type=question_type,
+        expected_answer=expected_answer,
+        term_vector=question_terms(question_text, expected_answer),
+    )
+
+def get_bank_question(question_type, question_text, expected_answer=''):
+    """
+    Return the bank question for this content, adding it on first use.
+    """
+    question = build_bank_question(question_type, question_text, expected_answer)
+    bank_question, _ = BankQuestion.objects.get_or_create(
+        content_hash=question.content_hash,
+        defaults={
+            'question_text': question.question_text,
+            'question_type': question.question_type,
+            'expected_answer': question.expected_answer,
+            'term_vector': question.term_vector,
+        }
+    )
+    return bank_question
+
+def bank_question_ids(questions):
+    """
+    Map (question_type, question_text, expected_answer) tuples to bank
+    question ids with one insert and one read, for bulk writers.
+    """
+    built = {}
+    for content in questions:
+        question = build_bank_question(*content)
+        built.setdefault(question.content_hash, question)
+    BankQuestion.objects.bulk_create(list(built.values()), ignore_conflicts=True)
+    ids = dict(
+        BankQuestion.objects.filter(content_hash__in=list(built))
+        .values_list('content_hash', 'id')
+    )
+    return {content: ids[question_hash(*content)] for content in questions}
+
+def backfill_question_bank(interview_question_model=InterviewQuestion, batch_size=2000):
+    """
+    Move the text of interview questions written before the bank existed
+    into the bank and link each row to its bank question.
+
+    It reads the legacy ``question_text`` and ``expected_answer`` columns
+    with raw SQL, since the current model no longer has them, so it works
+    between the migration adding ``bank_question`` as nullable and the one
+    dropping the old columns. Returns the number of linked rows, 0 once the
+    old columns are gone. A data migration passes its historical model.
+    """
+    table = interview_question_model._meta.db_table
+    with connection.cursor() as cursor:
+        columns = {
+            column.name for column in connection.introspection.get_table_description(cursor, table)
+        }
+    if not {'question_text', 'expected_answer'} <= columns:
+        return 0
+
+    quote = connection.ops.quote_name
+    select = (
+        f'SELECT id, question_type, question_text, expected_answer FROM {quote(table)} '
+        f'WHERE bank_question_id IS NULL AND id > %s ORDER BY id LIMIT %s'
+    )
+    linked = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(select, [last_id, batch_size])
+                rows = cursor.fetchall()
+            if not rows:
+                return linked
+            ids = bank_question_ids(
+                [(question_type, text, answer or '') for _, question_type, text, answer in rows]
+            )
+            interview_question_model.objects.bulk_update([
+                interview_question_model(
+                    pk=pk, bank_question_id=ids[(question_type, text, answer or '')]
+                )
+                for pk, question_type, text, answer in rows
+            ], ['bank_question'])
+        linked += len(rows)
+        last_id = rows[-1][0]
+
+class QuestionIndex:
+    """
+    In-memory TF-IDF matrix over the active bank questions, answering top-k
+    queries with one sparse matrix-vector product.
+
+    The precomputed term vectors are kept in memory, so a reload reads only
+    the questions changed since the last one and rebuilds the matrix from
+    memory. IDF weights depend on the whole bank, which is why the matrix
+    itself is always rebuilt.
+    """
+
+    def __init__(self):
+        self.known = set()
+        self.vectors = {}
+        self.types = {}
+        self.loaded = False
+        self.loaded_at = None
+        self.max_id = 0
+        self.checked_at = float('-inf')
+        self.refresh_lock = threading.Lock()
+        # (ids, question types, term space, matrix), swapped in one assignment
+        # so concurrent queries never mix two versions
+        self.state = None
+
+    def apply(self, rows):
+        """
+        Apply (id, question_type, term_vector, is_active, updated_at) rows,
+        returning whether any of them changed the index.
+        """
+        changed = False
+        for question_id, question_type, term_vector, is_active, updated_at in rows:
+            self.known.add(question_id)
+            self.max_id = max(self.max_id, question_id)
+            if self.loaded_at is None or updated_at > self.loaded_at:
+                self.loaded_at = updated_at
+            if is_active:
+                if self.vectors.get(question_id) != term_vector or self.types.get(question_id) != question_type:
+                    self.vectors[question_id] = term_vector
+                    self.types[question_id] = question_type
+                    changed = True
+            elif question_id in self.vectors:
+                del self.vectors[question_id]
+                del self.types[question_id]
+                changed = True
+        return changed
+
+    def refresh(self):
+        """
+        Apply bank changes since the last load.
+
+        ``updated_at`` comes from the clocks of the app servers, so rows are
+        re-read from RELOAD_OVERLAP before the newest change seen, and every
+        id above the highest one seen is read whatever its timestamp. Rows
+        still missed, such as an insert that committed late with a lower id,
+        or hard deletes, show up in the row count, which triggers a read of
+        all ids and a load of the ones not seen yet.
+        """
+        rows = BankQuestion.objects.values_list(
+            'id', 'question_type', 'term_vector', 'is_active', 'updated_at'
+        )
+        total = BankQuestion.objects.count()
+        if self.loaded_at is None:
+            changed = rows.filter(pk__gt=self.max_id)
+        else:
+            changed = rows.filter(
+                Q(updated_at__gt=self.loaded_at - RELOAD_OVERLAP) | Q(pk__gt=self.max_id)
+            )
+        modified = self.apply(changed.iterator(chunk_size=2000))
+
+        if total != len(self.known):
+            ids = set(BankQuestion.objects.values_list('id', flat=True))
+            unseen = ids - self.known
+            if unseen:
+                modified |= self.apply(rows.filter(pk__in=list(unseen)).iterator(chunk_size=2000))
+            for question_id in self.known - ids:
+                if self.vectors.pop(question_id, None) is not None:
+                    del self.types[question_id]
+                    modified = True
+            self.known = ids
+
+        if modified or not self.loaded:
+            self.rebuild()
+        self.loaded = True
+        return modified
+
+    def rebuild(self):
+        ids = sorted(self.vectors)
+        if not ids:
+            self.state = None
+            return
+        documents = [self.vectors[question_id] for question_id in ids]
+        space = TermSpace(documents)
+        self.state = (
+            np.array(ids, dtype=np.int64),
+            np.array([self.types[question_id] for question_id in ids], dtype=object),
+            space,
+            space.matrix(documents),
+        )
+
+    def top_k(self, terms, k, question_type=None):
+        """
+        Return [(bank_question_id, score)] for the ``k`` questions most
+        similar to the ``terms`` weights, best first. Scores are cosine
+        similarities expressed as percentages.
+        """
+        if self.state is None:
+            return []
+        ids, question_types, space, matrix = self.state
+        scores = matrix.dot(space.matrix([terms]).T).toarray().ravel() * 100
+        if question_type is not None:
+            scores[question_types != question_type] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        order = candidates[np.lexsort((ids[candidates], -scores[candidates]))]
+        return [(int(ids[i]), round(float(scores[i]), 2)) for i in order]
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_question_index():
+    """
+    Process-wide question index, checked for bank changes at most every
+    QUESTION_INDEX_REFRESH_SECONDS.
+
+    One thread reloads while the others keep querying the current matrix;
+    only the first load is waited for.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = QuestionIndex()
+        index = _index
+
+    def due():
+        return time.monotonic() - index.checked_at >= settings.QUESTION_INDEX_REFRESH_SECONDS
+
+    if due() and index.refresh_lock.acquire(blocking=not index.loaded):
+        try:
+            if due():
+                index.refresh()
+                index.checked_at = time.monotonic()
+        finally:
+            index.refresh_lock.release()
+    return index
+
+def recommend_questions(job, k=10, question_type=None):
+    """
+    Rank bank questions against the job's title and requirements.
+    """
+    return get_question_index().top_k(
+        job_terms(job.title, '', job.requirements), k, question_type
+    )
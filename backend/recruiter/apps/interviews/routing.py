@@ -0,0 +1,6 @@
+from django.urls import re_path
+from .consumers import InterviewStreamConsumer
+
+websocket_urlpatterns = [
+    re_path(r'^ws/interviews/(?P<interview_id>\d+)/stream/$', InterviewStreamConsumer.as_asgi()),
+]
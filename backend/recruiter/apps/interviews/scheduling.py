@@ -0,0 +1,81 @@
+import heapq
+from collections import defaultdict
+from django.utils import timezone
+from .models import Interview, ACTIVE_INTERVIEW_STATUSES
+
+def merge_intervals(intervals):
+    """
+    Merge overlapping or touching [start, end) intervals, sorted by start.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def busy_intervals(interviewer_ids, window_start, window_end):
+    """
+    Return {interviewer_id: merged busy intervals} inside the window, read
+    with one query over the (interviewer, scheduled_date) index.
+    """
+    rows = Interview.objects.filter(
+        interviewer_id__in=interviewer_ids,
+        status__in=ACTIVE_INTERVIEW_STATUSES,
+        scheduled_date__lt=window_end,
+        scheduled_end__gt=window_start,
+    ).values_list('interviewer_id', 'scheduled_date', 'scheduled_end')
+
+    intervals = defaultdict(list)
+    for interviewer_id, start, end in rows:
+        intervals[interviewer_id].append((start, end))
+    return {
+        interviewer_id: merge_intervals(intervals[interviewer_id])
+        for interviewer_id in interviewer_ids
+    }
+
+def next_free_start(busy, cursor, start, length):
+    """
+    Earliest start >= ``start`` where ``length`` fits between the sorted busy
+    intervals, beginning the scan at index ``cursor``. Returns the start and
+    the updated cursor.
+    """
+    while cursor < len(busy):
+        busy_start, busy_end = busy[cursor]
+        if start + length <= busy_start:
+            break
+        if start < busy_end:
+            start = busy_end
+        cursor += 1
+    return start, cursor
+
+def allocate_slots(candidate_ids, busy, window_start, window_end, duration, gap=timezone.timedelta()):
+    """
+    Greedily give each candidate, in order, the earliest slot of length
+    ``duration`` offered by any interviewer inside [window_start, window_end).
+
+    A heap keyed by each interviewer's next free start acts as the sweep
+    line: the interviewer on top always offers the globally earliest slot,
+    so allocation takes O((candidates + busy intervals) log interviewers).
+    Returns ([(candidate_id, interviewer_id, start)], unallocated ids).
+    """
+    length = timezone.timedelta(minutes=duration)
+    heap = []
+    cursors = {}
+    for interviewer_id, intervals in busy.items():
+        start, cursors[interviewer_id] = next_free_start(intervals, 0, window_start, length)
+        if start + length <= window_end:
+            heapq.heappush(heap, (start, interviewer_id))
+
+    allocations = []
+    candidate_ids = list(candidate_ids)
+    while len(allocations) < len(candidate_ids) and heap:
+        start, interviewer_id = heapq.heappop(heap)
+        allocations.append((candidate_ids[len(allocations)], interviewer_id, start))
+        following, cursors[interviewer_id] = next_free_start(
+            busy[interviewer_id], cursors[interviewer_id], start + length + gap, length
+        )
+        if following + length <= window_end:
+            heapq.heappush(heap, (following, interviewer_id))
+    return allocations, candidate_ids[len(allocations):]
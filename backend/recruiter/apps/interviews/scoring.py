@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import json
+from collections import defaultdict, namedtuple
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from recruiter.apps.jobs.matching import tokenize
+from .models import InterviewQuestion, ScoredAnswer
+
+ScoreResult = namedtuple('ScoreResult', ['score', 'rationale'])
+
+SCORING_PROMPT = (
+    "You grade interview answers. Compare the candidate answer with the "
+    "expected answer and reply with JSON of the form "
+    '{"score": <integer 1-10>, "rationale": "<one sentence>"}.'
+)
+
+def answer_hash(question_text, expected_answer, candidate_answer):
+    payload = json.dumps([question_text, expected_answer, candidate_answer])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def clamp_score(value):
+    return max(1, min(10, int(round(float(value)))))
+
+class BaseAnswerScorer:
+    """
+    Answer scoring backend. ``score`` is a coroutine so many answers can be
+    in flight at once; it raises on failure and the service retries.
+    """
+    name = 'base'
+
+    async def score(self, question_text, expected_answer, candidate_answer):
+        raise NotImplementedError
+
+class StubAnswerScorer(BaseAnswerScorer):
+    """
+    Offline backend scoring by the share of expected-answer terms the
+    candidate mentioned.
+    """
+    name = 'stub'
+
+    async def score(self, question_text, expected_answer, candidate_answer):
+        expected = set(tokenize(expected_answer or question_text))
+        answered = set(tokenize(candidate_answer))
+        if not expected:
+            return ScoreResult(5, 'No expected answer to compare against')
+        coverage = len(expected & answered) / len(expected)
+        return ScoreResult(
+            clamp_score(1 + coverage * 9),
+            f"Covers {len(expected & answered)} of {len(expected)} expected terms"
+        )
+
+class OpenAIAnswerScorer(BaseAnswerScorer):
+    name = 'openai'
+
+    def __init__(self):
+        from openai import AsyncOpenAI
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+        self.model = settings.ANSWER_SCORING_MODEL
+
+    async def score(self, question_text, expected_answer, candidate_answer):
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            temperature=0,
+            response_format={'type': 'json_object'},
+            messages=[
+                {'role': 'system', 'content': SCORING_PROMPT},
+                {'role': 'user', 'content': json.dumps({
+                    'question': question_text,
+                    'expected_answer': expected_answer,
+                    'candidate_answer': candidate_answer,
+                })},
+            ],
+        )
+        result = json.loads(response.choices[0].message.content)
+        return ScoreResult(clamp_score(result['score']), str(result.get('rationale', '')))
+
+def get_scorer():
+    return import_string(settings.ANSWER_SCORER_BACKEND)()
+
+async def score_many(scorer, items, concurrency, retries, timeout):
+    """
+    Score {content_hash: (question, expected, answer)} with at most
+    ``concurrency`` requests in flight, retrying failures with exponential
+    backoff. Returns {content_hash: ScoreResult}; answers that still fail
+    are left out.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def score_one(content_hash, args):
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    return content_hash, await asyncio.wait_for(scorer.score(*args), timeout)
+            except Exception:
+                if attempt == retries:
+                    return content_hash, None
+                await asyncio.sleep(0.5 * 2 ** attempt)
+
+    results = await asyncio.gather(*(score_one(key, args) for key, args in items.items()))
+    return {key: result for key, result in results if result is not None}
+
+def pending_answers(interview_id=None):
+    questions = InterviewQuestion.objects.filter(score__isnull=True).exclude(candidate_answer='')
+    if interview_id is not None:
+        questions = questions.filter(interview_id=interview_id)
+    return questions
+
+def score_batch(scorer, rows):
+    """
+    Score one batch of (id, question, expected, answer) rows: reuse cached
+    results, send the remaining distinct answers to the scorer and write the
+    scores back with one UPDATE per score value.
+    """
+    hashes = {row[0]: answer_hash(*row[1:]) for row in rows}
+    cached = {
+        content_hash: score
+        for content_hash, score in ScoredAnswer.objects.filter(
+            content_hash__in=set(hashes.values())
+        ).values_list('content_hash', 'score')
+    }
+    missing = {hashes[row[0]]: row[1:] for row in rows if hashes[row[0]] not in cached}
+
+    if missing:
+        results = asyncio.run(score_many(
+            scorer,
+            missing,
+            settings.ANSWER_SCORING_CONCURRENCY,
+            settings.ANSWER_SCORING_RETRIES,
+            settings.ANSWER_SCORING_TIMEOUT,
+        ))
+        ScoredAnswer.objects.bulk_create([
+            ScoredAnswer(
+                content_hash=content_hash,
+                score=result.score,
+                rationale=result.rationale,
+                backend=scorer.name,
+            )
+            for content_hash, result in results.items()
+        ], ignore_conflicts=True)
+        cached.update((content_hash, result.score) for content_hash, result in results.items())
+
+    by_score = defaultdict(list)
+    for question_id, content_hash in hashes.items():
+        if content_hash in cached:
+            by_score[cached[content_hash]].append(question_id)
+    with transaction.atomic():
+        for score, question_ids in by_score.items():
+            # Questions scored by hand in the meantime are left alone
+            pending_answers().filter(pk__in=question_ids).update(score=score)
+    return sum(len(question_ids) for question_ids in by_score.values()), len(missing)
+
+def score_pending_answers(interview_id=None, batch_size=None, scorer=None):
+    """
+    Score every answered question without a score, ``batch_size`` questions
+    at a time. Returns the number of questions scored and of scorer calls.
+    """
+    batch_size = batch_size or settings.ANSWER_SCORING_BATCH_SIZE
+    scorer = scorer or get_scorer()
+    scored = calls = 0
+    last_id = 0
+    while True:
+        rows = list(
+            pending_answers(interview_id).filter(pk__gt=last_id).order_by('pk').values_list(
+                'id', 'bank_question__question_text', 'bank_question__expected_answer',
+                'candidate_answer'
+            )[:batch_size]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        batch_scored, batch_calls = score_batch(scorer, rows)
+        scored += batch_scored
+        calls += batch_calls
+    return scored, calls
@@ -1,14 +1,79 @@
 from rest_framework import serializers
-from .models import Interview, InterviewQuestion, InterviewFeedback
+from recruiter.apps.jobs.models import Job
+from recruiter.sparse import SparseFieldsetMixin
+from .models import (
+    BankQuestion, Interview, InterviewQuestion, InterviewFeedback, TranscriptSegment, is_interviewer_overlap
+)
+from .question_bank import get_bank_question
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
 from django.utils import timezone
 
+class BankQuestionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BankQuestion
+        fields = [
+            'id', 'question_text', 'question_type', 'expected_answer',
+            'is_active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['created_at', 'updated_at']
+
+    def create(self, validated_data):
+        # Identical content resolves to the existing entry
+        bank_question = get_bank_question(
+            validated_data['question_type'],
+            validated_data['question_text'],
+            validated_data.get('expected_answer', ''),
+        )
+        if not bank_question.is_active:
+            bank_question.is_active = True
+            bank_question.save(update_fields=['is_active', 'updated_at'])
+        return bank_question
+
+class QuestionRecommendationQuerySerializer(serializers.Serializer):
+    job = serializers.PrimaryKeyRelatedField(queryset=Job.objects.all())
+    question_type = serializers.ChoiceField(
+        choices=BankQuestion.QUESTION_TYPE_CHOICES,
+        required=False
+    )
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=50, default=10)
+
 class InterviewQuestionSerializer(serializers.ModelSerializer):
+    question_text = serializers.CharField(source='bank_question.question_text')
+    expected_answer = serializers.CharField(
+        source='bank_question.expected_answer',
+        required=False,
+        allow_blank=True
+    )
+
     class Meta:
         model = InterviewQuestion
         fields = [
-            'id', 'question_text', 'question_type', 'expected_answer',
-            'candidate_answer', 'score', 'notes'
+            'id', 'bank_question', 'question_text', 'question_type',
+            'expected_answer', 'candidate_answer', 'score', 'notes'
         ]
+        read_only_fields = ['bank_question']
+
+    def with_bank_question(self, validated_data):
+        # The text lives in the shared bank: point at the bank entry for
+        # the submitted content, adding it if it is new
+        content = validated_data.pop('bank_question', {})
+        if self.instance is not None and not content and 'question_type' not in validated_data:
+            return validated_data
+        current = self.instance.bank_question if self.instance is not None else None
+        validated_data['bank_question'] = get_bank_question(
+            validated_data.get('question_type') or self.instance.question_type,
+            content.get('question_text', current.question_text if current else ''),
+            content.get('expected_answer', current.expected_answer if current else ''),
+        )
+        return validated_data
+
+    def create(self, validated_data):
+        return super().create(self.with_bank_question(validated_data))
+
+    def update(self, instance, validated_data):
+        return super().update(instance, self.with_bank_question(validated_data))
 
 class InterviewFeedbackSerializer(serializers.ModelSerializer):
     class Meta:
@@ -20,9 +85,9 @@ class InterviewFeedbackSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
 
-class InterviewSerializer(serializers.ModelSerializer):
+class InterviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     questions = InterviewQuestionSerializer(many=True, read_only=True)
-    feedback = InterviewFeedbackSerializer(read_only=True)
+    feedback = InterviewFeedbackSerializer(source='interview_feedback', read_only=True)
     candidate_name = serializers.CharField(source='candidate.user.get_full_name', read_only=True)
     interviewer_name = serializers.CharField(source='interviewer.get_full_name', read_only=True)
     job_title = serializers.CharField(source='job.title', read_only=True)
@@ -36,6 +101,19 @@ class InterviewSerializer(serializers.ModelSerializer):
             'questions', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        select_related = {
+            'candidate_name': 'candidate__user',
+            'interviewer_name': 'interviewer',
+            'job_title': 'job',
+            'feedback': 'interview_feedback',
+        }
+        prefetch_related = {
+            'questions': Prefetch(
+                'questions',
+                queryset=InterviewQuestion.objects.select_related('bank_question')
+            ),
+        }
+        deferred = {'notes': 'notes'}
 
     def validate_scheduled_date(self, value):
         if value < timezone.now():
@@ -47,6 +125,14 @@ class InterviewSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Duration must be between 15 and 240 minutes")
         return value
 
+class InterviewListSerializer(InterviewSerializer):
+    class Meta(InterviewSerializer.Meta):
+        default_fields = [
+            'id', 'candidate', 'candidate_name', 'interviewer', 'interviewer_name',
+            'job', 'job_title', 'scheduled_date', 'duration', 'status',
+            'interview_type'
+        ]
+
 class InterviewCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Interview
@@ -67,9 +153,28 @@ class InterviewCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "This candidate already has a scheduled or in-progress interview for this job"
             )
+
+        end = Interview.compute_end(data['scheduled_date'], data['duration'])
+        if Interview.interviewer_conflicts(data['interviewer'], data['scheduled_date'], end).exists():
+            raise serializers.ValidationError(
+                "The interviewer already has an interview during this time"
+            )
         
         return data
 
+    def create(self, validated_data):
+        # The exclusion constraint catches overlaps created concurrently
+        # after validate() ran.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as exc:
+            if not is_interviewer_overlap(exc):
+                raise
+            raise serializers.ValidationError(
+                "The interviewer already has an interview during this time"
+            )
+
 class InterviewUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Interview
@@ -82,4 +187,67 @@ class InterviewUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "Feedback is required before marking the interview as completed"
             )
-        return value 
\ No newline at end of file
+        return value
+
+class BulkScheduleSerializer(serializers.Serializer):
+    job = serializers.PrimaryKeyRelatedField(queryset=Job.objects.all())
+    candidates = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=1000
+    )
+    interviewers = serializers.PrimaryKeyRelatedField(
+        queryset=get_user_model().objects.all(),
+        many=True,
+        allow_empty=False
+    )
+    window_start = serializers.DateTimeField()
+    window_end = serializers.DateTimeField()
+    duration = serializers.IntegerField(min_value=15, max_value=240)
+    break_minutes = serializers.IntegerField(min_value=0, max_value=240, default=0)
+    interview_type = serializers.ChoiceField(choices=Interview.INTERVIEW_TYPE_CHOICES)
+    meeting_link = serializers.URLField(required=False, allow_blank=True)
+
+    def validate_candidates(self, value):
+        value = list(dict.fromkeys(value))
+        candidate_model = Interview._meta.get_field('candidate').related_model
+        found = set(candidate_model.objects.filter(pk__in=value).values_list('pk', flat=True))
+        missing = [pk for pk in value if pk not in found]
+        if missing:
+            raise serializers.ValidationError(f"Unknown candidates: {missing}")
+        return value
+
+    def validate(self, data):
+        if data['window_start'] < timezone.now():
+            raise serializers.ValidationError("Interviews cannot be scheduled in the past")
+        if data['window_end'] <= data['window_start']:
+            raise serializers.ValidationError("window_end must be after window_start")
+        return data
+
+class TranscriptSegmentSerializer(serializers.Serializer):
+    speaker = serializers.ChoiceField(choices=TranscriptSegment.SPEAKER_CHOICES)
+    text = serializers.CharField(max_length=2000)
+    start_ms = serializers.IntegerField(min_value=0)
+    end_ms = serializers.IntegerField(min_value=0)
+    question = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, data):
+        if data['end_ms'] < data['start_ms']:
+            raise serializers.ValidationError("end_ms must not be before start_ms")
+        return data
+
+class TranscriptAppendSerializer(serializers.Serializer):
+    segments = TranscriptSegmentSerializer(many=True, allow_empty=False)
+
+    def validate_segments(self, value):
+        if len(value) > 500:
+            raise serializers.ValidationError("At most 500 segments can be appended at once")
+        interview = self.context['interview']
+        question_ids = {segment['question'] for segment in value if segment.get('question')}
+        if question_ids:
+            known = set(
+                interview.questions.filter(pk__in=question_ids).values_list('pk', flat=True)
+            )
+            if question_ids - known:
+                raise serializers.ValidationError("Questions must belong to this interview")
+        return value
\ No newline at end of file
@@ -0,0 +1,44 @@
+from collections import namedtuple
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+Transcript = namedtuple('Transcript', ['text', 'final', 'offset_ms'])
+
+class BaseSpeechToText:
+    """
+    Streaming speech-to-text backend.
+
+    ``transcribe`` consumes an async iterator of audio chunks and yields
+    Transcript tuples as soon as the backend has them: partial results with
+    ``final=False`` while an utterance is in progress, then one final result
+    per utterance. Backends must pull chunks at their own pace; the caller
+    relies on that to apply backpressure to the client.
+    """
+
+    def transcribe(self, chunks):
+        raise NotImplementedError
+
+class FakeSpeechToText(BaseSpeechToText):
+    """
+    Local backend for development and tests. Chunks are read as UTF-8 text
+    standing in for recognised speech; every chunk yields a partial result
+    and a chunk ending in a full stop closes the utterance.
+    """
+
+    async def transcribe(self, chunks):
+        words = []
+        received = 0
+        async for chunk in chunks:
+            received += len(chunk)
+            words.extend(chunk.decode('utf-8', errors='ignore').split())
+            text = ' '.join(words)
+            if text.endswith('.'):
+                yield Transcript(text, True, received)
+                words = []
+            elif text:
+                yield Transcript(text, False, received)
+        if words:
+            yield Transcript(' '.join(words), True, received)
+
+def get_stt_backend():
+    return import_string(settings.STT_BACKEND)()
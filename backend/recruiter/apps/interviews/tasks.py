@@ -1,110 +1,182 @@
+from smtplib import SMTPException
 from celery import shared_task
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.template.loader import get_template
 from django.utils import timezone
+from recruiter.apps.notifications.outbox import notify
+from .archive import archive_old_interviews
 from .models import Interview
+from .scoring import score_pending_answers
 
-@shared_task
-def send_interview_reminder(interview_id):
+REMINDER_FROM_EMAIL = 'noreply@recruiter.com'
+
+def due_reminders(now=None):
+    """
+    Scheduled interviews starting within the reminder lead time that have not
+    been reminded for their current scheduled date.
     """
-    Send reminder emails to both interviewer and candidate before the interview.
-    """
-    try:
-        interview = Interview.objects.get(id=interview_id)
-        
-        # Prepare email context
-        context = {
-            'interview': interview,
-            'candidate_name': interview.candidate.user.get_full_name(),
-            'interviewer_name': interview.interviewer.get_full_name(),
-            'job_title': interview.job.title,
-            'scheduled_date': interview.scheduled_date,
-            'duration': interview.duration,
-            'interview_type': interview.get_interview_type_display(),
-            'meeting_link': interview.meeting_link,
-        }
+    now = now or timezone.now()
+    return Interview.objects.filter(
+        status='SCHEDULED',
+        scheduled_date__gt=now,
+        scheduled_date__lte=now + settings.INTERVIEW_REMINDER_LEAD_TIME,
+    ).filter(
+        Q(reminder_sent_for__isnull=True) | ~Q(reminder_sent_for=F('scheduled_date'))
+    ).select_related('candidate__user', 'interviewer', 'job').order_by('scheduled_date', 'id')
 
-        # Send email to candidate
-        candidate_subject = f"Reminder: Upcoming Interview for {interview.job.title}"
-        candidate_message = render_to_string(
-            'emails/interview_reminder_candidate.html',
-            context
-        )
-        send_mail(
-            candidate_subject,
-            candidate_message,
-            'noreply@recruiter.com',
-            [interview.candidate.user.email],
-            html_message=candidate_message,
-            fail_silently=False,
+def reminder_messages(interview, candidate_template, interviewer_template, connection):
+    context = {
+        'interview': interview,
+        'candidate_name': interview.candidate.user.get_full_name(),
+        'interviewer_name': interview.interviewer.get_full_name(),
+        'job_title': interview.job.title,
+        'scheduled_date': interview.scheduled_date,
+        'duration': interview.duration,
+        'interview_type': interview.get_interview_type_display(),
+        'meeting_link': interview.meeting_link,
+    }
+    messages = []
+    for subject, template, recipient in [
+        (
+            f"Reminder: Upcoming Interview for {interview.job.title}",
+            candidate_template,
+            interview.candidate.user.email,
+        ),
+        (
+            f"Reminder: Interview with {context['candidate_name']}",
+            interviewer_template,
+            interview.interviewer.email,
+        ),
+    ]:
+        body = template.render(context)
+        message = EmailMultiAlternatives(
+            subject, body, REMINDER_FROM_EMAIL, [recipient], connection=connection
         )
+        message.attach_alternative(body, 'text/html')
+        messages.append(message)
+    return messages
 
-        # Send email to interviewer
-        interviewer_subject = f"Reminder: Interview with {interview.candidate.user.get_full_name()}"
-        interviewer_message = render_to_string(
-            'emails/interview_reminder_interviewer.html',
-            context
+def claim_reminders(queryset, batch_size):
+    """
+    Lease up to ``batch_size`` due interviews to this sweep. The rows are
+    locked with SKIP LOCKED only while the lease is written, so concurrent
+    sweeps never pick the same interview and no lock is held during SMTP.
+    A sweep that dies mid-batch leaves its leases to expire.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            queryset.filter(
+                Q(reminder_claimed_until__isnull=True) | Q(reminder_claimed_until__lt=now),
+                reminder_failures__lt=settings.INTERVIEW_REMINDER_MAX_ATTEMPTS,
+            ).select_for_update(skip_locked=True, of=('self',))[:batch_size]
         )
-        send_mail(
-            interviewer_subject,
-            interviewer_message,
-            'noreply@recruiter.com',
-            [interview.interviewer.email],
-            html_message=interviewer_message,
-            fail_silently=False,
+        Interview.objects.filter(pk__in=[interview.pk for interview in batch]).update(
+            reminder_claimed_until=now + settings.INTERVIEW_REMINDER_CLAIM_TIMEOUT
         )
+    return batch
 
-    except Interview.DoesNotExist:
-        # Log error or handle as needed
-        pass
+def send_reminders(queryset, batch_size):
+    """
+    Claim due interviews in batches and send their reminders over one SMTP
+    connection, one interview at a time.
+
+    Each recipient's reminder is marked with the scheduled date it was sent
+    for as soon as it is out, so a retry after the interviewer's message
+    failed never reminds the candidate twice. A failed delivery is counted
+    on the interview and retried by the next sweeps up to
+    INTERVIEW_REMINDER_MAX_ATTEMPTS times.
+    """
+    candidate_template = get_template('emails/interview_reminder_candidate.html')
+    interviewer_template = get_template('emails/interview_reminder_interviewer.html')
+    connection = get_connection()
+    sent = 0
+    with connection:
+        while True:
+            batch = claim_reminders(queryset, batch_size)
+            if not batch:
+                break
+            for interview in batch:
+                claimed = Interview.objects.filter(pk=interview.pk)
+                try:
+                    candidate_message, interviewer_message = reminder_messages(
+                        interview, candidate_template, interviewer_template, connection
+                    )
+                    if interview.candidate_reminder_sent_for != interview.scheduled_date:
+                        connection.send_messages([candidate_message])
+                        claimed.update(candidate_reminder_sent_for=interview.scheduled_date)
+                    connection.send_messages([interviewer_message])
+                except Exception as exc:
+                    # The lease is kept, which delays the retry until it expires
+                    claimed.update(
+                        reminder_failures=F('reminder_failures') + 1,
+                        reminder_error=str(exc),
+                    )
+                    if isinstance(exc, (SMTPException, OSError)):
+                        # Reconnect so the rest of the batch does not share the failure
+                        connection.close()
+                        connection.open()
+                    continue
+                # The date the messages were rendered for, not a later reschedule
+                claimed.update(
+                    reminder_sent_for=interview.scheduled_date,
+                    reminder_claimed_until=None,
+                    reminder_failures=0,
+                    reminder_error='',
+                )
+                sent += 1
+    return sent
 
 @shared_task
-def send_interview_feedback(interview_id):
+def send_due_interview_reminders():
     """
-    Send feedback notification to the candidate after the interview.
+    Periodic sweep sending reminder emails to both interviewer and candidate
+    before their interview.
     """
-    try:
-        interview = Interview.objects.get(id=interview_id)
-        feedback = interview.interview_feedback
-
-        context = {
-            'interview': interview,
-            'candidate_name': interview.candidate.user.get_full_name(),
-            'job_title': interview.job.title,
-            'feedback': feedback,
-        }
+    return send_reminders(due_reminders(), settings.INTERVIEW_REMINDER_BATCH_SIZE)
 
-        # Send feedback email to candidate
-        subject = f"Interview Feedback for {interview.job.title}"
-        message = render_to_string(
-            'emails/interview_feedback.html',
-            context
-        )
-        send_mail(
-            subject,
-            message,
-            'noreply@recruiter.com',
-            [interview.candidate.user.email],
-            html_message=message,
-            fail_silently=False,
-        )
+@shared_task
+def send_interview_reminder(interview_id):
+    """
+    Send the reminder for a single interview unless it was already sent for
+    its current date. Reminders are normally sent by send_due_interview_reminders.
+    """
+    now = timezone.now()
+    queryset = Interview.objects.filter(id=interview_id, scheduled_date__gt=now).filter(
+        Q(reminder_sent_for__isnull=True) | ~Q(reminder_sent_for=F('scheduled_date'))
+    ).select_related('candidate__user', 'interviewer', 'job')
+    return send_reminders(queryset, 1)
 
-    except Interview.DoesNotExist:
-        # Log error or handle as needed
-        pass
+@shared_task
+def cleanup_old_interviews(max_chunks=None):
+    """
+    Archive and remove completed interviews older than the retention period,
+    together with their questions and feedback.
+    """
+    run = archive_old_interviews(max_chunks=max_chunks)
+    return run.archived_count
 
 @shared_task
-def cleanup_old_interviews():
+def score_interview_answers(interview_id=None):
     """
-    Clean up old completed interviews and their associated data.
+    Score answered questions that have no score yet, for one interview or
+    for all of them.
     """
-    # Get interviews completed more than 6 months ago
-    cutoff_date = timezone.now() - timezone.timedelta(days=180)
-    old_interviews = Interview.objects.filter(
-        status='COMPLETED',
-        updated_at__lt=cutoff_date
-    )
+    scored, calls = score_pending_answers(interview_id=interview_id)
+    return {'scored': scored, 'scorer_calls': calls}
 
-    # Delete old interviews and their associated data
-    for interview in old_interviews:
-        interview.delete() 
\ No newline at end of file
+@shared_task
+def send_interview_feedback(interview_id):
+    """
+    Deprecated: feedback mail now goes through the notification outbox.
+    Kept for one release so that messages queued before the upgrade still
+    notify the candidate; remove it in the next one.
+    """
+    candidate_id = Interview.objects.filter(pk=interview_id).values_list(
+        'candidate__user_id', flat=True
+    ).first()
+    if candidate_id is not None:
+        notify('INTERVIEW_FEEDBACK', candidate_id, interview_id)
\ No newline at end of file
@@ -0,0 +1,448 @@
+from datetime import datetime, timezone as dt_timezone
+from smtplib import SMTPException
+from unittest import mock
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from recruiter.roles import Roles
+from recruiter.testing import (
+    QueryBudgetMixin, create_candidate, create_interview, create_job, create_user
+)
+from recruiter.websocket_auth import TokenAuthMiddleware
+from . import question_bank
+from .models import BankQuestion, Interview, InterviewFeedback, InterviewQuestion, TranscriptSegment
+from .question_bank import QuestionIndex, backfill_question_bank, bank_question_ids, get_bank_question
+from .routing import websocket_urlpatterns
+from .scheduling import allocate_slots, merge_intervals
+from .tasks import due_reminders, send_reminders
+
+class InterviewQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = create_user('staff', is_staff=True)
+        job = create_job(cls.staff)
+        start = timezone.now() + timezone.timedelta(days=1)
+        cls.interviews = []
+        for i in range(5):
+            interview = create_interview(
+                create_candidate(f'candidate{i}'),
+                cls.staff,
+                job,
+                start + timezone.timedelta(hours=2 * i)
+            )
+            for question_type in ['TECHNICAL', 'BEHAVIORAL']:
+                InterviewQuestion.objects.create(
+                    interview=interview,
+                    bank_question=get_bank_question(question_type, f"Question {i} {question_type}"),
+                    question_type=question_type,
+                )
+            InterviewFeedback.objects.create(
+                interview=interview,
+                strengths='Clear answers',
+                weaknesses='None',
+                overall_rating=4,
+                technical_skills_rating=4,
+                communication_skills_rating=4,
+                problem_solving_rating=4,
+                recommendation='Hire',
+            )
+            cls.interviews.append(interview)
+
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_list(self):
+        with self.assertEndpointQueryBudget('interview-list'):
+            response = self.client.get(reverse('interview-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_list_with_every_field(self):
+        url = reverse('interview-list')
+        with self.assertEndpointQueryBudget('interview-list'):
+            response = self.client.get(url, {'expand': 'questions,feedback,notes'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results'][0]['questions']), 2)
+
+    def test_cursor_list(self):
+        with self.assertEndpointQueryBudget('interview-list'):
+            response = self.client.get(reverse('interview-list'), {'pagination': 'cursor'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail(self):
+        url = reverse('interview-detail', args=[self.interviews[0].pk])
+        with self.assertEndpointQueryBudget('interview-detail'):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['feedback']['recommendation'], 'Hire')
+
+    async def test_db_timing_under_asgi(self):
+        token = await Token.objects.acreate(user=self.staff)
+        headers = {'Authorization': f'Token {token.key}'}
+        for url in [reverse('interview-list'), reverse('interview-async-list')]:
+            response = await self.async_client.get(url, headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_export_streams(self):
+        response = self.client.get(reverse('interview-export'))
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 6)
+
+    async def test_export_streams_asynchronously_under_asgi(self):
+        token = await Token.objects.acreate(user=self.staff)
+        response = await self.async_client.get(
+            reverse('interview-export'),
+            {'export_format': 'ndjson'},
+            headers={'Authorization': f'Token {token.key}'}
+        )
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content.decode().splitlines()), 5)
+
+class AsyncInterviewViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        staff = create_user('staff', is_staff=True)
+        cls.interviewer = create_user('interviewer')
+        cls.candidate = create_candidate('candidate')
+        job = create_job(staff)
+        cls.own = create_interview(cls.candidate, cls.interviewer, job)
+        cls.other = create_interview(create_candidate('other'), staff, job)
+
+    async def get(self, user, url):
+        token = await Token.objects.acreate(user=user)
+        return await self.async_client.get(url, headers={'Authorization': f'Token {token.key}'})
+
+    async def test_interviewer_sees_their_interviews(self):
+        roles = Roles(is_staff=False, is_interviewer=True, candidate_profile_id=None)
+        with mock.patch('recruiter.asyncapi.get_roles', return_value=roles):
+            response = await self.get(self.interviewer, reverse('interview-async-list'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([row['id'] for row in response.json()['results']], [self.own.pk])
+
+            response = await self.get(
+                self.interviewer, reverse('interview-async-detail', args=[self.own.pk])
+            )
+            self.assertEqual(response.status_code, 200)
+            response = await self.get(
+                self.interviewer, reverse('interview-async-detail', args=[self.other.pk])
+            )
+            self.assertEqual(response.status_code, 404)
+
+    async def test_candidate_sees_their_interviews(self):
+        response = await self.get(self.candidate.user, reverse('interview-async-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.own.pk])
+
+    async def test_authentication_required(self):
+        response = await self.async_client.get(reverse('interview-async-list'))
+        self.assertEqual(response.status_code, 401)
+
+def at(hour, minute=0):
+    return datetime(2030, 1, 7, hour, minute, tzinfo=dt_timezone.utc)
+
+class SlotAllocationTests(SimpleTestCase):
+    def test_merge_intervals(self):
+        self.assertEqual(
+            merge_intervals([(at(11), at(12)), (at(9), at(10)), (at(10), at(10, 30))]),
+            [[at(9), at(10, 30)], [at(11), at(12)]]
+        )
+
+    def test_earliest_slot_goes_to_the_first_candidate(self):
+        busy = {1: [[at(9), at(10)]], 2: []}
+        allocations, unallocated = allocate_slots([10, 11, 12], busy, at(9), at(12), 60)
+        self.assertEqual(allocations, [(10, 2, at(9)), (11, 1, at(10)), (12, 2, at(10))])
+        self.assertEqual(unallocated, [])
+
+    def test_slots_skip_busy_intervals_and_respect_the_gap(self):
+        busy = {1: [[at(10), at(11)]]}
+        allocations, unallocated = allocate_slots(
+            [10, 11, 12], busy, at(9), at(13), 45, gap=timezone.timedelta(minutes=15)
+        )
+        self.assertEqual(allocations, [(10, 1, at(9)), (11, 1, at(11)), (12, 1, at(12))])
+        self.assertEqual(unallocated, [])
+
+    def test_candidates_left_over_when_the_window_is_full(self):
+        allocations, unallocated = allocate_slots([10, 11], {1: []}, at(9), at(10, 30), 60)
+        self.assertEqual(allocations, [(10, 1, at(9))])
+        self.assertEqual(unallocated, [11])
+
+class BulkScheduleTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = create_user('staff', is_staff=True)
+        cls.job = create_job(cls.staff)
+        cls.candidates = [create_candidate(f'candidate{i}') for i in range(3)]
+        cls.start = (timezone.now() + timezone.timedelta(days=2)).replace(
+            hour=9, minute=0, second=0, microsecond=0
+        )
+        # Already booked from 10:00 to 11:00
+        create_interview(
+            cls.candidates[2], cls.staff, cls.job, cls.start + timezone.timedelta(hours=1)
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_bulk_schedule_returns_the_created_interviews(self):
+        response = self.client.post(reverse('interview-bulk-schedule'), {
+            'job': self.job.pk,
+            'candidates': [candidate.pk for candidate in self.candidates],
+            'interviewers': [self.staff.pk],
+            'window_start': self.start,
+            'window_end': self.start + timezone.timedelta(hours=3),
+            'duration': 60,
+            'interview_type': 'VIDEO',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        scheduled = response.data['scheduled']
+        self.assertEqual(
+            [row['candidate'] for row in scheduled],
+            [self.candidates[0].pk, self.candidates[1].pk]
+        )
+        # The ids identify the created interviews; 10:00 was already taken
+        self.assertEqual(
+            list(
+                Interview.objects.filter(pk__in=[row['id'] for row in scheduled])
+                .order_by('scheduled_date').values_list('candidate_id', 'scheduled_date')
+            ),
+            [
+                (self.candidates[0].pk, self.start),
+                (self.candidates[1].pk, self.start + timezone.timedelta(hours=2)),
+            ]
+        )
+        self.assertEqual(response.data['unscheduled'], [{
+            'candidate': self.candidates[2].pk,
+            'reason': 'already has an open interview for this job',
+        }])
+
+    def test_interviewer_conflicts(self):
+        conflicts = Interview.interviewer_conflicts(
+            self.staff,
+            self.start + timezone.timedelta(minutes=90),
+            self.start + timezone.timedelta(minutes=150)
+        )
+        self.assertEqual(conflicts.count(), 1)
+        self.assertFalse(Interview.interviewer_conflicts(
+            self.staff, self.start, self.start + timezone.timedelta(hours=1)
+        ).exists())
+
+class QuestionBankTests(TestCase):
+    def test_questions_differing_in_case_or_whitespace_are_stored_once(self):
+        question = get_bank_question('TECHNICAL', 'What is a  Python generator?', 'Lazy iterator')
+        self.assertEqual(
+            get_bank_question('TECHNICAL', 'what is a python generator? ', 'lazy  iterator'),
+            question
+        )
+        self.assertNotEqual(get_bank_question('BEHAVIORAL', 'What is a Python generator?'), question)
+
+        contents = [
+            ('TECHNICAL', 'WHAT IS A PYTHON GENERATOR?', 'Lazy iterator'),
+            ('TECHNICAL', 'Explain database indexes', ''),
+            ('TECHNICAL', 'explain database indexes', ''),
+        ]
+        ids = bank_question_ids(contents)
+        self.assertEqual(ids[contents[0]], question.pk)
+        self.assertEqual(ids[contents[1]], ids[contents[2]])
+        self.assertEqual(BankQuestion.objects.count(), 3)
+
+    def test_top_k_ranks_by_similarity(self):
+        django = get_bank_question('TECHNICAL', 'How does the Django ORM build SQL queries?', 'python django')
+        python = get_bank_question('TECHNICAL', 'How does Python manage memory?', 'python')
+        get_bank_question('BEHAVIORAL', 'Describe a conflict with a teammate')
+        index = QuestionIndex()
+        index.refresh()
+
+        ranked = index.top_k({'python': 2, 'django': 2}, 5)
+        self.assertEqual([question_id for question_id, _ in ranked], [django.pk, python.pk])
+        self.assertGreater(ranked[0][1], ranked[1][1])
+        self.assertEqual([question_id for question_id, _ in index.top_k({'python': 1}, 1)], [python.pk])
+        self.assertEqual(index.top_k({'python': 1}, 5, question_type='BEHAVIORAL'), [])
+
+    def test_refresh_applies_only_changes(self):
+        first = get_bank_question('TECHNICAL', 'Explain python decorators')
+        index = QuestionIndex()
+        self.assertTrue(index.refresh())
+        self.assertFalse(index.refresh())
+
+        second = get_bank_question('TECHNICAL', 'Explain python generators')
+        first.is_active = False
+        first.save(update_fields=['is_active', 'updated_at'])
+        self.assertTrue(index.refresh())
+        self.assertEqual(
+            [question_id for question_id, _ in index.top_k({'python': 1}, 5)], [second.pk]
+        )
+
+    def test_refresh_loads_rows_committed_late(self):
+        first, late, last = [
+            get_bank_question('TECHNICAL', f'Explain python {topic}')
+            for topic in ['decorators', 'generators', 'descriptors']
+        ]
+        late_id = late.pk
+        late.delete()
+        index = QuestionIndex()
+        index.refresh()
+
+        # An insert with a lower id and an older timestamp than rows already
+        # loaded, as left by a transaction that committed after them
+        late = get_bank_question('TECHNICAL', 'Explain python generators')
+        BankQuestion.objects.filter(pk=late.pk).update(
+            id=late_id, updated_at=timezone.now() - timezone.timedelta(days=1)
+        )
+        self.assertTrue(index.refresh())
+        self.assertEqual(
+            {question_id for question_id, _ in index.top_k({'python': 1}, 5)},
+            {first.pk, late_id, last.pk}
+        )
+
+        BankQuestion.objects.filter(pk=late_id).delete()
+        self.assertTrue(index.refresh())
+        self.assertEqual(len(index.top_k({'python': 1}, 5)), 2)
+
+    def test_backfill_is_a_no_op_without_the_legacy_columns(self):
+        self.assertEqual(backfill_question_bank(), 0)
+
+@override_settings(QUESTION_INDEX_REFRESH_SECONDS=0)
+class RecommendedQuestionsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = create_user('staff', is_staff=True)
+        cls.job = create_job(cls.staff, title='Django Developer', requirements='python django')
+        cls.django = get_bank_question('TECHNICAL', 'How does the Django ORM build queries?', 'python')
+        cls.python = get_bank_question('TECHNICAL', 'How does Python manage memory?')
+        cls.behavioral = get_bank_question('BEHAVIORAL', 'Describe the hardest production incident on a Django project you led')
+
+    def setUp(self):
+        patcher = mock.patch.object(question_bank, '_index', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.force_authenticate(self.staff)
+
+    def recommended(self, **params):
+        return self.client.get(reverse('bank-question-recommended'), {'job': self.job.pk, **params})
+
+    def test_ranked_for_the_job(self):
+        response = self.recommended()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['id'], self.django.pk)
+        self.assertEqual(
+            {row['id'] for row in response.data},
+            {self.django.pk, self.python.pk, self.behavioral.pk}
+        )
+        similarities = [row['similarity'] for row in response.data]
+        self.assertEqual(similarities, sorted(similarities, reverse=True))
+
+        response = self.recommended(question_type='BEHAVIORAL', limit=5)
+        self.assertEqual([row['id'] for row in response.data], [self.behavioral.pk])
+
+    def test_deactivated_questions_are_left_out(self):
+        response = self.client.post(reverse('bank-question-deactivate', args=[self.django.pk]))
+        self.assertFalse(response.data['is_active'])
+        ids = [row['id'] for row in self.recommended().data]
+        self.assertNotIn(self.django.pk, ids)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.recommended(limit=500).status_code, 400)
+        response = self.client.get(reverse('bank-question-recommended'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_candidates_cannot_read_the_bank(self):
+        self.client.force_authenticate(create_candidate('candidate').user)
+        self.assertEqual(self.recommended().status_code, 403)
+
+@override_settings(STT_BACKEND='recruiter.apps.interviews.stt.FakeSpeechToText')
+class InterviewStreamTests(TransactionTestCase):
+    def setUp(self):
+        self.staff = create_user('staff', is_staff=True)
+        self.candidate = create_candidate('candidate')
+        self.interview = create_interview(
+            self.candidate, self.staff, create_job(self.staff), status='IN_PROGRESS'
+        )
+
+    def communicator(self, user):
+        token = Token.objects.create(user=user)
+        return WebsocketCommunicator(
+            TokenAuthMiddleware(URLRouter(websocket_urlpatterns)),
+            f'/ws/interviews/{self.interview.pk}/stream/?token={token.key}'
+        )
+
+    async def test_partial_and_final_transcripts(self):
+        communicator = await database_sync_to_async(self.communicator)(self.candidate.user)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        await communicator.send_to(bytes_data=b'Hello there')
+        self.assertEqual(await communicator.receive_json_from(), {
+            'type': 'transcript', 'text': 'Hello there', 'final': False, 'offset_ms': 11
+        })
+        await communicator.send_to(bytes_data=b'I am ready.')
+        self.assertEqual(await communicator.receive_json_from(), {
+            'type': 'transcript', 'text': 'Hello there I am ready.', 'final': True, 'offset_ms': 22
+        })
+        await communicator.send_json_to({'type': 'end'})
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'done'})
+        await communicator.disconnect()
+
+        segments = await database_sync_to_async(list)(
+            TranscriptSegment.objects.filter(interview=self.interview).values_list(
+                'sequence', 'speaker', 'text', 'start_ms', 'end_ms'
+            )
+        )
+        self.assertEqual(segments, [(0, 'CANDIDATE', 'Hello there I am ready.', 0, 22)])
+
+    async def test_other_users_are_rejected(self):
+        outsider = await database_sync_to_async(create_user)('outsider')
+        communicator = await database_sync_to_async(self.communicator)(outsider)
+        connected, code = await communicator.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4403)
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class ReminderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interviewer = create_user('interviewer', is_staff=True)
+        cls.candidate = create_candidate('candidate')
+        cls.interview = create_interview(
+            cls.candidate, cls.interviewer, create_job(cls.interviewer),
+            timezone.now() + timezone.timedelta(hours=2)
+        )
+
+    def sent_to(self):
+        return [message.to[0] for message in mail.outbox]
+
+    def test_each_reminder_is_sent_once(self):
+        self.assertEqual(send_reminders(due_reminders(), 10), 1)
+        self.assertEqual(self.sent_to(), ['candidate@example.com', 'interviewer@example.com'])
+        self.assertEqual(send_reminders(due_reminders(), 10), 0)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_failed_interviewer_reminder_does_not_repeat_the_candidates(self):
+        send_messages = locmem.EmailBackend.send_messages
+
+        def rejecting_interviewer(backend, messages):
+            if messages[0].to == ['interviewer@example.com']:
+                raise SMTPException('mailbox unavailable')
+            return send_messages(backend, messages)
+
+        with mock.patch.object(locmem.EmailBackend, 'send_messages', rejecting_interviewer):
+            self.assertEqual(send_reminders(due_reminders(), 10), 0)
+        self.assertEqual(self.sent_to(), ['candidate@example.com'])
+        interview = Interview.objects.get(pk=self.interview.pk)
+        self.assertEqual(interview.reminder_failures, 1)
+        self.assertIsNone(interview.reminder_sent_for)
+
+        # Once the lease expires the next sweep only sends what is missing
+        Interview.objects.filter(pk=self.interview.pk).update(reminder_claimed_until=None)
+        self.assertEqual(send_reminders(due_reminders(), 10), 1)
+        self.assertEqual(self.sent_to(), ['candidate@example.com', 'interviewer@example.com'])
@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from .models import Interview, TranscriptSegment
+
+SEGMENT_MAX_LENGTH = TranscriptSegment._meta.get_field('text').max_length
+
+def transcript_cache_key(interview_id):
+    return f'transcript:{interview_id}'
+
+def next_sequence(interview_id):
+    last = TranscriptSegment.objects.filter(interview_id=interview_id).aggregate(
+        last=Max('sequence')
+    )['last']
+    return 0 if last is None else last + 1
+
+def append_segments(interview_id, segments):
+    """
+    Insert ``segments`` (dicts with speaker, text, start_ms, end_ms and an
+    optional question id) after the interview's last segment, in one
+    statement. Returns the created rows.
+
+    The interview row is locked while the next sequence is read, so the
+    live stream and the REST endpoint can append concurrently without
+    colliding on a sequence number.
+    """
+    if not segments:
+        return []
+    with transaction.atomic():
+        Interview.objects.select_for_update().filter(pk=interview_id).values_list('pk').first()
+        sequence = next_sequence(interview_id)
+        created = TranscriptSegment.objects.bulk_create([
+            TranscriptSegment(
+                interview_id=interview_id,
+                question_id=segment.get('question'),
+                sequence=sequence + offset,
+                speaker=segment['speaker'],
+                start_ms=segment['start_ms'],
+                end_ms=segment['end_ms'],
+                text=segment['text'],
+            )
+            for offset, segment in enumerate(segments)
+        ])
+        transaction.on_commit(lambda: cache.delete(transcript_cache_key(interview_id)))
+    return created
+
+class SegmentWriter:
+    """
+    Buffer segments of one live interview for batched inserts. ``add``
+    returns True once TRANSCRIPT_BATCH_SIZE segments are waiting; the caller
+    then calls ``flush``, which it must also do when the stream ends. Keeping
+    the insert out of ``add`` lets async callers run it in a worker thread.
+    """
+
+    def __init__(self, interview_id, batch_size=None):
+        self.interview_id = interview_id
+        self.batch_size = batch_size or settings.TRANSCRIPT_BATCH_SIZE
+        self.pending = []
+
+    def add(self, speaker, text, start_ms, end_ms, question=None):
+        self.pending.append({
+            'speaker': speaker,
+            'text': text[:SEGMENT_MAX_LENGTH],
+            'start_ms': start_ms,
+            'end_ms': end_ms,
+            'question': question,
+        })
+        return len(self.pending) >= self.batch_size
+
+    def flush(self):
+        pending, self.pending = self.pending, []
+        return append_segments(self.interview_id, pending)
+
+def build_transcript(interview_id, question_id=None):
+    segments = TranscriptSegment.objects.filter(interview_id=interview_id)
+    if question_id is not None:
+        segments = segments.filter(question_id=question_id)
+    return [
+        {
+            'sequence': sequence,
+            'speaker': speaker,
+            'start_ms': start_ms,
+            'end_ms': end_ms,
+            'question': question,
+            'text': text,
+        }
+        for sequence, speaker, start_ms, end_ms, question, text in segments.order_by(
+            'sequence'
+        ).values_list(
+            'sequence', 'speaker', 'start_ms', 'end_ms', 'question_id', 'text'
+        ).iterator(chunk_size=2000)
+    ]
+
+def assemble_transcript(interview):
+    """
+    Return the ordered segments of ``interview``. A completed interview no
+    longer changes, so its transcript is cached after the first read.
+    """
+    if interview.status != 'COMPLETED':
+        return build_transcript(interview.pk)
+    key = transcript_cache_key(interview.pk)
+    transcript = cache.get(key)
+    if transcript is None:
+        transcript = build_transcript(interview.pk)
+        cache.set(key, transcript, settings.TRANSCRIPT_CACHE_TIMEOUT)
+    return transcript
+
+def transcript_text(segments):
+    return '\n'.join(f"{segment['speaker']}: {segment['text']}" for segment in segments)
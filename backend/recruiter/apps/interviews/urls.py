@@ -1,16 +1,21 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import interview_list, interview_detail
 from .views import (
     InterviewViewSet,
     InterviewQuestionViewSet,
+    BankQuestionViewSet,
     InterviewFeedbackViewSet
 )
 
 router = DefaultRouter()
 router.register(r'interviews', InterviewViewSet, basename='interview')
 router.register(r'questions', InterviewQuestionViewSet, basename='question')
+router.register(r'question-bank', BankQuestionViewSet, basename='bank-question')
 router.register(r'feedback', InterviewFeedbackViewSet, basename='feedback')
 
 urlpatterns = [
+    path('async/interviews/', interview_list, name='interview-async-list'),
+    path('async/interviews/<int:pk>/', interview_detail, name='interview-async-detail'),
     path('', include(router.urls)),
 ] 
\ No newline at end of file
@@ -1,41 +1,84 @@
-from rest_framework import viewsets, permissions, status
+from rest_framework import mixins, viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.utils import timezone
+from django.db import IntegrityError, transaction
 from django.db.models import Q
-from .models import Interview, InterviewQuestion, InterviewFeedback
+from django.utils import timezone
+from .models import (
+    BankQuestion, Interview, InterviewQuestion, InterviewFeedback, ACTIVE_INTERVIEW_STATUSES,
+    is_interviewer_overlap
+)
+from .question_bank import recommend_questions
+from .scheduling import allocate_slots, busy_intervals
 from .serializers import (
-    InterviewSerializer, InterviewCreateSerializer,
+    InterviewSerializer, InterviewListSerializer, InterviewCreateSerializer,
     InterviewUpdateSerializer, InterviewQuestionSerializer,
-    InterviewFeedbackSerializer
+    InterviewFeedbackSerializer, BulkScheduleSerializer, TranscriptAppendSerializer,
+    BankQuestionSerializer, QuestionRecommendationQuerySerializer
 )
-from .permissions import IsInterviewerOrAdmin
-from .tasks import send_interview_reminder, send_interview_feedback
+from recruiter.apps.analytics.rollups import interview_deltas, record_changes
+from recruiter.exports import ExportMixin
+from recruiter.pagination import KeysetPagination
+from recruiter.roles import get_roles
+from recruiter.sparse import sparse_queryset
+from .permissions import IsInterviewerOrAdmin, IsInterviewerOrStaff
+from recruiter.apps.notifications.outbox import notify, notify_many
+from .tasks import score_interview_answers
+from .transcripts import append_segments, assemble_transcript, transcript_text
+
+class InterviewPagination(KeysetPagination):
+    ordering = ('-scheduled_date', '-id')
+
+def visible_interviews(queryset, user, roles):
+    if roles.is_staff:
+        return queryset
+    
+    # The memoized candidate profile id avoids joining through the user
+    as_candidate = Q(candidate_id=roles.candidate_profile_id)
+    # For interviewers, show their interviews
+    if roles.is_interviewer:
+        return queryset.filter(Q(interviewer=user) | as_candidate)
+    
+    # For candidates, show only their interviews
+    if roles.candidate_profile_id is None:
+        return queryset.none()
+    return queryset.filter(as_candidate)
 
-class InterviewViewSet(viewsets.ModelViewSet):
+class InterviewViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = Interview.objects.all()
     permission_classes = [permissions.IsAuthenticated, IsInterviewerOrAdmin]
+    pagination_class = InterviewPagination
+    filterset_fields = ['candidate', 'interviewer', 'job', 'status', 'interview_type']
+    export_fields = [
+        'id', 'candidate', 'candidate__user__email', 'interviewer',
+        'interviewer__email', 'job', 'job__title', 'scheduled_date', 'duration',
+        'status', 'interview_type', 'meeting_link', 'notes', 'feedback',
+        'rating', 'created_at', 'updated_at'
+    ]
+    export_filename = 'interviews'
 
     def get_serializer_class(self):
         if self.action == 'create':
             return InterviewCreateSerializer
         elif self.action in ['update', 'partial_update']:
             return InterviewUpdateSerializer
+        elif self.action == 'list':
+            return InterviewListSerializer
         return InterviewSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_staff:
-            return Interview.objects.all()
-        
-        # For interviewers, show their interviews
-        if hasattr(user, 'interviewer_profile'):
-            return Interview.objects.filter(
-                Q(interviewer=user) | Q(candidate__user=user)
-            )
-        
-        # For candidates, show only their interviews
-        return Interview.objects.filter(candidate__user=user)
+        return visible_interviews(
+            self.optimize_queryset(Interview.objects.all()),
+            self.request.user,
+            get_roles(self.request)
+        )
+
+    def optimize_queryset(self, queryset):
+        # Write actions only need the interview itself; reads join only the
+        # relations behind the requested fields
+        if self.action in ['list', 'retrieve']:
+            return sparse_queryset(queryset, self.get_serializer())
+        return queryset
 
     @action(detail=True, methods=['post'])
     def add_question(self, request, pk=None):
@@ -53,13 +96,15 @@ class InterviewViewSet(viewsets.ModelViewSet):
         serializer = InterviewFeedbackSerializer(data=request.data)
         
         if serializer.is_valid():
-            feedback = serializer.save(interview=interview)
-            interview.feedback = feedback.recommendation
-            interview.status = 'COMPLETED'
-            interview.save()
-            
-            # Send feedback notification
-            send_interview_feedback.delay(interview.id)
+            with transaction.atomic():
+                feedback = serializer.save(interview=interview)
+                interview.feedback = feedback.recommendation
+                interview.status = 'COMPLETED'
+                interview.save()
+                
+                # Sent by the outbox dispatcher once this commits
+                notify('INTERVIEW_FEEDBACK', interview.candidate.user_id, interview.pk)
+                transaction.on_commit(lambda: score_interview_answers.delay(interview.id))
             
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -73,8 +118,10 @@ class InterviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        interview.status = 'IN_PROGRESS'
-        interview.save()
+        with transaction.atomic():
+            interview.status = 'IN_PROGRESS'
+            interview.save()
+            notify('INTERVIEW_STARTED', interview.candidate.user_id, interview.pk)
         return Response({"status": "Interview started"})
 
     @action(detail=True, methods=['post'])
@@ -86,18 +133,115 @@ class InterviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        interview.status = 'CANCELLED'
-        interview.save()
+        with transaction.atomic():
+            interview.status = 'CANCELLED'
+            interview.save()
+            notify_many([
+                ('INTERVIEW_CANCELLED', recipient_id, interview.pk, {})
+                for recipient_id in [interview.candidate.user_id, interview.interviewer_id]
+            ])
         return Response({"status": "Interview cancelled"})
 
-    def perform_create(self, serializer):
-        interview = serializer.save()
-        # Schedule reminder emails
-        send_interview_reminder.apply_async(
-            args=[interview.id],
-            eta=interview.scheduled_date - timezone.timedelta(hours=24)
+    @action(detail=True, methods=['get', 'post'])
+    def transcript(self, request, pk=None):
+        interview = self.get_object()
+        if request.method == 'GET':
+            segments = assemble_transcript(interview)
+            if request.query_params.get('format_text') in ('1', 'true'):
+                return Response({'transcript': transcript_text(segments)})
+            return Response({'segments': segments})
+
+        if interview.status != 'IN_PROGRESS':
+            return Response(
+                {"error": "Transcript can only be appended while the interview is in progress"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = TranscriptAppendSerializer(data=request.data, context={'interview': interview})
+        serializer.is_valid(raise_exception=True)
+        created = append_segments(interview.pk, serializer.validated_data['segments'])
+        return Response(
+            {'appended': len(created), 'last_sequence': created[-1].sequence},
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=['post'])
+    def bulk_schedule(self, request):
+        """
+        Schedule interviews for many candidates of one job across a pool of
+        interviewers, giving each candidate the earliest non-overlapping slot
+        inside the requested window.
+        """
+        serializer = BulkScheduleSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        job = data['job']
+
+        already_scheduled = set(Interview.objects.filter(
+            job=job,
+            candidate_id__in=data['candidates'],
+            status__in=ACTIVE_INTERVIEW_STATUSES
+        ).values_list('candidate_id', flat=True))
+        candidate_ids = [pk for pk in data['candidates'] if pk not in already_scheduled]
+
+        interviewer_ids = [interviewer.pk for interviewer in data['interviewers']]
+        allocations, unallocated = allocate_slots(
+            candidate_ids,
+            busy_intervals(interviewer_ids, data['window_start'], data['window_end']),
+            data['window_start'],
+            data['window_end'],
+            data['duration'],
+            gap=timezone.timedelta(minutes=data['break_minutes'])
         )
 
+        interviews = [
+            Interview(
+                candidate_id=candidate_id,
+                interviewer_id=interviewer_id,
+                job=job,
+                scheduled_date=start,
+                scheduled_end=Interview.compute_end(start, data['duration']),
+                duration=data['duration'],
+                interview_type=data['interview_type'],
+                meeting_link=data.get('meeting_link') or None,
+            )
+            for candidate_id, interviewer_id, start in allocations
+        ]
+        try:
+            with transaction.atomic():
+                interviews = Interview.objects.bulk_create(interviews)
+                record_changes(interview_deltas, [
+                    (None, interview.rollup_state()) for interview in interviews
+                ])
+        except IntegrityError as exc:
+            if not is_interviewer_overlap(exc):
+                raise
+            return Response(
+                {"error": "Interviewer calendars changed while scheduling, please retry"},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        # Reload with the relations the response renders joined or prefetched
+        context = self.get_serializer_context()
+        scheduled = sparse_queryset(
+            Interview.objects.filter(pk__in=[interview.pk for interview in interviews]),
+            InterviewSerializer(context=context)
+        ).order_by('scheduled_date', 'id')
+        return Response({
+            'scheduled': InterviewSerializer(scheduled, many=True, context=context).data,
+            'unscheduled': [
+                {'candidate': pk, 'reason': 'already has an open interview for this job'}
+                for pk in data['candidates'] if pk in already_scheduled
+            ] + [
+                {'candidate': pk, 'reason': 'no free interviewer slot in the window'}
+                for pk in unallocated
+            ],
+        }, status=status.HTTP_201_CREATED)
+
+    def perform_create(self, serializer):
+        # Reminder emails are sent by the periodic send_due_interview_reminders sweep
+        serializer.save()
+
 class InterviewQuestionViewSet(viewsets.ModelViewSet):
     queryset = InterviewQuestion.objects.all()
     serializer_class = InterviewQuestionSerializer
@@ -106,14 +250,67 @@ class InterviewQuestionViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return InterviewQuestion.objects.filter(
             interview__interviewer=self.request.user
-        )
+        ).select_related('interview', 'bank_question')
+
+class BankQuestionViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    The shared question bank. Entries are immutable so that interviews keep
+    the question they were asked; retired ones are deactivated instead.
+    """
+    queryset = BankQuestion.objects.all()
+    serializer_class = BankQuestionSerializer
+    permission_classes = [permissions.IsAuthenticated, IsInterviewerOrStaff]
+    filterset_fields = ['question_type', 'is_active']
+
+    @action(detail=True, methods=['post'])
+    def deactivate(self, request, pk=None):
+        question = self.get_object()
+        if question.is_active:
+            question.is_active = False
+            question.save(update_fields=['is_active', 'updated_at'])
+        return Response(self.get_serializer(question).data)
+
+    @action(detail=False, methods=['get'])
+    def recommended(self, request):
+        """
+        Active bank questions ranked by similarity to a job's title and
+        requirements.
+        """
+        params = QuestionRecommendationQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = params.validated_data
+        ranked = recommend_questions(data['job'], data['limit'], data.get('question_type'))
+        questions = BankQuestion.objects.in_bulk([question_id for question_id, _ in ranked])
+        results = []
+        for question_id, similarity in ranked:
+            # Skip questions deactivated since the index last refreshed
+            question = questions.get(question_id)
+            if question is not None and question.is_active:
+                results.append(dict(self.get_serializer(question).data, similarity=similarity))
+        return Response(results)
 
-class InterviewFeedbackViewSet(viewsets.ModelViewSet):
+class InterviewFeedbackViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = InterviewFeedback.objects.all()
     serializer_class = InterviewFeedbackSerializer
     permission_classes = [permissions.IsAuthenticated, IsInterviewerOrAdmin]
+    filterset_fields = ['interview', 'interview__job', 'overall_rating']
+    export_fields = [
+        'id', 'interview', 'interview__job', 'interview__job__title',
+        'interview__candidate__user__email', 'strengths', 'weaknesses',
+        'overall_rating', 'technical_skills_rating',
+        'communication_skills_rating', 'problem_solving_rating',
+        'recommendation', 'created_at', 'updated_at'
+    ]
+    export_filename = 'interview-feedback'
 
     def get_queryset(self):
         return InterviewFeedback.objects.filter(
             interview__interviewer=self.request.user
-        ) 
\ No newline at end of file
+        ).select_related('interview') 
\ No newline at end of file
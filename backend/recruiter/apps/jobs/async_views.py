@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponseNotModified, JsonResponse
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from recruiter.asyncapi import async_api_view, blocking
+from recruiter.caching import etag_matches, get_version, response_cache_keys
+from recruiter.sparse import sparse_queryset
+from .models import Job, JobMatch, JOB_CACHE_NAMESPACE
+from .serializers import JobListSerializer, JobMatchSerializer
+from .views import JobViewSet
+
+MAX_PAGE_SIZE = 100
+
+def job_queryset(params, serializer):
+    """
+    Apply JobViewSet's filters and ordering to the job list, loading only
+    the columns ``serializer`` renders.
+    """
+    queryset = sparse_queryset(Job.objects.all(), serializer)
+    for field, lookups in JobViewSet.filterset_fields.items():
+        for lookup in lookups:
+            name = field if lookup == 'exact' else f'{field}__{lookup}'
+            value = params.get(name)
+            if value in (None, ''):
+                continue
+            if field == 'is_active':
+                value = value.lower() in ('1', 'true')
+            queryset = queryset.filter(**{name: value})
+
+    ordering = [
+        field for field in params.get('ordering', '').split(',')
+        if field.lstrip('-') in JobViewSet.ordering_fields
+    ]
+    return queryset.order_by(*ordering, '-id')
+
+async def render_job_page(request):
+    params = request.query_params
+    try:
+        page = max(int(params.get('page', 1)), 1)
+        page_size = min(max(int(params.get('page_size', api_settings.PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return None
+    offset = (page - 1) * page_size
+    context = {'request': request}
+    queryset = job_queryset(params, JobListSerializer(context=context))
+    jobs = [job async for job in queryset[offset:offset + page_size + 1]]
+
+    url = request.build_absolute_uri()
+    return {
+        'next': replace_query_param(url, 'page', page + 1) if len(jobs) > page_size else None,
+        'previous': replace_query_param(url, 'page', page - 1) if page > 1 else None,
+        'results': JobListSerializer(jobs[:page_size], many=True, context=context).data,
+    }
+
+async def job_page(request):
+    """
+    Return (page data, None), or (None, error response) for bad parameters.
+    """
+    try:
+        data = await render_job_page(request)
+    except ValueError as exc:
+        return None, JsonResponse({'detail': str(exc)}, status=400)
+    if data is None:
+        return None, JsonResponse({'detail': 'Invalid page.'}, status=404)
+    return data, None
+
+@async_api_view()
+async def job_list(request, roles):
+    """
+    Async job list sharing the versioned response cache and ETags of
+    JobViewSet. Pages are offset based without a COUNT.
+    """
+    if not settings.API_RESPONSE_CACHE:
+        data, error = await job_page(request)
+        return error if error is not None else JsonResponse(data)
+
+    version = await blocking(get_version)(JOB_CACHE_NAMESPACE)
+    etag, key = response_cache_keys(JOB_CACHE_NAMESPACE, version, request)
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    data = await blocking(cache.get)(key)
+    if data is None:
+        data, error = await job_page(request)
+        if error is not None:
+            return error
+        await blocking(cache.set)(key, data, settings.API_CACHE_TIMEOUT)
+    response = JsonResponse(data)
+    response['ETag'] = etag
+    return response
+
+@async_api_view()
+async def recommended_jobs(request, roles):
+    matches = [
+        match async for match in JobMatch.objects.filter(
+            candidate=request.user
+        ).order_by('-match_score')[:10]
+    ]
+    return JsonResponse(JobMatchSerializer(matches, many=True).data, safe=False)
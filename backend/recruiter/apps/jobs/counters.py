@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from recruiter.apps.analytics.rollups import OPEN_APPLICATION_STATUSES
+from recruiter.apps.interviews.models import Interview, InterviewFeedback
+from recruiter.caching import bump_version
+from .models import Job, JobApplication, JOB_CACHE_NAMESPACE, JOB_COUNTER_FIELDS
+
+def per_job(queryset, job_field, aggregate):
+    """
+    Correlated subquery computing ``aggregate`` over the rows of
+    ``queryset`` belonging to the outer job.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{job_field: OuterRef('pk')}).order_by().values(job_field)
+            .annotate(value=aggregate).values('value')[:1],
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+def with_actual_counters(jobs):
+    applications = JobApplication.objects.all()
+    feedback = InterviewFeedback.objects.all()
+    return jobs.annotate(
+        actual_application_count=per_job(applications, 'job', Count('id')),
+        actual_open_application_count=per_job(
+            applications.filter(status__in=OPEN_APPLICATION_STATUSES), 'job', Count('id')
+        ),
+        actual_interview_count=per_job(
+            Interview.objects.exclude(status='CANCELLED'), 'job', Count('id')
+        ),
+        actual_feedback_count=per_job(feedback, 'interview__job', Count('id')),
+        actual_rating_sum=per_job(feedback, 'interview__job', Sum('overall_rating')),
+    )
+
+def reconcile_batch(job_ids):
+    counters = [field for field in JOB_COUNTER_FIELDS if field != 'average_rating']
+    drifted = []
+    for job in with_actual_counters(Job.objects.filter(pk__in=job_ids)).only(*JOB_COUNTER_FIELDS):
+        actual = {field: getattr(job, f'actual_{field}') for field in counters}
+        actual['average_rating'] = (
+            actual['rating_sum'] / actual['feedback_count'] if actual['feedback_count'] else None
+        )
+        if any(getattr(job, field) != value for field, value in actual.items()):
+            for field, value in actual.items():
+                setattr(job, field, value)
+            drifted.append(job)
+    if drifted:
+        Job.objects.bulk_update(drifted, JOB_COUNTER_FIELDS)
+    return len(drifted)
+
+def reconcile_job_counters(batch_size=500):
+    """
+    Recompute the counters of every job from the source tables and rewrite
+    the ones that drifted, one batch of jobs at a time. Returns the number
+    of jobs repaired.
+    """
+    repaired = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            # Lock the batch first so the counts below, read in a later
+            # statement, include every increment that committed before us
+            # and no new one can land until the batch is rewritten.
+            job_ids = list(
+                Job.objects.filter(pk__gt=last_id).order_by('pk')
+                .select_for_update().values_list('pk', flat=True)[:batch_size]
+            )
+            if not job_ids:
+                break
+            last_id = job_ids[-1]
+            repaired += reconcile_batch(job_ids)
+    if repaired:
+        bump_version(JOB_CACHE_NAMESPACE)
+    return repaired
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from recruiter.apps.jobs.matching import compute_matches
+from recruiter.apps.jobs.tasks import compute_job_matches
+
+class Command(BaseCommand):
+    help = 'Score job/candidate pairs and store them as JobMatch rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rescore every active job and candidate instead of only changed ones'
+        )
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='run_async',
+            help='Queue the Celery task instead of running in this process'
+        )
+
+    def handle(self, *args, **options):
+        if options['run_async']:
+            compute_job_matches.delay(full=options['full'])
+            self.stdout.write('Queued job matching task')
+            return
+
+        run = compute_matches(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {run.jobs_scored} jobs against {run.candidates_scored} "
+            f"candidates, wrote {run.matches_written} matches"
+        ))
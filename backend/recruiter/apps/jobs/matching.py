@@ -0,0 +1,248 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from recruiter.apps.candidates.models import CandidateProfile, CandidateSkill
+from .models import Job, JobMatch, JobMatchRun
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has',
+    'have', 'in', 'is', 'it', 'of', 'on', 'or', 'our', 'that', 'the', 'to',
+    'we', 'will', 'with', 'you', 'your', 'years', 'year', 'experience',
+])
+
+SKILL_LEVEL_WEIGHTS = {
+    'BEGINNER': 1.0,
+    'INTERMEDIATE': 1.5,
+    'ADVANCED': 2.0,
+    'EXPERT': 2.5,
+}
+
+REQUIREMENTS_WEIGHT = 2.0
+
+
+def tokenize(text):
+    """
+    Split free text into lowercase terms, keeping tokens such as c++, c#
+    and node.js intact.
+    """
+    terms = []
+    for token in TOKEN_RE.findall((text or '').lower()):
+        token = token.rstrip('.')
+        if token and token not in STOP_WORDS:
+            terms.append(token)
+    return terms
+
+
+def job_terms(title, description, requirements):
+    terms = Counter()
+    for term in tokenize(title):
+        terms[term] += REQUIREMENTS_WEIGHT
+    for term in tokenize(requirements):
+        terms[term] += REQUIREMENTS_WEIGHT
+    for term in tokenize(description):
+        terms[term] += 1
+    return terms
+
+
+def candidate_documents(profile_ids=None):
+    """
+    Return {user_id: Counter} term weights built from CandidateProfile.skills,
+    the skill tokens of the parsed resume and the candidate's CandidateSkill
+    rows. ``profile_ids`` limits the load to a subset of profiles.
+    """
+    profiles = CandidateProfile.objects.all()
+    skills = CandidateSkill.objects.all()
+    if profile_ids is not None:
+        profiles = profiles.filter(pk__in=profile_ids)
+        skills = skills.filter(candidate_id__in=profile_ids)
+
+    documents = {}
+    users = {}
+    for profile_id, user_id, text, resume_tokens in profiles.values_list(
+        'id', 'user_id', 'skills', 'parsed_resume__skill_tokens'
+    ).iterator(chunk_size=2000):
+        users[profile_id] = user_id
+        documents[user_id] = Counter(tokenize(text))
+        documents[user_id].update((resume_tokens or '').split())
+
+    for profile_id, name, level in skills.values_list(
+        'candidate_id', 'skill_name', 'skill_level'
+    ).iterator(chunk_size=2000):
+        user_id = users.get(profile_id)
+        if user_id is None:
+            continue
+        weight = SKILL_LEVEL_WEIGHTS.get(level, 1.0)
+        for term in tokenize(name):
+            documents[user_id][term] += weight
+
+    return documents
+
+
+class TermSpace:
+    """
+    Shared vocabulary with inverse document frequencies taken from the job
+    corpus. Candidate terms that no job mentions cannot contribute to a
+    score, so they are dropped from the candidate matrix.
+    """
+
+    def __init__(self, documents):
+        df = Counter()
+        for terms in documents:
+            df.update(terms.keys())
+        vocabulary = sorted(df)
+        self.index = {term: i for i, term in enumerate(vocabulary)}
+        n = len(documents)
+        self.idf = np.array(
+            [math.log((1 + n) / (1 + df[term])) + 1 for term in vocabulary],
+            dtype=np.float32
+        )
+
+    def matrix(self, documents):
+        """
+        Build an L2-normalised sparse TF-IDF matrix, one row per document.
+        """
+        rows, cols, values = [], [], []
+        for row, terms in enumerate(documents):
+            for term, weight in terms.items():
+                col = self.index.get(term)
+                if col is None or weight <= 0:
+                    continue
+                rows.append(row)
+                cols.append(col)
+                values.append((1 + math.log(max(weight, 1))) * self.idf[col])
+
+        matrix = sparse.csr_matrix(
+            (values, (rows, cols)),
+            shape=(len(documents), len(self.index)),
+            dtype=np.float32
+        )
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).dot(matrix).tocsr()
+
+
+def score_pairs(job_ids, job_matrix, user_ids, candidate_matrix, min_score, chunk_size):
+    """
+    Yield (job_id, user_id, score) for every pair whose cosine similarity,
+    expressed as a percentage, reaches ``min_score``. Jobs are multiplied
+    against the candidate matrix ``chunk_size`` rows at a time to bound the
+    size of the intermediate product.
+    """
+    if not job_ids or not user_ids:
+        return
+    candidate_t = candidate_matrix.T.tocsc()
+    for start in range(0, len(job_ids), chunk_size):
+        product = job_matrix[start:start + chunk_size].dot(candidate_t).tocoo()
+        scores = product.data * 100
+        keep = scores >= min_score
+        for row, col, score in zip(product.row[keep], product.col[keep], scores[keep]):
+            yield job_ids[start + row], user_ids[col], round(float(score), 2)
+
+
+def write_matches(pairs, batch_size):
+    written = 0
+    batch = []
+    for job_id, user_id, score in pairs:
+        batch.append(JobMatch(job_id=job_id, candidate_id=user_id, match_score=score))
+        if len(batch) >= batch_size:
+            written += _upsert(batch)
+            batch = []
+    if batch:
+        written += _upsert(batch)
+    return written
+
+
+def _upsert(batch):
+    with transaction.atomic():
+        JobMatch.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['job', 'candidate'],
+            update_fields=['match_score', 'updated_at'],
+        )
+    return len(batch)
+
+
+def compute_matches(full=False):
+    """
+    Score job/candidate pairs and upsert the results into JobMatch.
+
+    Unless ``full`` is set, only jobs and candidate profiles modified since
+    the last finished run are rescored: changed jobs against every candidate,
+    and the remaining active jobs against changed candidates. Matches in the
+    rescored scope that were not rewritten are removed afterwards.
+    """
+    min_score = settings.JOB_MATCH_MIN_SCORE
+    chunk_size = settings.JOB_MATCH_CHUNK_SIZE
+    batch_size = settings.JOB_MATCH_BATCH_SIZE
+
+    last_run = JobMatchRun.objects.filter(finished_at__isnull=False).first()
+    since = None if full or last_run is None else last_run.started_at
+    run = JobMatchRun.objects.create(full=since is None)
+
+    jobs = list(
+        Job.objects.filter(is_active=True)
+        .values_list('id', 'title', 'description', 'requirements', 'updated_at')
+        .iterator(chunk_size=2000)
+    )
+    space = TermSpace([job_terms(*job[1:4]) for job in jobs])
+
+    if since is None:
+        changed_job_ids = {job[0] for job in jobs}
+        changed_profile_ids = None
+    else:
+        changed_job_ids = set(
+            Job.objects.filter(updated_at__gte=since).values_list('id', flat=True)
+        )
+        changed_profile_ids = list(
+            CandidateProfile.objects.filter(updated_at__gte=since)
+            .values_list('id', flat=True)
+        )
+
+    rescored_jobs = [job for job in jobs if job[0] in changed_job_ids]
+    other_jobs = [job for job in jobs if job[0] not in changed_job_ids]
+    if rescored_jobs:
+        candidates = candidate_documents()
+        changed_users = candidates if since is None else candidate_documents(changed_profile_ids)
+    else:
+        candidates = changed_users = candidate_documents(changed_profile_ids)
+
+    written = 0
+    passes = [(rescored_jobs, candidates), (other_jobs, changed_users)]
+    for job_rows, documents in passes:
+        if not job_rows or not documents:
+            continue
+        user_ids = list(documents)
+        job_ids = [job[0] for job in job_rows]
+        pairs = score_pairs(
+            job_ids,
+            space.matrix([job_terms(*job[1:4]) for job in job_rows]),
+            user_ids,
+            space.matrix([documents[user_id] for user_id in user_ids]),
+            min_score,
+            chunk_size,
+        )
+        written += write_matches(pairs, batch_size)
+
+    stale = JobMatch.objects.filter(updated_at__lt=run.started_at)
+    if since is None:
+        stale.delete()
+    else:
+        stale.filter(job_id__in=changed_job_ids).delete()
+        stale.filter(candidate_id__in=list(changed_users)).delete()
+
+    run.finished_at = timezone.now()
+    run.jobs_scored = len(rescored_jobs) + (len(other_jobs) if changed_users else 0)
+    run.candidates_scored = len(candidates)
+    run.matches_written = written
+    run.save()
+    return run
@@ -1,8 +1,21 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, NullIf
 from django.contrib.auth import get_user_model
+from recruiter.apps.analytics.rollups import RollupMixin, application_deltas
+from recruiter.caching import bump_version
 
 User = get_user_model()
 
+JOB_CACHE_NAMESPACE = 'jobs'
+
+# Maintained by the application, interview and feedback hooks, never by
+# Job.save, so a stale Job instance cannot overwrite them.
+JOB_COUNTER_FIELDS = (
+    'application_count', 'open_application_count', 'interview_count',
+    'feedback_count', 'rating_sum', 'average_rating'
+)
+
 class Job(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -15,11 +28,62 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    application_count = models.IntegerField(default=0, editable=False)
+    open_application_count = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text='Applications still pending, in review or shortlisted'
+    )
+    interview_count = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text='Interviews that were not cancelled'
+    )
+    feedback_count = models.IntegerField(default=0, editable=False)
+    rating_sum = models.IntegerField(default=0, editable=False)
+    average_rating = models.FloatField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['application_count']),
+            models.Index(fields=['average_rating']),
+        ]
 
     def __str__(self):
         return self.title
 
-class JobApplication(models.Model):
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in JOB_COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        bump_version(JOB_CACHE_NAMESPACE)
+
+    @classmethod
+    def apply_rollup_delta(cls, key, fields):
+        """
+        Apply counter deltas with one UPDATE, recomputing the average rating
+        from the incremented sum and count in the same statement.
+
+        The job response cache is deliberately not invalidated: counters
+        change on every application and status change, so cached job
+        payloads show them up to API_CACHE_TIMEOUT late instead.
+        """
+        increments = {field: F(field) + value for field, value in fields.items()}
+        if 'feedback_count' in fields or 'rating_sum' in fields:
+            increments['average_rating'] = Cast(
+                F('rating_sum') + fields.get('rating_sum', 0), FloatField()
+            ) / NullIf(F('feedback_count') + fields.get('feedback_count', 0), 0)
+        cls.objects.filter(**key).update(**increments)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_version(JOB_CACHE_NAMESPACE)
+        return result
+
+class JobApplication(RollupMixin, models.Model):
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
         ('REVIEWING', 'Reviewing'),
@@ -28,22 +92,87 @@ class JobApplication(models.Model):
         ('HIRED', 'Hired'),
     ]
 
+    STATUS_TRANSITIONS = {
+        'PENDING': {'REVIEWING', 'SHORTLISTED', 'REJECTED'},
+        'REVIEWING': {'SHORTLISTED', 'REJECTED'},
+        'SHORTLISTED': {'REVIEWING', 'REJECTED', 'HIRED'},
+        'REJECTED': {'REVIEWING'},
+        'HIRED': set(),
+    }
+
     job = models.ForeignKey(Job, on_delete=models.CASCADE)
     candidate = models.ForeignKey(User, on_delete=models.CASCADE)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     cover_letter = models.TextField()
     resume = models.FileField(upload_to='resumes/')
+    parsed_resume = models.ForeignKey(
+        'candidates.ParsedResume',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='applications'
+    )
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    rollup_fields = ('job_id', 'applied_at', 'status')
+    rollup_deltas = application_deltas
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['applied_at', 'id']),
+            models.Index(
+                fields=['candidate', '-applied_at', '-id'],
+                name='application_candidate_recent'
+            ),
+            models.Index(fields=['job', 'status'], name='application_job_status'),
+        ]
+
     def __str__(self):
         return f"{self.candidate.email} - {self.job.title}"
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.resume and not self.resume._committed:
+                from recruiter.apps.candidates.resumes import ingest_resume
+                self.parsed_resume = ingest_resume(self.resume)
+            super().save(*args, **kwargs)
+
 class JobMatch(models.Model):
     job = models.ForeignKey(Job, on_delete=models.CASCADE)
     candidate = models.ForeignKey(User, on_delete=models.CASCADE)
     match_score = models.FloatField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # recommended_jobs and the candidate's match list, best first
+            models.Index(
+                fields=['candidate', '-match_score', 'id'],
+                name='jobmatch_candidate_score'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job', 'candidate'],
+                name='unique_job_match'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate.email} - {self.job.title} ({self.match_score}%)"
+
+class JobMatchRun(models.Model):
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    full = models.BooleanField(default=False)
+    jobs_scored = models.IntegerField(default=0)
+    candidates_scored = models.IntegerField(default=0)
+    matches_written = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-started_at']
 
     def __str__(self):
-        return f"{self.candidate.email} - {self.job.title} ({self.match_score}%)"
\ No newline at end of file
+        return f"Match run {self.started_at}"
@@ -1,20 +1,39 @@
 from rest_framework import serializers
-from .models import Job, JobApplication, JobMatch
+from recruiter.sparse import SparseFieldsetMixin
+from .models import Job, JobApplication, JobMatch, JOB_COUNTER_FIELDS
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Job
         fields = '__all__'
-        read_only_fields = ('posted_by', 'created_at', 'updated_at')
+        read_only_fields = ('posted_by', 'created_at', 'updated_at') + JOB_COUNTER_FIELDS
+        deferred = {'description': 'description', 'requirements': 'requirements'}
+
+class JobListSerializer(JobSerializer):
+    class Meta(JobSerializer.Meta):
+        # description and requirements are available through ?expand=
+        default_fields = (
+            'id', 'title', 'location', 'salary_range', 'job_type',
+            'experience_level', 'posted_by', 'created_at', 'updated_at',
+            'is_active'
+        ) + JOB_COUNTER_FIELDS
 
 class JobApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobApplication
         fields = '__all__'
-        read_only_fields = ('candidate', 'applied_at', 'updated_at')
+        read_only_fields = ('candidate', 'parsed_resume', 'applied_at', 'updated_at')
 
 class JobMatchSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobMatch
         fields = '__all__'
-        read_only_fields = ('created_at',)
\ No newline at end of file
+        read_only_fields = ('created_at', 'updated_at')
+
+class BulkStatusUpdateSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=5000
+    )
+    status = serializers.ChoiceField(choices=JobApplication.STATUS_CHOICES)
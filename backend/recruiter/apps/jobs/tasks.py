@@ -0,0 +1,34 @@
+from celery import shared_task
+from recruiter.apps.notifications.outbox import notify_many
+from .counters import reconcile_job_counters
+from .matching import compute_matches
+from .models import JobApplication
+
+@shared_task
+def compute_job_matches(full=False):
+    """
+    Rescore jobs and candidates that changed since the last matching run.
+    """
+    run = compute_matches(full=full)
+    return run.matches_written
+
+@shared_task
+def reconcile_counters():
+    """
+    Repair drift in the denormalized per-job counters.
+    """
+    return reconcile_job_counters()
+
+@shared_task
+def send_application_status_notifications(application_ids, status):
+    """
+    Deprecated: status mail now goes through the notification outbox. Kept
+    for one release so that messages queued before the upgrade still
+    notify the candidates; remove it in the next one.
+    """
+    notify_many([
+        ('APPLICATION_STATUS', candidate_id, pk, {'status': status})
+        for pk, candidate_id in JobApplication.objects.filter(
+            pk__in=application_ids, status=status
+        ).values_list('pk', 'candidate_id')
+    ])
\ No newline at end of file
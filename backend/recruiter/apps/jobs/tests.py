@@ -0,0 +1,161 @@
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from recruiter.testing import QueryBudgetMixin, create_job, create_user
+from recruiter.apps.notifications.models import OutboxEvent
+from .models import JobApplication, JobMatch
+
+class JobQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = create_user('staff', is_staff=True)
+        cls.candidate = create_user('candidate')
+        cls.applications = []
+        for i in range(5):
+            job = create_job(cls.staff, title=f'Engineer {i}')
+            cls.applications.append(JobApplication.objects.create(
+                job=job,
+                candidate=cls.candidate,
+                cover_letter='Hello',
+                resume=f'resumes/application-{i}.pdf',
+            ))
+            JobMatch.objects.create(job=job, candidate=cls.candidate, match_score=50 + i)
+
+    def test_application_list(self):
+        for user in [self.staff, self.candidate]:
+            self.client.force_authenticate(user)
+            with self.assertEndpointQueryBudget('jobapplication-list'):
+                response = self.client.get(reverse('jobapplication-list'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['results']), 5)
+
+    def test_application_detail(self):
+        self.client.force_authenticate(self.candidate)
+        url = reverse('jobapplication-detail', args=[self.applications[0].pk])
+        with self.assertEndpointQueryBudget('jobapplication-detail'):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_match_list(self):
+        self.client.force_authenticate(self.candidate)
+        with self.assertEndpointQueryBudget('jobmatch-list'):
+            response = self.client.get(reverse('jobmatch-list'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_recommended_jobs(self):
+        self.client.force_authenticate(self.candidate)
+        with self.assertEndpointQueryBudget('jobmatch-recommended-jobs'):
+            response = self.client.get(reverse('jobmatch-recommended-jobs'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([match['match_score'] for match in response.data], [54, 53, 52, 51, 50])
+
+    async def test_async_recommended_jobs(self):
+        token = await Token.objects.acreate(user=self.candidate)
+        response = await self.async_client.get(
+            reverse('jobmatch-async-recommended-jobs'),
+            headers={'Authorization': f'Token {token.key}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([match['match_score'] for match in response.json()], [54, 53, 52, 51, 50])
+
+class KeysetPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = create_user('staff', is_staff=True)
+        job = create_job(cls.staff)
+        applications = [
+            JobApplication.objects.create(
+                job=job,
+                candidate=create_user(f'candidate{i}'),
+                cover_letter='Hello',
+                resume=f'resumes/application-{i}.pdf',
+            )
+            for i in range(7)
+        ]
+        # Ties on applied_at must be broken by id
+        JobApplication.objects.filter(pk__in=[a.pk for a in applications[2:5]]).update(
+            applied_at=applications[2].applied_at
+        )
+        cls.expected = list(
+            JobApplication.objects.order_by('-applied_at', '-id').values_list('pk', flat=True)
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def walk(self, url, link):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(row['id'] for row in response.data['results'])
+            url = response.data[link]
+        return ids
+
+    def test_forward_pages_cover_every_row_once(self):
+        url = reverse('jobapplication-list') + '?pagination=cursor&page_size=3'
+        self.assertEqual(self.walk(url, 'next'), self.expected)
+
+    def test_previous_links_walk_back(self):
+        url = reverse('jobapplication-list') + '?pagination=cursor&page_size=3'
+        last = None
+        while url:
+            response = self.client.get(url)
+            last, url = response, response.data['next']
+        backwards = []
+        url = last.data['previous']
+        while url:
+            response = self.client.get(url)
+            backwards[:0] = [row['id'] for row in response.data['results']]
+            url = response.data['previous']
+        page = [row['id'] for row in last.data['results']]
+        self.assertEqual(backwards + page, self.expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('jobapplication-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_number_fallback(self):
+        response = self.client.get(reverse('jobapplication-list'), {'page_size': 3, 'page': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual([row['id'] for row in response.data['results']], self.expected[6:])
+
+class ApplicationStatusTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = create_user('staff', is_staff=True)
+        cls.application = JobApplication.objects.create(
+            job=create_job(cls.staff),
+            candidate=create_user('candidate'),
+            cover_letter='Hello',
+            resume='resumes/application.pdf',
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def update_status(self, new_status):
+        url = reverse('jobapplication-update-status', args=[self.application.pk])
+        return self.client.patch(url, {'status': new_status}, format='json')
+
+    def test_allowed_transition(self):
+        response = self.update_status('SHORTLISTED')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'SHORTLISTED')
+        self.assertEqual(OutboxEvent.objects.filter(subject_id=self.application.pk).count(), 1)
+
+    def test_invalid_transition(self):
+        self.assertEqual(self.update_status('HIRED').status_code, 400)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, 'PENDING')
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_unchanged_status_is_a_no_op(self):
+        response = self.update_status('PENDING')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_unknown_status(self):
+        self.assertEqual(self.update_status('ARCHIVED').status_code, 400)
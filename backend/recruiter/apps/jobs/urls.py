@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import job_list, recommended_jobs
 from .views import JobViewSet, JobApplicationViewSet, JobMatchViewSet
 
 router = DefaultRouter()
@@ -8,5 +9,7 @@ router.register(r'applications', JobApplicationViewSet)
 router.register(r'matches', JobMatchViewSet)
 
 urlpatterns = [
+    path('async/jobs/', job_list, name='job-async-list'),
+    path('async/matches/recommended_jobs/', recommended_jobs, name='jobmatch-async-recommended-jobs'),
     path('', include(router.urls)),
 ] 
\ No newline at end of file
@@ -1,14 +1,50 @@
-from rest_framework import viewsets, permissions, status
+from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Job, JobApplication, JobMatch
-from .serializers import JobSerializer, JobApplicationSerializer, JobMatchSerializer
+from .models import Job, JobApplication, JobMatch, JOB_CACHE_NAMESPACE
+from .serializers import (
+    JobSerializer, JobListSerializer, JobApplicationSerializer,
+    JobMatchSerializer, BulkStatusUpdateSerializer
+)
+from django.db import transaction
+from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from recruiter.apps.analytics.rollups import application_deltas, record_changes
+from recruiter.apps.notifications.outbox import notify, notify_many
+from recruiter.caching import VersionedCacheMixin
+from recruiter.exports import ExportMixin
+from recruiter.pagination import KeysetPagination
+from recruiter.sparse import sparse_queryset
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(VersionedCacheMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_namespace = JOB_CACHE_NAMESPACE
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = {
+        'is_active': ['exact'],
+        'job_type': ['exact'],
+        'location': ['exact'],
+        'application_count': ['gte', 'lte'],
+        'interview_count': ['gte', 'lte'],
+        'average_rating': ['gte', 'lte'],
+    }
+    ordering_fields = [
+        'created_at', 'application_count', 'open_application_count',
+        'interview_count', 'feedback_count', 'average_rating'
+    ]
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return JobListSerializer
+        return JobSerializer
+
+    def get_queryset(self):
+        if self.action in ['list', 'retrieve']:
+            return sparse_queryset(Job.objects.all(), self.get_serializer())
+        return Job.objects.all()
 
     def perform_create(self, serializer):
         serializer.save(posted_by=self.request.user)
@@ -28,29 +64,111 @@ class JobViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+class JobApplicationPagination(KeysetPagination):
+    ordering = ('-applied_at', '-id')
+
+class JobApplicationViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = JobApplication.objects.all()
     serializer_class = JobApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = JobApplicationPagination
+    filterset_fields = ['job', 'candidate', 'status']
+    export_fields = [
+        'id', 'job', 'job__title', 'candidate', 'candidate__email', 'status',
+        'cover_letter', 'resume', 'applied_at', 'updated_at'
+    ]
+    export_filename = 'applications'
 
     def get_queryset(self):
+        # The serializer renders job and candidate as primary keys, so no
+        # joins are needed; a stable ordering keeps pagination consistent.
+        queryset = JobApplication.objects.order_by('-applied_at', '-id')
         if self.request.user.is_staff:
-            return JobApplication.objects.all()
-        return JobApplication.objects.filter(candidate=self.request.user)
+            return queryset
+        return queryset.filter(candidate=self.request.user)
 
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
         application = self.get_object()
         new_status = request.data.get('status')
-        
-        if new_status in dict(JobApplication.STATUS_CHOICES):
-            application.status = new_status
-            application.save()
-            return Response(JobApplicationSerializer(application).data)
-        return Response(
-            {'error': 'Invalid status'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        if new_status not in dict(JobApplication.STATUS_CHOICES):
+            return Response(
+                {'error': 'Invalid status'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            # Lock the row so the transition check sees the status being replaced
+            application = JobApplication.objects.select_for_update().get(pk=application.pk)
+            current = application.status
+            if current != new_status:
+                if new_status not in JobApplication.STATUS_TRANSITIONS[current]:
+                    return Response(
+                        {'error': f'Cannot move an application from {current} to {new_status}'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                application.status = new_status
+                application.save(update_fields=['status', 'updated_at'])
+                notify(
+                    'APPLICATION_STATUS', application.candidate_id, application.pk,
+                    status=new_status
+                )
+        return Response(JobApplicationSerializer(application).data)
+
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAdminUser])
+    def bulk_update_status(self, request):
+        """
+        Move many applications to one status with a single UPDATE, returning
+        the outcome for every requested id.
+        """
+        serializer = BulkStatusUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        new_status = serializer.validated_data['status']
+
+        outcomes = {}
+        with transaction.atomic():
+            # Lock the rows so the transition check and the UPDATE see the same status
+            locked = list(
+                self.get_queryset().filter(pk__in=ids)
+                .select_for_update().order_by()
+                .values_list('pk', 'job_id', 'applied_at', 'status', 'candidate_id')
+            )
+            # pk -> (job_id, applied_at, status), the application's rollup state
+            rows = {row[0]: row[1:4] for row in locked}
+            candidates = {row[0]: row[4] for row in locked}
+            current = {pk: row[2] for pk, row in rows.items()}
+            updated_ids = []
+            for pk in ids:
+                if pk not in current:
+                    outcomes[pk] = 'not_found'
+                elif current[pk] == new_status:
+                    outcomes[pk] = 'unchanged'
+                elif new_status not in JobApplication.STATUS_TRANSITIONS[current[pk]]:
+                    outcomes[pk] = f'invalid_transition:{current[pk]}'
+                else:
+                    outcomes[pk] = 'updated'
+                    updated_ids.append(pk)
+
+            if updated_ids:
+                JobApplication.objects.filter(pk__in=updated_ids).update(
+                    status=new_status,
+                    updated_at=timezone.now()
+                )
+                record_changes(application_deltas, [
+                    (rows[pk], rows[pk][:2] + (new_status,)) for pk in updated_ids
+                ])
+                notify_many([
+                    ('APPLICATION_STATUS', candidates[pk], pk, {'status': new_status})
+                    for pk in updated_ids
+                ])
+
+        return Response({
+            'status': new_status,
+            'updated': len(updated_ids),
+            'results': [{'id': pk, 'outcome': outcomes[pk]} for pk in ids],
+        })
 
 class JobMatchViewSet(viewsets.ModelViewSet):
     queryset = JobMatch.objects.all()
@@ -58,9 +176,10 @@ class JobMatchViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
+        queryset = JobMatch.objects.order_by('-match_score', 'id')
         if self.request.user.is_staff:
-            return JobMatch.objects.all()
-        return JobMatch.objects.filter(candidate=self.request.user)
+            return queryset
+        return queryset.filter(candidate=self.request.user)
 
     @action(detail=False, methods=['get'])
     def recommended_jobs(self, request):
@@ -0,0 +1,228 @@
+from collections import defaultdict
+from smtplib import SMTPException
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from recruiter.apps.interviews.models import Interview
+from recruiter.apps.jobs.models import JobApplication
+from .models import OutboxEvent
+
+FROM_EMAIL = 'noreply@recruiter.com'
+
+INTERVIEW_EVENTS = {'INTERVIEW_FEEDBACK', 'INTERVIEW_STARTED', 'INTERVIEW_CANCELLED'}
+
+def pending_events(now):
+    """
+    Undispatched events not leased to a running dispatcher.
+    """
+    return OutboxEvent.objects.filter(
+        Q(claimed_until__isnull=True) | Q(claimed_until__lt=now),
+        dispatched_at__isnull=True,
+        attempts__lt=settings.NOTIFICATION_MAX_ATTEMPTS,
+    )
+
+def claim(batch_size, now):
+    """
+    Lease up to ``batch_size`` due events together with every other pending
+    event of the same recipients, so that each recipient gets one message
+    for everything that happened within the coalescing window.
+
+    Rows are locked with SKIP LOCKED only while the lease is written, so
+    delivery runs outside any transaction and a concurrent dispatcher
+    skips leased events. A dispatcher that dies leaves its leases to expire.
+    """
+    with transaction.atomic():
+        due = (
+            pending_events(now).filter(available_at__lte=now)
+            .select_for_update(skip_locked=True)
+            .order_by('available_at', 'id')
+            .values_list('recipient_id', flat=True)[:batch_size]
+        )
+        recipients = set(due)
+        if not recipients:
+            return []
+        events = list(
+            pending_events(now).filter(recipient_id__in=recipients)
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('recipient')
+            .order_by('recipient_id', 'created_at', 'id')
+        )
+        OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+            claimed_until=now + settings.NOTIFICATION_CLAIM_TIMEOUT
+        )
+    return events
+
+def coalesce(events):
+    """
+    Keep the latest event per type and subject: three status changes of one
+    application within the window become a single update.
+    """
+    latest = {}
+    for event in events:
+        latest[(event.event_type, event.subject_id)] = event
+    return sorted(latest.values(), key=lambda event: (event.created_at, event.pk))
+
+def load_subjects(events):
+    """
+    Interviews and applications the events refer to, with one query each.
+    """
+    interview_ids = {event.subject_id for event in events if event.event_type in INTERVIEW_EVENTS}
+    application_ids = {event.subject_id for event in events if event.event_type == 'APPLICATION_STATUS'}
+    interviews = Interview.objects.select_related(
+        'candidate__user', 'interviewer', 'job', 'interview_feedback'
+    ).in_bulk(interview_ids)
+    applications = JobApplication.objects.select_related('candidate', 'job').in_bulk(application_ids)
+    return interviews, applications
+
+def render_event(event, interviews, applications):
+    """
+    Return (subject, template, context) for an event, or None when what it
+    refers to no longer exists.
+    """
+    if event.event_type == 'APPLICATION_STATUS':
+        application = applications.get(event.subject_id)
+        if application is None:
+            return None
+        status = dict(JobApplication.STATUS_CHOICES).get(event.payload.get('status'))
+        return (
+            f"Update on your application for {application.job.title}",
+            'emails/application_status.html',
+            {
+                'candidate_name': application.candidate.get_full_name(),
+                'job_title': application.job.title,
+                'status': status or application.get_status_display(),
+            },
+        )
+
+    interview = interviews.get(event.subject_id)
+    if interview is None:
+        return None
+    context = {
+        'interview': interview,
+        'recipient_name': event.recipient.get_full_name(),
+        'candidate_name': interview.candidate.user.get_full_name(),
+        'interviewer_name': interview.interviewer.get_full_name(),
+        'job_title': interview.job.title,
+    }
+    if event.event_type == 'INTERVIEW_FEEDBACK':
+        context['feedback'] = interview.interview_feedback
+        return (
+            f"Interview Feedback for {interview.job.title}",
+            'emails/interview_feedback.html',
+            context,
+        )
+    if event.event_type == 'INTERVIEW_STARTED':
+        context['status'] = 'has started'
+        subject = f"Your interview for {interview.job.title} has started"
+    else:
+        context['status'] = 'has been cancelled'
+        subject = f"Interview for {interview.job.title} cancelled"
+    return subject, 'emails/interview_status.html', context
+
+def build_message(recipient, rendered, connection):
+    if len(rendered) == 1:
+        subject, template, context = rendered[0]
+        body = render_to_string(template, context)
+    else:
+        subject = f"{len(rendered)} updates from the Recruiter Team"
+        body = render_to_string('emails/notification_digest.html', {
+            'recipient_name': recipient.get_full_name(),
+            'updates': [update[0] for update in rendered],
+        })
+    message = EmailMultiAlternatives(
+        subject, body, FROM_EMAIL, [recipient.email], connection=connection
+    )
+    message.attach_alternative(body, 'text/html')
+    return message
+
+def deliver_to_recipient(recipient, group, interviews, applications, connection):
+    """
+    Render and send the message for one recipient's events. Returns whether
+    a message went out.
+    """
+    rendered = [
+        update for update in (
+            render_event(event, interviews, applications) for event in coalesce(group)
+        )
+        if update is not None
+    ]
+    if not rendered or not recipient.email:
+        return False
+    connection.send_messages([build_message(recipient, rendered, connection)])
+    return True
+
+def deliver(events, connection, now):
+    """
+    Send one message per recipient, marking each recipient's events
+    dispatched as soon as their message is out. Any failure is recorded on
+    that recipient's events, which are retried after
+    NOTIFICATION_RETRY_DELAY, and does not affect the other recipients.
+    Returns the number of messages sent.
+    """
+    interviews, applications = load_subjects(events)
+    by_recipient = defaultdict(list)
+    for event in events:
+        by_recipient[event.recipient_id].append(event)
+
+    sent = 0
+    for group in by_recipient.values():
+        claimed = OutboxEvent.objects.filter(pk__in=[event.pk for event in group])
+        try:
+            delivered = deliver_to_recipient(
+                group[0].recipient, group, interviews, applications, connection
+            )
+        except Exception as exc:
+            claimed.update(
+                attempts=F('attempts') + 1,
+                last_error=str(exc),
+                available_at=now + settings.NOTIFICATION_RETRY_DELAY,
+                claimed_until=None,
+            )
+            if isinstance(exc, (SMTPException, OSError)):
+                reset_connection(connection)
+            continue
+        claimed.update(dispatched_at=now, claimed_until=None)
+        sent += delivered
+    return sent
+
+def reset_connection(connection):
+    # Drop a possibly broken connection so the rest of the batch does not
+    # share the failure; the next send opens a new one
+    try:
+        connection.close()
+    except (SMTPException, OSError):
+        pass
+
+def dispatch_notifications(batch_size=None):
+    """
+    Drain the outbox in batches over one SMTP connection.
+
+    Events are leased by ``claim`` and delivered outside the claiming
+    transaction. A crash between sending a message and marking its events
+    leaves them to be sent again once the lease expires: delivery is at
+    least once.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    connection = get_connection()
+    sent = 0
+    with connection:
+        while True:
+            now = timezone.now()
+            events = claim(batch_size, now)
+            if not events:
+                break
+            sent += deliver(events, connection, now)
+    return sent
+
+def purge_dispatched(days=None):
+    """
+    Delete events dispatched more than ``days`` ago.
+    """
+    days = settings.NOTIFICATION_RETENTION_DAYS if days is None else days
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    deleted, _ = OutboxEvent.objects.filter(dispatched_at__lt=cutoff).delete()
+    return deleted
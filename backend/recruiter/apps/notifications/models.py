@@ -0,0 +1,53 @@
+from django.db import models
+from django.db.models import Q
+from django.conf import settings
+
+class OutboxEvent(models.Model):
+    """
+    A notification recorded in the same transaction as the change it
+    announces, delivered later by the dispatcher. Events that roll back
+    with their transaction are never sent.
+    """
+    EVENT_CHOICES = [
+        ('INTERVIEW_FEEDBACK', 'Interview feedback'),
+        ('INTERVIEW_STARTED', 'Interview started'),
+        ('INTERVIEW_CANCELLED', 'Interview cancelled'),
+        ('APPLICATION_STATUS', 'Application status'),
+    ]
+
+    event_type = models.CharField(max_length=30, choices=EVENT_CHOICES)
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='outbox_events'
+    )
+    subject_id = models.BigIntegerField(help_text='Interview or application the event is about')
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(help_text='Not dispatched before this time')
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    claimed_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Lease of the dispatcher currently delivering the event'
+    )
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['available_at', 'recipient'],
+                condition=Q(dispatched_at__isnull=True),
+                name='outbox_pending'
+            ),
+            models.Index(
+                fields=['recipient', 'created_at'],
+                condition=Q(dispatched_at__isnull=True),
+                name='outbox_pending_recipient'
+            ),
+            models.Index(fields=['dispatched_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} for {self.recipient_id}"
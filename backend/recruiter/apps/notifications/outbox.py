@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.utils import timezone
+from .models import OutboxEvent
+
+def build_event(event_type, recipient_id, subject_id, **payload):
+    return OutboxEvent(
+        event_type=event_type,
+        recipient_id=recipient_id,
+        subject_id=subject_id,
+        payload=payload,
+        # Events for the same recipient arriving within the window are
+        # delivered together
+        available_at=timezone.now() + settings.NOTIFICATION_COALESCE_WINDOW,
+    )
+
+def notify(event_type, recipient_id, subject_id, **payload):
+    """
+    Record a notification as part of the current transaction. Call it
+    inside the transaction that makes the change, so both commit or roll
+    back together.
+    """
+    event = build_event(event_type, recipient_id, subject_id, **payload)
+    event.save()
+    return event
+
+def notify_many(events):
+    """
+    Record many notifications given as (event_type, recipient_id,
+    subject_id, payload) tuples with one INSERT.
+    """
+    return OutboxEvent.objects.bulk_create([
+        build_event(event_type, recipient_id, subject_id, **payload)
+        for event_type, recipient_id, subject_id, payload in events
+    ])
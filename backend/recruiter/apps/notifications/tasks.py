@@ -0,0 +1,16 @@
+from celery import shared_task
+from .dispatch import dispatch_notifications, purge_dispatched
+
+@shared_task
+def dispatch_outbox():
+    """
+    Send due outbox events, one coalesced message per recipient.
+    """
+    return dispatch_notifications()
+
+@shared_task
+def purge_outbox():
+    """
+    Remove outbox events dispatched before the retention period.
+    """
+    return purge_dispatched()
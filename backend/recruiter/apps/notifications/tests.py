@@ -0,0 +1,117 @@
+from unittest import mock
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from recruiter.apps.interviews.tasks import send_interview_feedback
+from recruiter.apps.jobs.models import JobApplication
+from recruiter.apps.jobs.tasks import send_application_status_notifications
+from recruiter.testing import create_candidate, create_interview, create_job, create_user
+from . import dispatch
+from .dispatch import dispatch_notifications
+from .models import OutboxEvent
+from .outbox import notify, notify_many
+
+@override_settings(NOTIFICATION_COALESCE_WINDOW=timezone.timedelta(0))
+class OutboxDispatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        staff = create_user('staff', is_staff=True)
+        cls.job = create_job(staff, title='Backend Engineer')
+        cls.ada = create_user('ada')
+        cls.grace = create_user('grace')
+        cls.applications = {
+            user.pk: JobApplication.objects.create(
+                job=cls.job,
+                candidate=user,
+                cover_letter='Hello',
+                resume=f'resumes/{user.username}.pdf',
+            )
+            for user in [cls.ada, cls.grace]
+        }
+
+    def status_event(self, user, status):
+        return ('APPLICATION_STATUS', user.pk, self.applications[user.pk].pk, {'status': status})
+
+    def test_events_wait_for_the_coalescing_window(self):
+        with self.settings(NOTIFICATION_COALESCE_WINDOW=timezone.timedelta(minutes=2)):
+            notify('APPLICATION_STATUS', self.ada.pk, self.applications[self.ada.pk].pk, status='REVIEWING')
+        self.assertEqual(dispatch_notifications(), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_one_message_per_recipient(self):
+        notify_many([
+            self.status_event(self.ada, 'REVIEWING'),
+            self.status_event(self.ada, 'SHORTLISTED'),
+            self.status_event(self.grace, 'REJECTED'),
+        ])
+        self.assertEqual(dispatch_notifications(), 2)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [
+            'ada@example.com', 'grace@example.com'
+        ])
+        # Two changes of one application within the window are one update
+        ada_message = next(message for message in mail.outbox if message.to == ['ada@example.com'])
+        self.assertIn('Shortlisted', ada_message.body)
+        self.assertFalse(OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+
+    def test_digest_for_several_subjects(self):
+        other = JobApplication.objects.create(
+            job=create_job(self.job.posted_by, title='Data Engineer'),
+            candidate=self.ada,
+            cover_letter='Hello',
+            resume='resumes/ada-2.pdf',
+        )
+        notify_many([
+            self.status_event(self.ada, 'REVIEWING'),
+            ('APPLICATION_STATUS', self.ada.pk, other.pk, {'status': 'REJECTED'}),
+        ])
+        self.assertEqual(dispatch_notifications(), 1)
+        self.assertEqual(mail.outbox[0].subject, '2 updates from the Recruiter Team')
+
+    def test_a_failing_recipient_does_not_hold_back_the_others(self):
+        notify_many([self.status_event(self.ada, 'REVIEWING'), self.status_event(self.grace, 'REJECTED')])
+        render_event = dispatch.render_event
+
+        def failing_for_ada(event, *args):
+            if event.recipient_id == self.ada.pk:
+                raise RuntimeError('template error')
+            return render_event(event, *args)
+
+        with mock.patch.object(dispatch, 'render_event', side_effect=failing_for_ada):
+            self.assertEqual(dispatch_notifications(), 1)
+        self.assertEqual([message.to for message in mail.outbox], [['grace@example.com']])
+
+        failed = OutboxEvent.objects.get(recipient=self.ada)
+        self.assertIsNone(failed.dispatched_at)
+        self.assertIsNone(failed.claimed_until)
+        self.assertEqual((failed.attempts, failed.last_error), (1, 'template error'))
+        self.assertGreater(failed.available_at, timezone.now())
+        self.assertIsNotNone(OutboxEvent.objects.get(recipient=self.grace).dispatched_at)
+
+    def test_leased_events_are_skipped(self):
+        event = notify('APPLICATION_STATUS', self.ada.pk, self.applications[self.ada.pk].pk, status='REVIEWING')
+        OutboxEvent.objects.filter(pk=event.pk).update(
+            claimed_until=timezone.now() + timezone.timedelta(minutes=5)
+        )
+        self.assertEqual(dispatch_notifications(), 0)
+        OutboxEvent.objects.filter(pk=event.pk).update(
+            claimed_until=timezone.now() - timezone.timedelta(minutes=1)
+        )
+        self.assertEqual(dispatch_notifications(), 1)
+
+    def test_legacy_tasks_record_outbox_events(self):
+        candidate = create_candidate('candidate')
+        interview = create_interview(candidate, self.job.posted_by, self.job)
+        send_interview_feedback(interview.pk)
+        send_interview_feedback(0)
+        JobApplication.objects.filter(pk=self.applications[self.ada.pk].pk).update(status='REVIEWING')
+        send_application_status_notifications(
+            [application.pk for application in self.applications.values()], 'REVIEWING'
+        )
+        self.assertEqual(
+            set(OutboxEvent.objects.values_list('event_type', 'recipient_id', 'subject_id')),
+            {
+                ('INTERVIEW_FEEDBACK', candidate.user_id, interview.pk),
+                ('APPLICATION_STATUS', self.ada.pk, self.applications[self.ada.pk].pk),
+            }
+        )
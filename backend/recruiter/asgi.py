@@ -0,0 +1,23 @@
+# ASGI entry point, next to recruiter.wsgi. Serves HTTP, including the
+# async read endpoints, and the interview WebSocket stream:
+#   gunicorn recruiter.asgi:application -k uvicorn.workers.UvicornWorker
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recruiter.settings')
+
+# Set up Django before importing anything that touches models
+django_asgi_app = get_asgi_application()
+
+from channels.auth import AuthMiddlewareStack
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.security.websocket import AllowedHostsOriginValidator
+from recruiter.apps.interviews.routing import websocket_urlpatterns
+from recruiter.websocket_auth import TokenAuthMiddleware
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    'websocket': AllowedHostsOriginValidator(
+        AuthMiddlewareStack(TokenAuthMiddleware(URLRouter(websocket_urlpatterns)))
+    ),
+})
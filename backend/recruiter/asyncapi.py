@@ -0,0 +1,53 @@
+import functools
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
+from rest_framework.request import ForcedAuthentication, Request
+from .authentication import get_cached_token
+from .roles import get_roles
+
+# Blocking calls that are not ORM queries (cache and storage backends,
+# mail) run in the default executor so they never stall the event loop.
+# ORM work goes through the async queryset API or the default
+# thread-sensitive sync_to_async.
+blocking = functools.partial(sync_to_async, thread_sensitive=False)
+
+async def aauthenticate(request):
+    """
+    Async counterpart of the REST_FRAMEWORK authentication classes: a
+    cached token from the Authorization header, otherwise the session.
+    """
+    header = request.headers.get('Authorization', '').split()
+    if len(header) == 2 and header[0].lower() == 'token':
+        token = await sync_to_async(get_cached_token)(header[1])
+        return AnonymousUser() if token is None else token.user
+    return await request.auser()
+
+def async_api_view(permission=None):
+    """
+    Wrap an async GET-only view with authentication and an optional
+    ``permission(user)`` check. The view receives the request with
+    ``user`` set, its memoized roles and a DRF Request for query
+    parameters and pagination.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+            request.user = await aauthenticate(request)
+            if not request.user.is_authenticated:
+                return JsonResponse(
+                    {'detail': 'Authentication credentials were not provided.'}, status=401
+                )
+            if permission is not None and not permission(request.user):
+                return JsonResponse(
+                    {'detail': 'You do not have permission to perform this action.'}, status=403
+                )
+            roles = await sync_to_async(get_roles)(request)
+            # The DRF Request would otherwise run its own, empty, authenticator
+            # list and replace the user with AnonymousUser
+            drf_request = Request(request, authenticators=[ForcedAuthentication(request.user, None)])
+            return await view(drf_request, roles, *args, **kwargs)
+        return wrapper
+    return decorator
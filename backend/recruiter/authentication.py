@@ -0,0 +1,73 @@
+import hashlib
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from .roles import resolve_roles
+
+def token_cache_key(key):
+    # Hash the key so raw tokens never end up in the cache
+    return f"auth-token:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+def load_token(key):
+    token = Token.objects.select_related('user').filter(key=key).first()
+    if token is None or not token.user.is_active:
+        return None
+    token.user.cached_roles = resolve_roles(token.user)
+    return token
+
+def get_cached_token(key):
+    """
+    Return the token, its user and the user's roles, reading the database
+    only on a cache miss. Returns None for unknown keys and inactive users.
+
+    Evictions only reach every worker, including the ASGI process, through
+    a shared cache, so without one every lookup reads the database.
+    """
+    if not settings.SHARED_CACHE:
+        return load_token(key)
+    cache_key = token_cache_key(key)
+    token = cache.get(cache_key)
+    if token is None:
+        token = load_token(key)
+        if token is None:
+            return None
+        cache.set(cache_key, token, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+    return token
+
+def invalidate_token(key):
+    transaction.on_commit(lambda: cache.delete(token_cache_key(key)))
+
+def invalidate_user_tokens(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication with token-to-user lookups cached for
+    AUTH_TOKEN_CACHE_TIMEOUT seconds. Deleting or rotating a token and
+    changing its user evict the entry as soon as the change commits.
+    """
+
+    def authenticate_credentials(self, key):
+        token = get_cached_token(key)
+        if token is None:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        return (token.user, token)
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    # Logout deletes the token and rotation replaces it with a new key
+    invalidate_token(instance.key)
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Deactivation and staff changes must not wait for the TTL; the
+    # last_login update on every login changes nothing cached
+    if not created and set(update_fields or ()) != {'last_login'}:
+        invalidate_user_tokens(instance.pk)
@@ -0,0 +1,189 @@
+import random
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from recruiter.apps.analytics.rebuild import rebuild_rollups
+from recruiter.apps.candidates.models import CandidateProfile, CandidateSkill
+from recruiter.apps.interviews.models import Interview, InterviewQuestion, InterviewFeedback
+from recruiter.apps.interviews.question_bank import bank_question_ids
+from recruiter.apps.jobs.counters import reconcile_job_counters
+from recruiter.apps.jobs.models import Job, JobApplication
+
+User = get_user_model()
+
+FULL_VOLUMES = {
+    'candidates': 100_000,
+    'interviewers': 1_000,
+    'jobs': 10_000,
+    'interviews': 1_000_000,
+    'applications': 300_000,
+    'bank_questions': 5_000,
+}
+
+SKILLS = [
+    'python', 'django', 'postgresql', 'react', 'typescript', 'aws', 'docker',
+    'kubernetes', 'java', 'spring', 'go', 'rust', 'c++', 'sql', 'redis',
+    'celery', 'graphql', 'terraform', 'node.js', 'machine learning',
+]
+LOCATIONS = ['Berlin', 'London', 'New York', 'Bangalore', 'Toronto', 'Remote']
+TITLES = ['Backend Engineer', 'Frontend Engineer', 'Data Engineer', 'SRE', 'ML Engineer']
+LEVELS = ['BEGINNER', 'INTERMEDIATE', 'ADVANCED', 'EXPERT']
+QUESTION_TYPES = ['TECHNICAL', 'BEHAVIORAL', 'PROBLEM_SOLVING', 'SYSTEM_DESIGN']
+STATUSES = ['SCHEDULED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED']
+INTERVIEW_TYPES = ['PHONE', 'VIDEO', 'ONSITE', 'TECHNICAL']
+
+def volumes(scale):
+    return {name: max(1, int(count * scale)) for name, count in FULL_VOLUMES.items()}
+
+def words(rng, vocabulary, count):
+    return ' '.join(rng.choice(vocabulary) for _ in range(count))
+
+def batched(objects, batch_size):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def create_in_batches(model, objects, batch_size):
+    created = []
+    for batch in batched(objects, batch_size):
+        created.extend(model.objects.bulk_create(batch))
+    return created
+
+def seed(scale=1.0, seed=42, batch_size=5000, stdout=None):
+    """
+    Seed deterministic benchmark data with bulk inserts. ``scale`` multiplies
+    the full volumes (100k candidates, 10k jobs, 1M interviews with
+    questions and feedback), so 0.01 gives a quick local data set.
+    """
+    rng = random.Random(seed)
+    counts = volumes(scale)
+    password = make_password(None)
+    now = timezone.now()
+
+    def log(message):
+        if stdout is not None:
+            stdout.write(message)
+
+    def users(prefix, count, is_staff=False):
+        return create_in_batches(User, (
+            User(
+                username=f'bench-{prefix}-{seed}-{i}',
+                email=f'{prefix}{i}@bench.example.com',
+                first_name=prefix.title(),
+                last_name=str(i),
+                password=password,
+                is_staff=is_staff,
+            ) for i in range(count)
+        ), batch_size)
+
+    candidates = users('candidate', counts['candidates'])
+    interviewers = users('interviewer', counts['interviewers'], is_staff=True)
+    log(f"Created {len(candidates)} candidates and {len(interviewers)} interviewers")
+
+    profiles = create_in_batches(CandidateProfile, (
+        CandidateProfile(
+            user=user,
+            phone_number='+10000000000',
+            location=rng.choice(LOCATIONS),
+            current_position=rng.choice(TITLES),
+            years_of_experience=rng.randint(0, 20),
+            skills=words(rng, SKILLS, 6),
+            education='BSc Computer Science',
+            resume=f'resumes/bench-{user.pk}.pdf',
+        ) for user in candidates
+    ), batch_size)
+    create_in_batches(CandidateSkill, (
+        CandidateSkill(
+            candidate=profile,
+            skill_name=rng.choice(SKILLS),
+            skill_level=rng.choice(LEVELS),
+            years_of_experience=rng.randint(0, 10),
+        ) for profile in profiles for _ in range(3)
+    ), batch_size)
+
+    jobs = create_in_batches(Job, (
+        Job(
+            title=rng.choice(TITLES),
+            description=words(rng, SKILLS, 40),
+            requirements=words(rng, SKILLS, 10),
+            location=rng.choice(LOCATIONS),
+            salary_range='100k-150k',
+            job_type='Full-time',
+            experience_level='Senior',
+            posted_by=rng.choice(interviewers),
+        ) for _ in range(counts['jobs'])
+    ), batch_size)
+    log(f"Created {len(profiles)} profiles and {len(jobs)} jobs")
+
+    create_in_batches(JobApplication, (
+        JobApplication(
+            job=rng.choice(jobs),
+            candidate=rng.choice(candidates),
+            status=rng.choice(JobApplication.STATUS_CHOICES)[0],
+            cover_letter=words(rng, SKILLS, 30),
+            resume=f'resumes/bench-application-{i}.pdf',
+        ) for i in range(counts['applications'])
+    ), batch_size)
+
+    bank = list(bank_question_ids([
+        (rng.choice(QUESTION_TYPES), f"Explain {words(rng, SKILLS, 3)}", words(rng, SKILLS, 30))
+        for _ in range(counts['bank_questions'])
+    ]).items())
+
+    # Interviewers take turns on two-hour slots so no interviewer is
+    # double-booked, which the exclusion constraint would reject.
+    first_slot = now - timezone.timedelta(days=60)
+    interview_total = 0
+    for batch in batched(range(counts['interviews']), batch_size):
+        interviews = []
+        for i in batch:
+            scheduled_date = first_slot + timezone.timedelta(hours=2 * (i // len(interviewers)))
+            duration = rng.choice([30, 45, 60, 90])
+            interviews.append(Interview(
+                candidate_id=rng.choice(profiles).pk,
+                interviewer=interviewers[i % len(interviewers)],
+                job=rng.choice(jobs),
+                scheduled_date=scheduled_date,
+                scheduled_end=Interview.compute_end(scheduled_date, duration),
+                duration=duration,
+                status=rng.choice(STATUSES),
+                interview_type=rng.choice(INTERVIEW_TYPES),
+                notes=words(rng, SKILLS, 20),
+            ))
+        interviews = Interview.objects.bulk_create(interviews)
+        InterviewQuestion.objects.bulk_create([
+            InterviewQuestion(
+                interview=interview,
+                bank_question_id=bank_question_id,
+                question_type=question_type,
+                candidate_answer=words(rng, SKILLS, 40),
+                score=rng.randint(1, 10),
+            )
+            for interview in interviews
+            for (question_type, _, _), bank_question_id in rng.sample(bank, min(3, len(bank)))
+        ])
+        InterviewFeedback.objects.bulk_create([
+            InterviewFeedback(
+                interview=interview,
+                strengths=words(rng, SKILLS, 10),
+                weaknesses=words(rng, SKILLS, 10),
+                overall_rating=rng.randint(1, 5),
+                technical_skills_rating=rng.randint(1, 5),
+                communication_skills_rating=rng.randint(1, 5),
+                problem_solving_rating=rng.randint(1, 5),
+                recommendation=words(rng, SKILLS, 15),
+            ) for interview in interviews if interview.status == 'COMPLETED'
+        ])
+        interview_total += len(interviews)
+    log(f"Created {interview_total} interviews with questions and feedback")
+
+    # bulk_create skips the rollup and counter hooks
+    rebuild_rollups()
+    reconcile_job_counters()
+    return counts
@@ -0,0 +1,84 @@
+import http.client
+import threading
+import time
+from urllib.parse import urlsplit
+
+from recruiter.apps.interviews.models import Interview
+
+# (name, path served by the sync viewsets, path of the async view)
+ENDPOINT_PAIRS = [
+    ('interviews.list', '/api/interviews/interviews/?pagination=cursor', '/api/interviews/async/interviews/'),
+    ('interviews.retrieve', '/api/interviews/interviews/{interview}/', '/api/interviews/async/interviews/{interview}/'),
+    ('jobs.list', '/api/jobs/jobs/', '/api/jobs/async/jobs/'),
+    ('matches.recommended', '/api/jobs/matches/recommended_jobs/', '/api/jobs/async/matches/recommended_jobs/'),
+    # Same streaming action on both servers; under ASGI it streams from an async iterator
+    ('interviews.export', '/api/interviews/interviews/export/', '/api/interviews/interviews/export/'),
+]
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def worker(base_url, path, headers, deadline, latencies, errors):
+    parts = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(parts.netloc, timeout=30)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            ok = False
+            connection.close()
+        if ok:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(1)
+    connection.close()
+
+def run_load(base_url, path, token, concurrency, duration):
+    """
+    Keep ``concurrency`` keep-alive connections busy requesting ``path`` for
+    ``duration`` seconds and report throughput and latency percentiles.
+    """
+    headers = {'Authorization': f'Token {token}', 'Accept': 'application/json'}
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=worker, args=(base_url, path, headers, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'requests_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+def compare_modes(wsgi_url, asgi_url, token, concurrency, duration):
+    """
+    Load every endpoint on the WSGI server through the sync viewsets and on
+    the ASGI server through the async views. Both servers must be running
+    against the same database.
+    """
+    ids = {'interview': Interview.objects.order_by('pk').values_list('pk', flat=True).first()}
+    results = {}
+    for name, sync_path, async_path in ENDPOINT_PAIRS:
+        for mode, base_url, path in [('wsgi', wsgi_url, sync_path), ('asgi', asgi_url, async_path)]:
+            results[f'{name}.{mode}'] = run_load(
+                base_url, path.format(**ids), token, concurrency, duration
+            )
+    return results
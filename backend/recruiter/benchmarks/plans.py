@@ -0,0 +1,139 @@
+import json
+import re
+from django.db import connection
+from django.utils import timezone
+
+from recruiter.apps.analytics.models import JobDailyStats
+from recruiter.apps.interviews.models import Interview, TranscriptSegment, ACTIVE_INTERVIEW_STATUSES
+from recruiter.apps.interviews.tasks import due_reminders
+from recruiter.apps.jobs.models import Job, JobApplication, JobMatch
+
+PLAN_VENDORS = ('postgresql', 'sqlite')
+
+# Below this many rows a table fits in a handful of pages and a sequential
+# scan is the planner's right choice
+MIN_ROWS = 1000
+
+def sample_ids():
+    """
+    Representative parameters for the hot queries, taken from the data.
+    """
+    interview = Interview.objects.order_by('pk').values(
+        'pk', 'candidate_id', 'job_id', 'interviewer_id', 'scheduled_date'
+    ).first() or {}
+    return {
+        'interview': interview.get('pk'),
+        'candidate': interview.get('candidate_id'),
+        'job': interview.get('job_id'),
+        'interviewer': interview.get('interviewer_id'),
+        'scheduled_date': interview.get('scheduled_date'),
+        'user': JobApplication.objects.order_by('pk').values_list('candidate_id', flat=True).first(),
+    }
+
+def hot_queries(ids):
+    """
+    Registry of (name, queryset, cost budget) for the querysets behind the
+    busiest endpoints and tasks. Budgets are planner cost units on
+    PostgreSQL and are not checked on other databases.
+    """
+    now = timezone.now()
+    start = ids['scheduled_date'] or now
+    return [
+        ('interviews.open_check', Interview.objects.filter(
+            candidate_id=ids['candidate'],
+            job_id=ids['job'],
+            status__in=ACTIVE_INTERVIEW_STATUSES,
+        ).values('pk')[:1], 50),
+        ('interviews.interviewer_list', Interview.objects.filter(
+            interviewer_id=ids['interviewer']
+        ).order_by('-scheduled_date', '-id')[:50], 500),
+        ('interviews.candidate_list', Interview.objects.filter(
+            candidate_id=ids['candidate']
+        ).order_by('-scheduled_date', '-id')[:50], 500),
+        ('interviews.interviewer_conflicts', Interview.interviewer_conflicts(
+            ids['interviewer'], start, start + timezone.timedelta(hours=1)
+        ).values('pk')[:1], 50),
+        ('interviews.due_reminders', due_reminders(now)[:200], 2000),
+        ('interviews.transcript', TranscriptSegment.objects.filter(
+            interview_id=ids['interview']
+        ).order_by('sequence'), 500),
+        ('matches.recommended', JobMatch.objects.filter(
+            candidate_id=ids['user']
+        ).order_by('-match_score')[:10], 100),
+        ('applications.by_candidate', JobApplication.objects.filter(
+            candidate_id=ids['user']
+        ).order_by('-applied_at', '-id')[:50], 500),
+        ('applications.job_funnel', JobApplication.objects.filter(
+            job_id=ids['job'], status='SHORTLISTED'
+        ).values('pk'), 500),
+        ('jobs.popular', Job.objects.filter(is_active=True).order_by('-application_count')[:20], 500),
+        ('analytics.job_daily', JobDailyStats.objects.filter(
+            job_id=ids['job'],
+            day__gte=(start - timezone.timedelta(days=30)).date(),
+        ).order_by('day'), 200),
+    ]
+
+def postgres_plan(queryset):
+    plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+    seq_scans = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if node['Node Type'] == 'Seq Scan':
+            seq_scans.append(node.get('Relation Name'))
+        stack.extend(node.get('Plans', []))
+    return seq_scans, plan['Total Cost']
+
+SQLITE_SCAN_RE = re.compile(r'\bSCAN (?:TABLE )?(\w+)(?!.*USING (?:COVERING )?INDEX)')
+
+def sqlite_plan(queryset):
+    return SQLITE_SCAN_RE.findall(queryset.explain()), None
+
+def relation_rows(tables):
+    """
+    Planner row estimates from pg_class for ``tables``.
+    """
+    if connection.vendor != 'postgresql' or not tables:
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT relname, reltuples FROM pg_class WHERE relname = ANY(%s)',
+            [list(tables)]
+        )
+        return dict(cursor.fetchall())
+
+def explain(queryset):
+    """
+    Return (tables read with a sequential scan, total cost or None).
+    """
+    if connection.vendor == 'postgresql':
+        return postgres_plan(queryset)
+    if connection.vendor == 'sqlite':
+        return sqlite_plan(queryset)
+    raise ValueError(f"Plan checks are not supported on {connection.vendor}")
+
+def check_plans(cost_factor=1.0, allow_seq_scan=(), min_rows=MIN_ROWS):
+    """
+    EXPLAIN every hot query and return one result row per query, marking a
+    failure when a table outside ``allow_seq_scan`` is read with a
+    sequential scan or the cost exceeds the budget times ``cost_factor``.
+    Scans of tables the planner estimates below ``min_rows`` rows are
+    ignored, since a sequential scan is the right plan for them.
+    """
+    rows = []
+    for name, queryset, budget in hot_queries(sample_ids()):
+        seq_scans, cost = explain(queryset)
+        sizes = relation_rows(set(seq_scans))
+        seq_scans = [
+            table for table in seq_scans
+            if table not in allow_seq_scan and sizes.get(table, min_rows) >= min_rows
+        ]
+        over_budget = cost is not None and cost > budget * cost_factor
+        rows.append({
+            'query': name,
+            'cost': cost,
+            'budget': budget * cost_factor,
+            'seq_scans': seq_scans,
+            'failed': bool(seq_scans) or over_budget,
+        })
+    return rows
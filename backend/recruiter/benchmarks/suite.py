@@ -0,0 +1,169 @@
+import json
+import platform
+import statistics
+import time
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from recruiter.apps.interviews.models import Interview
+from recruiter.apps.interviews.serializers import InterviewSerializer
+from recruiter.apps.interviews.tasks import send_due_interview_reminders
+from recruiter.apps.jobs.matching import compute_matches
+from recruiter.apps.jobs.models import Job, JobApplication
+from recruiter.apps.jobs.serializers import JobSerializer
+
+User = get_user_model()
+
+ENDPOINTS = [
+    ('interviews.list', '/api/interviews/interviews/'),
+    ('interviews.list_cursor', '/api/interviews/interviews/?pagination=cursor&page_size=50'),
+    ('interviews.retrieve', '/api/interviews/interviews/{interview}/'),
+    ('jobs.list', '/api/jobs/jobs/'),
+    ('jobs.retrieve', '/api/jobs/jobs/{job}/'),
+    ('applications.list', '/api/jobs/applications/'),
+    ('applications.retrieve', '/api/jobs/applications/{application}/'),
+    ('matches.recommended', '/api/jobs/matches/recommended_jobs/'),
+]
+
+def summarize(durations):
+    """
+    Throughput and latency figures for a list of durations in seconds.
+    """
+    durations = sorted(durations)
+    total = sum(durations)
+    return {
+        'ops_per_second': len(durations) / total if total else 0.0,
+        'p50_ms': statistics.median(durations) * 1000,
+        'p95_ms': durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000,
+    }
+
+def timed(func, iterations):
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def bench_endpoints(iterations):
+    user = User.objects.filter(is_staff=True).order_by('pk').first()
+    client = APIClient()
+    client.force_authenticate(user)
+    ids = {
+        'interview': Interview.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'job': Job.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'application': JobApplication.objects.order_by('pk').values_list('pk', flat=True).first(),
+    }
+
+    results = {}
+    for name, url in ENDPOINTS:
+        url = url.format(**ids)
+
+        def request():
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+
+        request()
+        results[f'endpoint.{name}'] = summarize(timed(request, iterations))
+    return results
+
+def bench_serializers(iterations, rows=500):
+    results = {}
+    interviews = list(
+        Interview.objects.select_related(
+            'candidate__user', 'interviewer', 'job', 'interview_feedback'
+        ).prefetch_related('questions__bank_question')[:rows]
+    )
+    jobs = list(Job.objects.all()[:rows])
+    for name, serializer_class, instances in [
+        ('InterviewSerializer', InterviewSerializer, interviews),
+        ('JobSerializer', JobSerializer, jobs),
+    ]:
+        durations = timed(lambda: serializer_class(instances, many=True).data, iterations)
+        summary = summarize(durations)
+        summary['rows_per_second'] = summary['ops_per_second'] * len(instances)
+        results[f'serializer.{name}'] = summary
+    return results
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+def bench_tasks():
+    """
+    Time the heavy tasks inside a transaction that is rolled back, so the
+    matches and reminders they write do not change what the next run sees.
+    The incremental match run still follows the full one within it.
+    """
+    results = {}
+    with transaction.atomic():
+        for name, func in [
+            ('compute_job_matches.full', lambda: compute_matches(full=True)),
+            ('compute_job_matches.incremental', lambda: compute_matches()),
+            ('send_due_interview_reminders', lambda: send_due_interview_reminders.apply().get()),
+        ]:
+            results[f'task.{name}'] = {'seconds': timed(func, 1)[0]}
+        transaction.set_rollback(True)
+    return results
+
+def run(iterations=50, include_tasks=True):
+    """
+    Run every benchmark against the current database and return a JSON
+    serialisable result document.
+    """
+    results = {}
+    results.update(bench_endpoints(iterations))
+    results.update(bench_serializers(max(1, iterations // 5)))
+    if include_tasks:
+        results.update(bench_tasks())
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'iterations': iterations,
+            'rows': {
+                'interviews': Interview.objects.count(),
+                'jobs': Job.objects.count(),
+                'applications': JobApplication.objects.count(),
+            },
+        },
+        'results': results,
+    }
+
+# Metrics where a larger value is an improvement; everything else is a cost.
+HIGHER_IS_BETTER = {'ops_per_second', 'rows_per_second'}
+
+def compare(baseline, current, threshold):
+    """
+    Return one row per shared metric with its relative change, flagging
+    regressions worse than ``threshold`` percent.
+    """
+    rows = []
+    for name, metrics in sorted(current['results'].items()):
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        for metric, value in sorted(metrics.items()):
+            before = previous.get(metric)
+            if not before:
+                continue
+            change = (value - before) / before * 100
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            rows.append({
+                'benchmark': name,
+                'metric': metric,
+                'baseline': before,
+                'current': value,
+                'change_percent': change,
+                'regression': worse > threshold,
+            })
+    return rows
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+def dump(document, path):
+    with open(path, 'w') as file:
+        json.dump(document, file, indent=2, sort_keys=True)
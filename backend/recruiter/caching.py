@@ -0,0 +1,106 @@
+import hashlib
+import logging
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+if not settings.API_RESPONSE_CACHE:
+    logger.warning(
+        'Versioned API response caching is off: it needs REDIS_CACHE_URL when DEBUG is off'
+    )
+
+def version_key(namespace):
+    return f'version:{namespace}'
+
+def version_timeout():
+    # A per-process cache only sees bumps made by its own worker, so there
+    # versions expire quickly instead of living forever
+    return None if settings.SHARED_CACHE else settings.LOCAL_CACHE_VERSION_TIMEOUT
+
+def new_version():
+    # Time based so a version evicted from the cache never restarts at a
+    # value that older cached responses were stored under.
+    return int(time.time() * 1000)
+
+def get_version(namespace):
+    version = cache.get(version_key(namespace))
+    if version is None:
+        cache.add(version_key(namespace), new_version(), version_timeout())
+        version = cache.get(version_key(namespace), new_version())
+    return version
+
+def bump_version(namespace):
+    """
+    Invalidate every cached response of ``namespace`` once the current
+    transaction commits.
+    """
+    if not settings.API_RESPONSE_CACHE:
+        return
+
+    def bump():
+        try:
+            cache.incr(version_key(namespace))
+        except ValueError:
+            cache.set(version_key(namespace), new_version(), version_timeout())
+    transaction.on_commit(bump)
+
+def response_cache_keys(namespace, version, request):
+    """
+    ETag and cache key of the response to ``request`` at ``version``.
+    """
+    digest = hashlib.sha1(request.get_full_path().encode('utf-8')).hexdigest()
+    etag = f'"{namespace}-{version}-{digest[:16]}"'
+    return etag, f'response:{namespace}:{version}:{digest}'
+
+def etag_matches(request, etag):
+    return etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+
+class VersionedCacheMixin:
+    """
+    Viewset mixin caching list and retrieve payloads under a per-table
+    version, bumped by the model whenever a row changes. Responses carry an
+    ETag derived from the version, so a matching If-None-Match gets a 304
+    without querying or serializing anything. With API_RESPONSE_CACHE off
+    the viewset responds uncached.
+    """
+    cache_namespace = None
+    cache_timeout = None
+
+    def get_cache_timeout(self):
+        if self.cache_timeout is not None:
+            return self.cache_timeout
+        return settings.API_CACHE_TIMEOUT
+
+    def cached_response(self, request, render):
+        if not settings.API_RESPONSE_CACHE:
+            return render()
+        etag, key = response_cache_keys(
+            self.cache_namespace, get_version(self.cache_namespace), request
+        )
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        data = cache.get(key)
+        if data is None:
+            response = render()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(key, data, self.get_cache_timeout())
+        return Response(data, headers={'ETag': etag})
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(VersionedCacheMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(VersionedCacheMixin, self).retrieve(request, *args, **kwargs)
+        )
@@ -0,0 +1,189 @@
+import os
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, generate_latest, multiprocess
+from rest_framework import serializers
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+current_timing = ContextVar('current_timing', default=None)
+
+class RequestTiming:
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+class MetricsRegistry:
+    """
+    Latency histograms keyed by metric and view label, kept with
+    prometheus_client. Under a multi-worker server PROMETHEUS_MULTIPROC_DIR
+    must point at a directory shared by the workers and emptied before they
+    start: each worker then writes its samples there and a scrape served by
+    any worker aggregates all of them. Without it the series only cover the
+    worker that answered the scrape.
+    """
+    metrics = {
+        'recruiter_request_duration_seconds': ('Total request time', BUCKETS),
+        'recruiter_request_db_duration_seconds': ('Time spent in database queries', BUCKETS),
+        'recruiter_request_serializer_duration_seconds': ('Time spent building serializer data', BUCKETS),
+        'recruiter_request_db_queries': ('Database queries per request', QUERY_BUCKETS),
+    }
+
+    def __init__(self):
+        self.registry = CollectorRegistry()
+        self.histograms = {
+            name: Histogram(name, description, ['view'], buckets=buckets, registry=self.registry)
+            for name, (description, buckets) in self.metrics.items()
+        }
+
+    def observe(self, view, timing, total):
+        values = {
+            'recruiter_request_duration_seconds': total,
+            'recruiter_request_db_duration_seconds': timing.db_time,
+            'recruiter_request_serializer_duration_seconds': timing.serializer_time,
+            'recruiter_request_db_queries': timing.queries,
+        }
+        for name, value in values.items():
+            self.histograms[name].labels(view=view).observe(value)
+
+    def render(self):
+        if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+            return generate_latest(self.registry)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+
+registry = MetricsRegistry()
+
+def install_serializer_timing():
+    """
+    Time every top-level access to ``serializer.data``. Nested serializers
+    and list children are rendered inside that call, so they are not
+    counted twice.
+    """
+    base = serializers.BaseSerializer
+    if getattr(base.data.fget, 'instrumented', False):
+        return
+    original = base.data.fget
+
+    def data(self):
+        timing = current_timing.get()
+        if timing is None or timing.serializer_depth:
+            return original(self)
+        timing.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            timing.serializer_time += time.perf_counter() - start
+            timing.serializer_depth -= 1
+
+    data.instrumented = True
+    base.data = property(data)
+
+def query_timer(execute, sql, params, many, context):
+    """
+    Execute wrapper on every database connection, charging each query to
+    the RequestTiming of the current context. asgiref copies the context
+    into the threads that run sync views and ORM calls under ASGI, so
+    their queries are counted even though they use the connections of
+    those threads.
+    """
+    timing = current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing(execute, sql, params, many, context)
+
+def install_query_timer(**kwargs):
+    """
+    request_started receiver. Django sends the signal from the thread that
+    runs the request's synchronous code, under ASGI too, so the timer lands
+    on the connection its queries use.
+    """
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+def view_label(request):
+    view = getattr(request, 'resolver_match', None)
+    func = getattr(view, 'func', None)
+    cls = getattr(func, 'cls', None)
+    if cls is None:
+        return getattr(view, 'view_name', None) or 'unresolved'
+    actions = getattr(func, 'actions', None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return f'{cls.__name__}.{action}'
+
+class PerformanceMiddleware:
+    """
+    Record DB query count, DB time, serializer time and total time for every
+    request, send them back as a Server-Timing header and aggregate them per
+    viewset action for the Prometheus metrics endpoint, under WSGI and ASGI
+    alike.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        install_serializer_timing()
+        request_started.connect(install_query_timer, dispatch_uid='recruiter.instrumentation')
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        start = time.perf_counter()
+        try:
+            # Template and DRF responses are rendered before they get here
+            response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.finish(request, response, timing, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.finish(request, response, timing, time.perf_counter() - start)
+
+    def finish(self, request, response, timing, total):
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timing.db_time * 1000:.1f};desc="{timing.queries} queries"',
+            f'serializer;dur={timing.serializer_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+        registry.observe(view_label(request), timing, total)
+        return response
+
+def metrics_view(request):
+    user = getattr(request, 'user', None)
+    allowed = request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+    if not allowed and not (user and user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE_LATEST)
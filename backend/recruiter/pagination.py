@@ -0,0 +1,158 @@
+import base64
+import json
+from django.db.models import Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+class PageSizePagination(pagination.PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Opt-in keyset pagination on a (field, id) pair.
+
+    Requests that pass ``?pagination=cursor`` or a ``cursor`` are paged by
+    filtering on the last seen (field, id) position, which costs the same
+    on every page and needs no COUNT. Other requests fall back to page
+    number pagination so existing clients keep working. ``ordering`` must
+    list the sort field followed by the primary key, both in the same
+    direction, so a composite (field, id) index can serve the query.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    opt_in_query_param = 'pagination'
+    invalid_cursor_message = 'Invalid cursor'
+    fallback_class = PageSizePagination
+
+    def __init__(self):
+        self.fallback = None
+
+    def use_keyset(self, request):
+        return (
+            self.cursor_query_param in request.query_params or
+            request.query_params.get(self.opt_in_query_param) == 'cursor'
+        )
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_keyset(request):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        Keyset page fetched with the async ORM; always keyset, since async
+        endpoints have no page number clients to stay compatible with.
+        """
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """
+        Order and filter ``queryset`` for the requested page, returning it
+        sliced to one row more than the page size.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.field = self.ordering[0].lstrip('-')
+        self.descending = self.ordering[0].startswith('-')
+        self.request_page_size = self.get_page_size(request)
+        self.position = self.decode_cursor(request, queryset.model)
+
+        self.reverse = bool(self.position and self.position['reverse'])
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [self.flip(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if self.position:
+            queryset = queryset.filter(
+                self.position_filter(self.position['value'], self.position['pk'], self.reverse)
+            )
+        return queryset[:self.request_page_size + 1]
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.request_page_size
+        rows = rows[:self.request_page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = self.position is not None and (has_more if self.reverse else True)
+        self.page = rows
+        return rows
+
+    def flip(self, field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def position_filter(self, value, pk, reverse):
+        after = self.descending != reverse
+        lookup = 'lt' if after else 'gt'
+        return (
+            Q(**{f'{self.field}__{lookup}': value}) |
+            Q(**{self.field: value, f'pk__{lookup}': pk})
+        )
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            field = model._meta.get_field(self.field)
+            return {
+                'value': field.to_python(data['v']),
+                'pk': int(data['id']),
+                'reverse': bool(data.get('r')),
+            }
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row, reverse):
+        value = getattr(row, self.field)
+        data = {
+            'v': value.isoformat() if hasattr(value, 'isoformat') else value,
+            'id': row.pk,
+            'r': int(reverse),
+        }
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return pagination.CursorPagination().get_paginated_response_schema(schema)
@@ -0,0 +1,32 @@
+from collections import namedtuple
+
+Roles = namedtuple('Roles', ['is_staff', 'is_interviewer', 'candidate_profile_id'])
+
+ANONYMOUS_ROLES = Roles(False, False, None)
+
+def resolve_roles(user):
+    """
+    Look up the roles of ``user`` with at most one query.
+    """
+    from recruiter.apps.candidates.models import CandidateProfile
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS_ROLES
+    return Roles(
+        is_staff=user.is_staff,
+        is_interviewer=hasattr(user, 'interviewer_profile'),
+        candidate_profile_id=CandidateProfile.objects.filter(user=user).values_list(
+            'pk', flat=True
+        ).first(),
+    )
+
+def get_roles(request):
+    """
+    Roles of the requesting user, resolved once per request. Cached token
+    authentication hands over the roles it stored with the token.
+    """
+    roles = getattr(request, '_roles', None)
+    if roles is None:
+        user = request.user
+        roles = getattr(user, 'cached_roles', None) or resolve_roles(user)
+        request._roles = roles
+    return roles
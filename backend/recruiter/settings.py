@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 import environ
+from celery.schedules import crontab
 
 # Initialize environment variables
 env = environ.Env()
@@ -27,8 +28,10 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     
     # Third party apps
+    'channels',
     'rest_framework',
     'corsheaders',
     'rest_framework.authtoken',
@@ -41,16 +44,19 @@ INSTALLED_APPS = [
     'storages',
     'django_celery_beat',
     'django_celery_results',
-    'debug_toolbar',
     'django_extensions',
     
     # Local apps
     'recruiter.apps.candidates',
     'recruiter.apps.jobs',
     'recruiter.apps.interviews',
+    'recruiter.apps.analytics',
+    'recruiter.apps.ats',
+    'recruiter.apps.notifications',
 ]
 
 MIDDLEWARE = [
+    'recruiter.instrumentation.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -60,9 +66,13 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# Debug toolbar only in development
+if DEBUG:
+    INSTALLED_APPS += ['debug_toolbar']
+    MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
 ROOT_URLCONF = 'recruiter.urls'
 
 TEMPLATES = [
@@ -82,6 +92,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'recruiter.wsgi.application'
+ASGI_APPLICATION = 'recruiter.asgi.application'
 
 # Database
 DATABASES = {
@@ -126,13 +137,23 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads always spool to a temporary file instead of memory, and are
+# streamed to storage from there
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Resume ingestion
+RESUME_MAX_TEXT_LENGTH = env.int('RESUME_MAX_TEXT_LENGTH', default=50000)
+RESUME_MAX_SKILL_TOKENS = env.int('RESUME_MAX_SKILL_TOKENS', default=300)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'recruiter.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -145,6 +166,37 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
 }
 
+# Seconds a token-to-user lookup stays cached; logout, token rotation and
+# user changes evict entries immediately
+AUTH_TOKEN_CACHE_TIMEOUT = env.int('AUTH_TOKEN_CACHE_TIMEOUT', default=300)
+
+# Cache: Redis when REDIS_CACHE_URL is set, otherwise per-process memory.
+REDIS_CACHE_URL = env('REDIS_CACHE_URL', default='')
+SHARED_CACHE = bool(REDIS_CACHE_URL)
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+API_CACHE_TIMEOUT = env.int('API_CACHE_TIMEOUT', default=300)
+# Versioned API response caching. Cache versions must reach every worker,
+# so outside DEBUG it is only on with the shared cache.
+API_RESPONSE_CACHE = env.bool('API_RESPONSE_CACHE', default=SHARED_CACHE or DEBUG)
+# Lifetime of a cache version under the per-process cache, bounding how
+# long other workers serve responses cached before a write
+LOCAL_CACHE_VERSION_TIMEOUT = env.int('LOCAL_CACHE_VERSION_TIMEOUT', default=5)
+
+# Rows fetched per server-side cursor round trip by the streaming exports
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -156,6 +208,75 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'compute-job-matches': {
+        'task': 'recruiter.apps.jobs.tasks.compute_job_matches',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    'send-due-interview-reminders': {
+        'task': 'recruiter.apps.interviews.tasks.send_due_interview_reminders',
+        'schedule': timedelta(minutes=5),
+    },
+    'score-interview-answers': {
+        'task': 'recruiter.apps.interviews.tasks.score_interview_answers',
+        'schedule': timedelta(minutes=10),
+    },
+    'reconcile-job-counters': {
+        'task': 'recruiter.apps.jobs.tasks.reconcile_counters',
+        'schedule': timedelta(hours=1),
+    },
+    'reconcile-recent-rollups': {
+        'task': 'recruiter.apps.analytics.tasks.reconcile_recent_rollups',
+        'schedule': crontab(hour=1, minute=30),
+    },
+    'cleanup-old-interviews': {
+        'task': 'recruiter.apps.interviews.tasks.cleanup_old_interviews',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'dispatch-outbox': {
+        'task': 'recruiter.apps.notifications.tasks.dispatch_outbox',
+        'schedule': timedelta(seconds=30),
+    },
+    'purge-outbox': {
+        'task': 'recruiter.apps.notifications.tasks.purge_outbox',
+        'schedule': crontab(hour=3, minute=30),
+    },
+}
+
+# Interview reminders
+INTERVIEW_REMINDER_LEAD_TIME = timedelta(hours=env.int('INTERVIEW_REMINDER_LEAD_HOURS', default=24))
+INTERVIEW_REMINDER_BATCH_SIZE = env.int('INTERVIEW_REMINDER_BATCH_SIZE', default=200)
+INTERVIEW_REMINDER_MAX_ATTEMPTS = env.int('INTERVIEW_REMINDER_MAX_ATTEMPTS', default=3)
+INTERVIEW_REMINDER_CLAIM_TIMEOUT = timedelta(minutes=env.int('INTERVIEW_REMINDER_CLAIM_MINUTES', default=10))
+
+# Interview retention: completed interviews older than this are archived to
+# compressed JSONL in the default storage and deleted
+INTERVIEW_RETENTION_DAYS = env.int('INTERVIEW_RETENTION_DAYS', default=180)
+INTERVIEW_ARCHIVE_CHUNK_SIZE = env.int('INTERVIEW_ARCHIVE_CHUNK_SIZE', default=500)
+INTERVIEW_ARCHIVE_PREFIX = env('INTERVIEW_ARCHIVE_PREFIX', default='archives/interviews')
+
+# Notification outbox: events for one recipient within the coalescing
+# window are sent as a single message
+NOTIFICATION_COALESCE_WINDOW = timedelta(seconds=env.int('NOTIFICATION_COALESCE_SECONDS', default=120))
+NOTIFICATION_BATCH_SIZE = env.int('NOTIFICATION_BATCH_SIZE', default=500)
+NOTIFICATION_MAX_ATTEMPTS = env.int('NOTIFICATION_MAX_ATTEMPTS', default=5)
+NOTIFICATION_RETRY_DELAY = timedelta(minutes=env.int('NOTIFICATION_RETRY_MINUTES', default=10))
+NOTIFICATION_CLAIM_TIMEOUT = timedelta(minutes=env.int('NOTIFICATION_CLAIM_MINUTES', default=10))
+NOTIFICATION_RETENTION_DAYS = env.int('NOTIFICATION_RETENTION_DAYS', default=30)
+
+# Job matching
+JOB_MATCH_MIN_SCORE = env.float('JOB_MATCH_MIN_SCORE', default=10.0)
+JOB_MATCH_CHUNK_SIZE = env.int('JOB_MATCH_CHUNK_SIZE', default=500)
+JOB_MATCH_BATCH_SIZE = env.int('JOB_MATCH_BATCH_SIZE', default=2000)
+
+# Candidate search: minimum trigram similarity for fuzzy term matches in the
+# in-process fallback index (PostgreSQL uses pg_trgm's own thresholds)
+CANDIDATE_SEARCH_SIMILARITY = env.float('CANDIDATE_SEARCH_SIMILARITY', default=0.3)
+
+# ATS imports: records per validated and committed batch, and the batch
+# size from which new rows are loaded with COPY on PostgreSQL
+ATS_IMPORT_BATCH_SIZE = env.int('ATS_IMPORT_BATCH_SIZE', default=2000)
+ATS_IMPORT_COPY_MIN_ROWS = env.int('ATS_IMPORT_COPY_MIN_ROWS', default=500)
 
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -171,6 +292,11 @@ SITE_ID = 1
 # Debug Toolbar settings
 INTERNAL_IPS = ['127.0.0.1']
 
+# Prometheus scrapers allowed to read /metrics without a staff session. With
+# several workers per host also export PROMETHEUS_MULTIPROC_DIR (a directory
+# emptied on deploy) so every scrape aggregates all of them.
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=INTERNAL_IPS)
+
 # File Storage Configuration
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 AWS_ACCESS_KEY_ID = env('AWS_ACCESS_KEY_ID', default='')
@@ -184,5 +310,28 @@ AWS_DEFAULT_ACL = None
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
+# Voice interview streaming
+STT_BACKEND = env('STT_BACKEND', default='recruiter.apps.interviews.stt.FakeSpeechToText')
+STT_MAX_BUFFERED_CHUNKS = env.int('STT_MAX_BUFFERED_CHUNKS', default=32)
+STT_MAX_CHUNK_BYTES = env.int('STT_MAX_CHUNK_BYTES', default=64 * 1024)
+STT_BACKPRESSURE_TIMEOUT = env.float('STT_BACKPRESSURE_TIMEOUT', default=5.0)
+TRANSCRIPT_BATCH_SIZE = env.int('TRANSCRIPT_BATCH_SIZE', default=20)
+TRANSCRIPT_CACHE_TIMEOUT = env.int('TRANSCRIPT_CACHE_TIMEOUT', default=24 * 60 * 60)
+
 # OpenAI Configuration
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY') 
\ No newline at end of file
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+
+# Answer scoring: the stub backend scores offline by term overlap
+ANSWER_SCORER_BACKEND = env(
+    'ANSWER_SCORER_BACKEND',
+    default='recruiter.apps.interviews.scoring.OpenAIAnswerScorer' if OPENAI_API_KEY
+    else 'recruiter.apps.interviews.scoring.StubAnswerScorer'
+)
+ANSWER_SCORING_MODEL = env('ANSWER_SCORING_MODEL', default='gpt-3.5-turbo')
+ANSWER_SCORING_BATCH_SIZE = env.int('ANSWER_SCORING_BATCH_SIZE', default=100)
+ANSWER_SCORING_CONCURRENCY = env.int('ANSWER_SCORING_CONCURRENCY', default=8)
+ANSWER_SCORING_RETRIES = env.int('ANSWER_SCORING_RETRIES', default=3)
+ANSWER_SCORING_TIMEOUT = env.float('ANSWER_SCORING_TIMEOUT', default=30.0)
+
+# Question bank retrieval: workers check the bank for changes at most this often
+QUESTION_INDEX_REFRESH_SECONDS = env.int('QUESTION_INDEX_REFRESH_SECONDS', default=60) 
\ No newline at end of file
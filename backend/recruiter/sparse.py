@@ -0,0 +1,64 @@
+from rest_framework import permissions
+
+def parse_field_list(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin rendering only the fields a read request asks for.
+
+    ``?fields=a,b`` limits the output to those fields and ``?expand=c``
+    adds fields that are left out by default. ``Meta.default_fields`` is
+    what a request without ``fields`` gets; without it every field is
+    rendered. Writes and serializers built without a request are left
+    untouched.
+
+    ``Meta.select_related``, ``Meta.prefetch_related`` and ``Meta.deferred``
+    map output fields to the relations and columns they need, so
+    ``sparse_queryset`` only loads what the rendered fields read.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return
+        keep = self.selected_fields(
+            parse_field_list(request.query_params.get('fields')),
+            parse_field_list(request.query_params.get('expand'))
+        )
+        if keep is not None:
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+
+    def selected_fields(self, requested, expand):
+        if requested:
+            return requested | expand
+        default = getattr(self.Meta, 'default_fields', None)
+        if default is None:
+            return None
+        return set(default) | expand
+
+def sparse_queryset(queryset, serializer):
+    """
+    Join, prefetch and defer for the fields ``serializer`` will render.
+    """
+    meta = serializer.Meta
+    fields = set(serializer.fields)
+    select = dict.fromkeys(
+        path for name, path in getattr(meta, 'select_related', {}).items() if name in fields
+    )
+    prefetch = dict.fromkeys(
+        path for name, path in getattr(meta, 'prefetch_related', {}).items() if name in fields
+    )
+    deferred = [
+        column for name, column in getattr(meta, 'deferred', {}).items() if name not in fields
+    ]
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if deferred:
+        queryset = queryset.defer(*deferred)
+    return queryset
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Maximum number of queries per endpoint, including authentication and the
+# pagination COUNT. Raise a budget only together with the change that needs
+# the extra query.
+ENDPOINT_QUERY_BUDGETS = {
+    'interview-list': 6,
+    'interview-detail': 5,
+    'jobapplication-list': 4,
+    'jobapplication-detail': 3,
+    'jobmatch-list': 4,
+    'jobmatch-recommended-jobs': 3,
+}
+
+@contextmanager
+def query_budget(max_queries, using=DEFAULT_DB_ALIAS):
+    """
+    Fail when the wrapped block runs more than ``max_queries`` queries,
+    listing every captured statement to make the regression easy to spot.
+    """
+    context = CaptureQueriesContext(connections[using])
+    with context:
+        yield context
+
+    executed = len(context)
+    if executed > max_queries:
+        queries = '\n'.join(
+            f"{i}. {query['sql']}"
+            for i, query in enumerate(context.captured_queries, start=1)
+        )
+        raise AssertionError(
+            f"{executed} queries executed, budget is {max_queries}:\n{queries}"
+        )
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin exposing the query budget as an assertion, either with an
+    explicit limit or by URL name from ENDPOINT_QUERY_BUDGETS.
+    """
+
+    def assertQueryBudget(self, max_queries, using=DEFAULT_DB_ALIAS):
+        return query_budget(max_queries, using=using)
+
+    def assertEndpointQueryBudget(self, url_name, using=DEFAULT_DB_ALIAS):
+        return query_budget(ENDPOINT_QUERY_BUDGETS[url_name], using=using)
+
+def create_user(username, **kwargs):
+    return get_user_model().objects.create_user(
+        username=username,
+        email=kwargs.pop('email', f'{username}@example.com'),
+        password='password',
+        first_name=username.title(),
+        last_name='Test',
+        **kwargs
+    )
+
+def create_candidate(username, **kwargs):
+    from recruiter.apps.candidates.models import CandidateProfile
+    return CandidateProfile.objects.create(
+        user=create_user(username),
+        phone_number='+10000000000',
+        location=kwargs.pop('location', 'Berlin'),
+        current_position=kwargs.pop('current_position', 'Backend Engineer'),
+        years_of_experience=kwargs.pop('years_of_experience', 5),
+        skills=kwargs.pop('skills', 'python django postgresql'),
+        education='BSc Computer Science',
+        resume=f'resumes/{username}.pdf',
+        **kwargs
+    )
+
+def create_job(posted_by, **kwargs):
+    from recruiter.apps.jobs.models import Job
+    return Job.objects.create(
+        title=kwargs.pop('title', 'Backend Engineer'),
+        description=kwargs.pop('description', 'Build APIs with python and django'),
+        requirements=kwargs.pop('requirements', 'python django postgresql'),
+        location='Remote',
+        salary_range='100k-150k',
+        job_type='Full-time',
+        experience_level='Senior',
+        posted_by=posted_by,
+        **kwargs
+    )
+
+def create_interview(candidate, interviewer, job, start=None, **kwargs):
+    from recruiter.apps.interviews.models import Interview
+    return Interview.objects.create(
+        candidate=candidate,
+        interviewer=interviewer,
+        job=job,
+        scheduled_date=start or timezone.now() + timezone.timedelta(days=1),
+        duration=kwargs.pop('duration', 60),
+        interview_type=kwargs.pop('interview_type', 'VIDEO'),
+        **kwargs
+    )
\ No newline at end of file
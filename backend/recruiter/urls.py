@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from recruiter.instrumentation import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,6 +11,8 @@ urlpatterns = [
     path('api/candidates/', include('recruiter.apps.candidates.urls')),
     path('api/jobs/', include('recruiter.apps.jobs.urls')),
     path('api/interviews/', include('recruiter.apps.interviews.urls')),
+    path('api/analytics/', include('recruiter.apps.analytics.urls')),
+    path('metrics/', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,25 @@
+from urllib.parse import parse_qs
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from .authentication import get_cached_token
+
+@database_sync_to_async
+def get_token_user(key):
+    token = get_cached_token(key)
+    return None if token is None else token.user
+
+class TokenAuthMiddleware(BaseMiddleware):
+    """
+    Authenticate WebSocket connections with a DRF token passed as
+    ``?token=``, since browsers cannot set headers on WebSocket requests.
+    Falls back to whatever user the session middleware resolved.
+    """
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        key = query.get('token', [None])[0]
+        if key:
+            user = await get_token_user(key)
+            if user is not None:
+                scope = dict(scope, user=user)
+        return await super().__call__(scope, receive, send)
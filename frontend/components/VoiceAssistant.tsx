@@ -1,20 +1,25 @@
 import { useState, useEffect } from 'react';
 import { MicrophoneIcon, StopIcon } from '@heroicons/react/24/solid';
-import { useVapi } from '@/hooks/useVapi';
+import { useVapi, InterviewStreamConfig } from '@/hooks/useVapi';
 import { useJobStore } from '@/store/jobStore';
 import { useCandidateStore } from '@/store/candidateStore';
 import { useInterviewStore } from '@/store/interviewStore';
 
-export const VoiceAssistant = () => {
+interface VoiceAssistantProps {
+  // Transcribe a live interview instead of taking voice commands
+  interview?: InterviewStreamConfig;
+}
+
+export const VoiceAssistant = ({ interview }: VoiceAssistantProps) => {
   const [isListening, setIsListening] = useState(false);
   const [command, setCommand] = useState('');
-  const { startListening, stopListening, transcript } = useVapi();
+  const { startListening, stopListening, transcript, segments } = useVapi(interview);
   const { fetchJobs, createJob } = useJobStore();
   const { fetchProfile, updateProfile } = useCandidateStore();
   const { scheduleInterview } = useInterviewStore();
 
   useEffect(() => {
-    if (transcript) {
+    if (transcript && !interview) {
       setCommand(transcript);
       handleVoiceCommand(transcript);
     }
@@ -107,7 +112,14 @@ export const VoiceAssistant = () => {
         {isListening && (
           <div className="bg-white rounded-lg p-4 shadow-lg max-w-md">
             <p className="text-sm text-gray-600">Listening...</p>
-            {command && (
+            {interview ? (
+              <div className="mt-2 max-h-48 overflow-y-auto space-y-1">
+                {segments.map((segment, index) => (
+                  <p key={index} className="text-sm text-gray-700">{segment}</p>
+                ))}
+                {transcript && <p className="text-sm text-gray-400 italic">{transcript}</p>}
+              </div>
+            ) : command && (
               <p className="mt-2 text-gray-800 font-medium">{command}</p>
             )}
           </div>
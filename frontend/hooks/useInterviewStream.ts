@@ -0,0 +1,89 @@
+import { useState, useRef, useCallback } from 'react';
+
+interface StreamMessage {
+  type: 'transcript' | 'backpressure' | 'done';
+  text?: string;
+  final?: boolean;
+  paused?: boolean;
+}
+
+const CHUNK_INTERVAL_MS = 250;
+
+export const useInterviewStream = (interviewId: number, token: string) => {
+  const [partial, setPartial] = useState('');
+  const [segments, setSegments] = useState<string[]>([]);
+  const [isStreaming, setIsStreaming] = useState(false);
+  const socketRef = useRef<WebSocket | null>(null);
+  const recorderRef = useRef<MediaRecorder | null>(null);
+  const pausedRef = useRef(false);
+  const pendingRef = useRef<Blob[]>([]);
+
+  const flush = () => {
+    const socket = socketRef.current;
+    while (socket && !pausedRef.current && pendingRef.current.length) {
+      socket.send(pendingRef.current.shift() as Blob);
+    }
+  };
+
+  const startStreaming = useCallback(async () => {
+    const base = process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000';
+    const socket = new WebSocket(`${base}/ws/interviews/${interviewId}/stream/?token=${token}`);
+    socketRef.current = socket;
+
+    socket.onmessage = (event) => {
+      const message: StreamMessage = JSON.parse(event.data);
+      if (message.type === 'backpressure') {
+        // Hold chunks locally while the server catches up
+        pausedRef.current = Boolean(message.paused);
+        flush();
+      } else if (message.type === 'transcript') {
+        if (message.final) {
+          setSegments((previous) => [...previous, message.text || '']);
+          setPartial('');
+        } else {
+          setPartial(message.text || '');
+        }
+      }
+    };
+    socket.onclose = () => setIsStreaming(false);
+
+    const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+    const recorder = new MediaRecorder(stream);
+    recorder.ondataavailable = (event) => {
+      if (event.data.size > 0) {
+        pendingRef.current.push(event.data);
+        flush();
+      }
+    };
+    socket.onopen = () => {
+      recorder.start(CHUNK_INTERVAL_MS);
+      setIsStreaming(true);
+    };
+    recorderRef.current = recorder;
+  }, [interviewId, token]);
+
+  const stopStreaming = useCallback(() => {
+    const recorder = recorderRef.current;
+    if (recorder) {
+      recorder.stop();
+      recorder.stream.getTracks().forEach((track) => track.stop());
+    }
+    const socket = socketRef.current;
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      // The recorder emits its last chunk on stop
+      setTimeout(() => {
+        pausedRef.current = false;
+        flush();
+        socket.send(JSON.stringify({ type: 'end' }));
+      }, 0);
+    }
+  }, []);
+
+  return {
+    partial,
+    segments,
+    isStreaming,
+    startStreaming,
+    stopStreaming,
+  };
+};
@@ -1,17 +1,28 @@
 import { useState, useEffect } from 'react';
 import { createClient } from '@vapi-ai/web';
+import { useInterviewStream } from './useInterviewStream';
 
 interface VapiConfig {
   apiKey: string;
   assistantId: string;
 }
 
-export const useVapi = () => {
+// With an interview, audio goes to the backend's streaming transcription
+// instead of Vapi
+export interface InterviewStreamConfig {
+  interviewId: number;
+  token: string;
+}
+
+export const useVapi = (interview?: InterviewStreamConfig) => {
   const [transcript, setTranscript] = useState('');
   const [isListening, setIsListening] = useState(false);
   const [vapiClient, setVapiClient] = useState<any>(null);
+  const stream = useInterviewStream(interview?.interviewId ?? 0, interview?.token ?? '');
 
   useEffect(() => {
+    if (interview) return;
+
     const config: VapiConfig = {
       apiKey: process.env.NEXT_PUBLIC_VAPI_API_KEY || '',
       assistantId: process.env.NEXT_PUBLIC_VAPI_ASSISTANT_ID || '',
@@ -25,9 +36,17 @@ export const useVapi = () => {
         client.destroy();
       }
     };
-  }, []);
+  }, [Boolean(interview)]);
 
   const startListening = async () => {
+    if (interview) {
+      try {
+        await stream.startStreaming();
+      } catch (error) {
+        console.error('Error starting interview stream:', error);
+      }
+      return;
+    }
     if (!vapiClient) return;
 
     try {
@@ -49,6 +68,10 @@ export const useVapi = () => {
   };
 
   const stopListening = async () => {
+    if (interview) {
+      stream.stopStreaming();
+      return;
+    }
     if (!vapiClient) return;
 
     try {
@@ -60,8 +83,19 @@ export const useVapi = () => {
     }
   };
 
+  if (interview) {
+    return {
+      transcript: stream.partial,
+      segments: stream.segments,
+      isListening: stream.isStreaming,
+      startListening,
+      stopListening,
+    };
+  }
+
   return {
     transcript,
+    segments: [] as string[],
     isListening,
     startListening,
     stopListening,
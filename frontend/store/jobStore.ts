@@ -4,8 +4,9 @@ import axios from 'axios';
 interface Job {
   id: string;
   title: string;
-  description: string;
-  requirements: string;
+  // Only sent by the job detail endpoint, or the list with ?expand=description,requirements
+  description?: string;
+  requirements?: string;
   location: string;
   salary_range: string;
   job_type: string;